@@ -0,0 +1,46 @@
+"""임베딩 백엔드 일치도/지연 검증 스크립트
+
+사용 예: EMBEDDING_BACKEND=onnx_int8 python scripts/check_embedding_backend.py
+"""
+
+import sys
+from pathlib import Path
+
+# Windows 인코딩 문제 해결
+if sys.platform == 'win32':
+    try:
+        if sys.stdout.encoding != 'utf-8':
+            sys.stdout.reconfigure(encoding='utf-8')
+        if sys.stderr.encoding != 'utf-8':
+            sys.stderr.reconfigure(encoding='utf-8')
+    except Exception:
+        pass
+
+# 프로젝트 루트를 Python path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.vector_store.embedder import get_embedder
+
+def main():
+    """현재 EMBEDDING_BACKEND를 기준(torch) 모델과 비교"""
+    print("\n" + "="*70)
+    print("임베딩 백엔드 검증")
+    print("="*70)
+
+    embedder = get_embedder()
+    result = embedder.check_parity()
+
+    print(f"\n백엔드: {result['backend']}")
+    print(f"코사인 유사도: 최소 {result['min_cosine']:.5f}, 평균 {result['mean_cosine']:.5f}")
+    print(f"쿼리 지연: 기준 {result['reference_ms']:.1f}ms → {result['backend_ms']:.1f}ms "
+          f"({result['speedup']:.2f}배)")
+
+    if result['passed']:
+        print("\n검증 통과: 기존 인덱스와 함께 사용할 수 있습니다")
+    else:
+        print("\n검증 실패: 기준 모델과 임베딩이 달라 기존 인덱스와 함께 사용하면 안 됩니다")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 """ReAct 스타일 헤드헌터 AI 에이전트 - 완전한 구현"""
 
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -34,6 +35,9 @@ from ..tools.market_tools import (
     get_knowledge_base_stats
 )
 
+from ..vector_store.faiss_store import get_vector_store
+from ..database.repositories import get_talent_repository
+
 from ..tools.web_search_tools import (
     web_search_latest_trends,
     search_job_postings,
@@ -186,6 +190,36 @@ class HeadhunterReactAgent:
 # 전역 인스턴스
 _react_agent_instance = None
 
+_warm_up_thread: Optional[threading.Thread] = None
+_warm_up_lock = threading.Lock()
+
+def start_warm_up() -> threading.Thread:
+    """
+    무거운 리소스(임베딩 모델, 벡터 인덱스, DB 연결)를 백그라운드에서 미리 준비
+
+    도구 모듈은 리소스를 첫 호출 시 생성하므로 import는 즉시 끝납니다. 워밍업이 끝나기 전에
+    도구가 호출되면 해당 get_* 함수가 생성 완료까지 기다립니다. 여러 번 호출해도 한 번만 실행합니다.
+    """
+    global _warm_up_thread
+
+    def _run():
+        try:
+            vector_store = get_vector_store()
+            vector_store.embedder.embed_text("워밍업")  # 첫 추론의 지연(메모리 할당 등)을 미리 처리
+            print("벡터 스토어 워밍업 완료")
+        except Exception as e:
+            print(f"벡터 스토어 워밍업 실패 (첫 검색 시 다시 시도): {e}")
+        try:
+            get_talent_repository()
+        except Exception as e:
+            print(f"데이터베이스 워밍업 실패: {e}")
+
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_run, name="resource-warm-up", daemon=True)
+            _warm_up_thread.start()
+    return _warm_up_thread
+
 def get_react_agent() -> HeadhunterReactAgent:
     """ReAct 에이전트 싱글톤 인스턴스 반환"""
     global _react_agent_instance
@@ -1,6 +1,7 @@
 """PostgreSQL 데이터베이스 연결 관리"""
 
 import os
+import threading
 from typing import Optional
 from sqlalchemy import create_engine, Engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -84,17 +85,26 @@ class DatabaseConnection:
         if self.engine:
             self.engine.dispose()
 
-# 전역 데이터베이스 연결 인스턴스
-db_connection = DatabaseConnection()
+# 전역 데이터베이스 연결 인스턴스 (모듈 import 시 연결하지 않고 처음 사용할 때 생성)
+_db_connection: Optional[DatabaseConnection] = None
+_db_connection_lock = threading.Lock()
+
+def get_db_connection() -> DatabaseConnection:
+    """전역 데이터베이스 연결 반환"""
+    global _db_connection
+    with _db_connection_lock:
+        if _db_connection is None:
+            _db_connection = DatabaseConnection()
+    return _db_connection
 
 def get_db_session() -> Optional[Session]:
     """데이터베이스 세션 헬퍼 함수"""
-    return db_connection.get_session()
+    return get_db_connection().get_session()
 
 def get_engine() -> Optional[Engine]:
     """데이터베이스 엔진 반환"""
-    return db_connection.engine
+    return get_db_connection().engine
 
 def is_db_available() -> bool:
     """데이터베이스 사용 가능 여부 확인"""
-    return db_connection.is_connected
\ No newline at end of file
+    return get_db_connection().is_connected
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Data Access Layer - PostgreSQL Query Interface"""
 
+import threading
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func
@@ -212,10 +213,12 @@ class TalentRepository:
 
 # Global repository instance
 _repository_instance = None
+_repository_lock = threading.Lock()
 
 def get_talent_repository() -> TalentRepository:
-    """Get global repository instance"""
+    """Get global repository instance (created on first use)"""
     global _repository_instance
-    if _repository_instance is None:
-        _repository_instance = TalentRepository()
+    with _repository_lock:
+        if _repository_instance is None:
+            _repository_instance = TalentRepository()
     return _repository_instance
\ No newline at end of file
@@ -10,7 +10,7 @@ import uuid
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
-from src.agents.react_agent import get_react_agent
+from src.agents.react_agent import get_react_agent, start_warm_up
 from langchain_core.messages import HumanMessage, AIMessage
 from src.ui.pdf_parser import parse_pdf_jd, extract_company_name_with_details
 
@@ -134,6 +134,9 @@ if 'jd_text' not in st.session_state:
 if 'company_name' not in st.session_state:
     st.session_state.company_name = ""
 
+# 임베딩 모델/인덱스/DB 연결은 백그라운드에서 준비 (페이지는 바로 표시)
+start_warm_up()
+
 if 'agent' not in st.session_state:
     with st.spinner('AI 에이전트를 초기화하는 중...'):
         try:
@@ -285,9 +288,9 @@ with st.sidebar:
                                                 continue
                                         
                                         if all_search_results:
-                                            # 벡터 스토어에 추가
+                                            # 벡터 스토어에 저장 (같은 회사의 기존 정보는 교체)
                                             vector_store = get_vector_store()
-                                            vector_store.add_company_info(company_name, all_search_results)
+                                            vector_store.replace_company_info(company_name, all_search_results)
                                             
                                             st.success(f"📚 {company_name} 회사 정보 {total_count}건을 벡터 DB에 저장했습니다.")
                                             
@@ -474,9 +477,9 @@ with st.sidebar:
                                             continue
                                     
                                     if all_search_results:
-                                        # 벡터 스토어에 추가
+                                        # 벡터 스토어에 저장 (같은 회사의 기존 정보는 교체)
                                         vector_store = get_vector_store()
-                                        vector_store.add_company_info(company_name, all_search_results)
+                                        vector_store.replace_company_info(company_name, all_search_results)
                                         
                                         st.success(f"📚 {company_name} 회사 정보 {total_count}건을 벡터 DB에 저장했습니다.")
                                         
@@ -4,8 +4,7 @@ from typing import List, Dict, Any, Optional
 from langchain_core.tools import tool
 from ..database.repositories import get_talent_repository
 
-# 저장소 인스턴스
-talent_repo = get_talent_repository()
+# 저장소(DB 연결)는 첫 도구 호출 시(또는 백그라운드 워밍업에서) 생성
 
 @tool
 def search_candidates_by_skills(
@@ -15,7 +14,7 @@ def search_candidates_by_skills(
     """기술 스킬로 후보자 검색 (예: Python, React, AWS)"""
     try:
         # positions 필드에서 스킬 검색
-        talents = talent_repo.search_talents_by_position(skills)
+        talents = get_talent_repository().search_talents_by_position(skills)
 
         return {
             "success": True,
@@ -38,7 +37,7 @@ def search_candidates_by_location(
     """지역으로 후보자 검색 (예: 서울, 강남, 부산)"""
     try:
         # summary 필드에서 지역 정보 검색
-        talents = talent_repo.search_talents_by_name(location)  # 임시로 이름 검색 사용
+        talents = get_talent_repository().search_talents_by_name(location)  # 임시로 이름 검색 사용
 
         return {
             "success": True,
@@ -62,7 +61,7 @@ def search_candidates_by_salary_range(
     """급여 범위로 후보자 검색 (만원 단위, 예: 5000~8000)"""
     try:
         # 전체 인재 목록 가져오기 (실제로는 DB 쿼리 개선 필요)
-        talents = talent_repo.get_all_talents(limit=100)
+        talents = get_talent_repository().get_all_talents(limit=100)
 
         # 급여 정보는 현재 DB에 없으므로 전체 반환
         filtered_talents = talents[:limit]
@@ -89,7 +88,7 @@ def search_candidates_by_work_type(
     """근무 형태로 후보자 검색 (예: 원격, 재택, 하이브리드)"""
     try:
         # summary에서 근무 형태 정보 검색
-        talents = talent_repo.get_all_talents(limit=limit)
+        talents = get_talent_repository().get_all_talents(limit=limit)
 
         return {
             "success": True,
@@ -112,7 +111,7 @@ def search_candidates_by_industry(
 ) -> Dict[str, Any]:
     """산업 분야로 후보자 검색 (예: Fintech, E-commerce, AI/ML)"""
     try:
-        talents = talent_repo.search_talents_by_position(industry)
+        talents = get_talent_repository().search_talents_by_position(industry)
 
         return {
             "success": True,
@@ -135,7 +134,7 @@ def search_candidates_by_availability(
 ) -> Dict[str, Any]:
     """입사 가능 시기로 후보자 검색 (예: 즉시, 1개월 이내)"""
     try:
-        talents = talent_repo.get_all_talents(limit=limit)
+        talents = get_talent_repository().get_all_talents(limit=limit)
 
         return {
             "success": True,
@@ -175,9 +174,9 @@ def complex_candidate_search(
 
         # 스킬 기반 검색 우선
         if skills:
-            talents = talent_repo.search_talents_by_position(skills)
+            talents = get_talent_repository().search_talents_by_position(skills)
         else:
-            talents = talent_repo.get_all_talents(limit=100)
+            talents = get_talent_repository().get_all_talents(limit=100)
 
         return {
             "success": True,
@@ -197,7 +196,7 @@ def complex_candidate_search(
 def get_candidate_details(talent_id: int) -> Dict[str, Any]:
     """특정 후보자의 상세 정보 조회"""
     try:
-        talent = talent_repo.get_talent_by_id(talent_id)
+        talent = get_talent_repository().get_talent_by_id(talent_id)
 
         if talent:
             return {
@@ -221,7 +220,7 @@ def get_candidate_details(talent_id: int) -> Dict[str, Any]:
 def get_candidate_statistics() -> Dict[str, Any]:
     """전체 인재 데이터베이스 통계 조회"""
     try:
-        stats = talent_repo.get_statistics()
+        stats = get_talent_repository().get_statistics()
 
         return {
             "success": True,
@@ -240,7 +239,7 @@ def get_candidate_statistics() -> Dict[str, Any]:
 def search_companies_by_name(name: str, limit: int = 20) -> Dict[str, Any]:
     """회사 이름으로 검색"""
     try:
-        companies = talent_repo.search_companies_by_name(name)
+        companies = get_talent_repository().search_companies_by_name(name)
 
         return {
             "success": True,
@@ -259,7 +258,7 @@ def search_companies_by_name(name: str, limit: int = 20) -> Dict[str, Any]:
 def search_companies_by_category(category: str, limit: int = 20) -> Dict[str, Any]:
     """업종으로 회사 검색"""
     try:
-        companies = talent_repo.search_companies_by_category(category)
+        companies = get_talent_repository().search_companies_by_category(category)
 
         return {
             "success": True,
@@ -1,20 +1,30 @@
 """비정형 데이터 기반 시장 정보 및 기술 트렌드 도구들 (FAISS Vector DB)"""
 
+import os
 from typing import List, Dict, Any, Optional
 from langchain_core.tools import tool
 from ..vector_store.faiss_store import get_vector_store
 
-# 벡터 스토어 인스턴스
-vector_store = get_vector_store()
+# 벡터 스토어는 첫 도구 호출 시(또는 백그라운드 워밍업에서) 로드
+
+# 관련도가 낮은 문서는 제외하고(코사인 유사도 기준), 비슷한 기사는 MMR로 하나만 남김
+MIN_SCORE = float(os.getenv('RAG_MIN_SCORE', '0.3'))
+MMR_LAMBDA = float(os.getenv('RAG_MMR_LAMBDA', '0.5'))
+
+def _min_score() -> Optional[float]:
+    """MIN_SCORE를 벡터 스토어 메트릭의 점수 척도로 변환 (L2 스토어에 코사인 값을 그대로 쓰지 않음)"""
+    return get_vector_store().score_threshold(MIN_SCORE)
 
 @tool
 def search_tech_information(technology: str, top_k: int = 3) -> List[Dict[str, Any]]:
     """기술 정보 검색 (예: Python, React, AWS)"""
     try:
-        results = vector_store.search_by_category(
+        # 기술명 정확 일치를 살리기 위해 BM25 + 벡터 하이브리드 검색
+        results = get_vector_store().hybrid_search(
             query=f"{technology} 기술 특징 사용법 트렌드",
             category="tech_info",
-            top_k=top_k
+            top_k=top_k,
+            min_score=_min_score()
         )
 
         if not results:
@@ -41,10 +51,11 @@ def search_tech_information(technology: str, top_k: int = 3) -> List[Dict[str, A
 def search_market_trends(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
     """시장 트렌드 검색 (예: AI 엔지니어 수요, 원격근무 트렌드)"""
     try:
-        results = vector_store.search_by_category(
+        results = get_vector_store().search_by_category(
             query=query,
             category="market_trends",
-            top_k=top_k
+            top_k=top_k,
+            min_score=_min_score()
         )
 
         if not results:
@@ -71,10 +82,11 @@ def search_market_trends(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
 def search_industry_analysis(industry: str, top_k: int = 3) -> List[Dict[str, Any]]:
     """산업 분석 정보 검색 (예: 핀테크, 이커머스, AI)"""
     try:
-        results = vector_store.search_by_category(
+        results = get_vector_store().search_by_category(
             query=f"{industry} 산업 전망 동향 분석",
             category="industry_analysis",
-            top_k=top_k
+            top_k=top_k,
+            min_score=_min_score()
         )
 
         if not results:
@@ -101,10 +113,11 @@ def search_industry_analysis(industry: str, top_k: int = 3) -> List[Dict[str, An
 def search_salary_information(position: str, top_k: int = 3) -> List[Dict[str, Any]]:
     """급여 정보 검색 (예: AI 엔지니어, 데이터 사이언티스트)"""
     try:
-        results = vector_store.search_by_category(
+        results = get_vector_store().search_by_category(
             query=f"{position} 연봉 급여 수준",
             category="salary_info",
-            top_k=top_k
+            top_k=top_k,
+            min_score=_min_score()
         )
 
         if not results:
@@ -131,7 +144,7 @@ def search_salary_information(position: str, top_k: int = 3) -> List[Dict[str, A
 def general_knowledge_search(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     """일반 지식 검색 (자연어 질문 가능)"""
     try:
-        results = vector_store.search(query=query, top_k=top_k)
+        results = get_vector_store().search(query=query, top_k=top_k, min_score=_min_score(), mmr_lambda=MMR_LAMBDA)
 
         if not results:
             return {
@@ -157,16 +170,12 @@ def general_knowledge_search(query: str, top_k: int = 5) -> List[Dict[str, Any]]
 def compare_technologies(tech1: str, tech2: str) -> Dict[str, Any]:
     """두 기술 비교 (예: React vs Vue)"""
     try:
-        tech1_info = vector_store.search_by_category(
-            query=f"{tech1} 기술 특징",
-            category="tech_info",
-            top_k=2
-        )
-
-        tech2_info = vector_store.search_by_category(
-            query=f"{tech2} 기술 특징",
+        # 두 기술을 한 번의 배치 임베딩/검색으로 조회
+        tech1_info, tech2_info = get_vector_store().search_many(
+            queries=[f"{tech1} 기술 특징", f"{tech2} 기술 특징"],
             category="tech_info",
-            top_k=2
+            top_k=2,
+            min_score=_min_score()
         )
 
         return {
@@ -203,12 +212,19 @@ def search_company_information(company_name: str, top_k: int = 5) -> Dict[str, A
         해당 회사의 정보
     """
     try:
-        # 회사명으로 검색
-        results = vector_store.search_by_category(
+        # 회사명으로 검색 (회사명 정확 일치를 살리기 위해 하이브리드 검색)
+        search_kwargs = dict(
             query=f"{company_name} 회사 정보",
             category="company_info",
-            top_k=top_k
+            top_k=top_k,
+            min_score=_min_score(),
+            mmr_lambda=MMR_LAMBDA  # 같은 소식을 다룬 여러 기사 중복 제거
         )
+        # 해당 회사로 수집된 문서만 탐색하고, 저장된 회사명과 표기가 다르면 전체에서 검색
+        vector_store = get_vector_store()
+        results = vector_store.hybrid_search(**search_kwargs, metadata_filter={"company_name": company_name})
+        if not results:
+            results = vector_store.hybrid_search(**search_kwargs)
 
         if not results:
             return {
@@ -234,7 +250,7 @@ def search_company_information(company_name: str, top_k: int = 5) -> Dict[str, A
 def get_knowledge_base_stats() -> Dict[str, Any]:
     """지식 베이스 통계 정보 조회"""
     try:
-        stats = vector_store.get_stats()
+        stats = get_vector_store().get_stats()
 
         return {
             "success": True,
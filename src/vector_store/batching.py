@@ -0,0 +1,90 @@
+"""Micro-batching of concurrent single-text embedding requests"""
+
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """동시 단일 요청을 짧은 시간창 안에서 모아 한 번에 인코딩
+
+    여러 세션이 동시에 ``embed_text``를 호출하면 요청마다 배치 크기 1로 모델을
+    실행하게 됩니다. 첫 요청이 들어온 뒤 ``window_ms`` 동안(또는 ``max_batch``개가
+    찰 때까지) 들어온 요청을 모아 한 번의 ``encode``로 처리하고, 결과를 각 요청의
+    Future로 돌려줍니다. 같은 배치 안의 동일한 텍스트는 한 번만 인코딩합니다.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], window_ms: float = 3.0, max_batch: int = 32):
+        """
+        Args:
+            encode: 텍스트 리스트 → 임베딩 배열 (N, d)
+            window_ms: 첫 요청 후 다른 요청을 기다리는 시간 (밀리초)
+            max_batch: 한 번에 인코딩할 최대 요청 수
+        """
+        self._encode = encode
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._requests: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, text: str) -> "Future[np.ndarray]":
+        """텍스트 인코딩 요청 (결과는 Future로 반환)"""
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._worker.start()
+
+        future: "Future[np.ndarray]" = Future()
+        self._requests.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """텍스트 하나를 배치에 합류시켜 인코딩 (결과가 나올 때까지 대기)"""
+        return self.submit(text).result()
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """첫 요청을 기다린 뒤 시간창 동안 들어온 요청을 모음"""
+        batch = [self._requests.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """요청을 배치로 모아 인코딩하는 워커 루프"""
+        while True:
+            batch = self._collect()
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                embeddings = dict(zip(texts, self._encode(texts)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for text, future in batch:
+                future.set_result(embeddings[text].copy())
+
+    def info(self) -> Dict[str, Any]:
+        """배치 통계 (평균 배치 크기)"""
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'batches': self.batches,
+            'requests': self.requests,
+            'avg_batch_size': self.requests / self.batches if self.batches else 0.0
+        }
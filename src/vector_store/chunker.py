@@ -0,0 +1,114 @@
+"""Token-aware text chunker (Korean sentence boundaries)"""
+
+import re
+from typing import Callable, List, Optional
+
+# 문장 경계: 종결 부호(. ! ? 。) 뒤 공백, 또는 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """한국어 문장/줄 단위 분리 (빈 문장 제외)"""
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+class TextChunker:
+    """
+    토큰 수 기준 청크 분할기
+
+    문장 경계를 유지하며 ``chunk_size`` 토큰 이하로 문장을 묶고, 이전 청크의
+    마지막 문장들을 ``chunk_overlap`` 토큰까지 다음 청크 앞에 겹쳐 붙입니다.
+    한 문장이 ``chunk_size``를 넘으면 단어(필요하면 글자) 단위로 나눕니다.
+    """
+
+    def __init__(self, count_tokens: Callable[[str], int], chunk_size: int = 126, chunk_overlap: int = 32):
+        """
+        초기화
+
+        Args:
+            count_tokens: 텍스트의 토큰 수를 반환하는 함수 (임베딩 모델 토크나이저)
+            chunk_size: 청크당 최대 토큰 수
+            chunk_overlap: 인접 청크 간 겹치는 최대 토큰 수
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(f"chunk_overlap({chunk_overlap})은 chunk_size({chunk_size})보다 작아야 합니다")
+
+        self.count_tokens = count_tokens
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def _split_long(self, sentence: str, limit: int) -> List[str]:
+        """limit 토큰을 넘는 문장을 단어(단어가 너무 길면 글자) 단위로 분할"""
+        units = sentence.split() if len(sentence.split()) > 1 else list(sentence)
+        separator = " " if len(sentence.split()) > 1 else ""
+
+        pieces, current = [], []
+        for unit in units:
+            candidate = separator.join(current + [unit])
+            if current and self.count_tokens(candidate) > limit:
+                pieces.append(separator.join(current))
+                current = [unit]
+            else:
+                current.append(unit)
+        if current:
+            pieces.append(separator.join(current))
+
+        # 단어 하나가 limit을 넘는 경우 글자 단위로 재분할
+        result = []
+        for piece in pieces:
+            if separator and self.count_tokens(piece) > limit:
+                result.extend(self._split_long(piece.replace(" ", ""), limit))
+            else:
+                result.append(piece)
+        return result
+
+    def chunk(self, text: str, header: Optional[str] = None) -> List[str]:
+        """
+        텍스트를 청크로 분할
+
+        Args:
+            text: 분할할 텍스트
+            header: 두 번째 청크부터 앞에 붙일 문맥 제목 (예: 섹션 제목)
+
+        Returns:
+            청크 리스트 (분할이 필요 없으면 원문 하나)
+        """
+        if self.count_tokens(text) <= self.chunk_size:
+            return [text]
+
+        header_tokens = self.count_tokens(header) if header else 0
+        limit = max(self.chunk_size - header_tokens, self.chunk_overlap + 1)
+
+        sentences = []
+        for sentence in split_sentences(text):
+            if self.count_tokens(sentence) > limit:
+                sentences.extend(self._split_long(sentence, limit))
+            else:
+                sentences.append(sentence)
+        lengths = [self.count_tokens(sentence) for sentence in sentences]
+
+        chunks, current, current_tokens = [], [], 0
+        for sentence, length in zip(sentences, lengths):
+            if current and current_tokens + length > limit:
+                chunks.append(current)
+
+                # 마지막 문장들을 overlap 토큰 이내에서 다음 청크로 이월
+                overlap, overlap_tokens = [], 0
+                for prev_sentence, prev_length in reversed(current):
+                    if overlap_tokens + prev_length > self.chunk_overlap:
+                        break
+                    overlap.insert(0, (prev_sentence, prev_length))
+                    overlap_tokens += prev_length
+                if overlap_tokens + length > limit:
+                    overlap, overlap_tokens = [], 0
+                current, current_tokens = overlap, overlap_tokens
+
+            current.append((sentence, length))
+            current_tokens += length
+        if current:
+            chunks.append(current)
+
+        texts = [" ".join(sentence for sentence, _ in chunk) for chunk in chunks]
+        if header:
+            texts = [texts[0]] + [f"{header}\n{chunk_text}" for chunk_text in texts[1:]]
+        return texts
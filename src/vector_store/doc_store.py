@@ -0,0 +1,568 @@
+"""SQLite Document Store for the vector store metadata"""
+
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from .lexical import term_frequencies
+from .filters import compile_filter, indexable_fields, normalize_value
+from .ranking import l2_normalize
+
+SQLITE_BATCH = 500  # IN (...) 조회 한 번에 넘기는 ID/키 수 (SQLite 바인딩 변수 제한 대응)
+LEXICAL_DOCS = "lexical_docs"  # BM25 통계 store_meta 키 (카테고리별은 "키:카테고리")
+LEXICAL_TOKENS = "lexical_tokens"
+
+
+class DocumentStore:
+    """문서 메타데이터/원본 벡터 저장소 (SQLite)
+
+    문서는 ID로 필요한 행만 조회하므로 시작 시간과 검색 시 메모리 사용량이
+    전체 코퍼스 크기와 무관합니다. ``vector`` 컬럼에는 인덱스 재구축용
+    임베딩(float32)을 인덱스에 넣는 형태 그대로 보관합니다 (cosine 스토어는 정규화된 벡터).
+
+    ``doc_key``(URL 또는 본문 해시)와 ``content_hash``로 중복 삽입과
+    upsert 대상 문서를 찾습니다. ``postings`` 테이블은 BM25용 역색인으로,
+    문서와 같은 트랜잭션에서 갱신됩니다.
+
+    긴 문서는 청크 단위로 저장되며, 청크들은 원본 문서의 doc_key/본문 해시를
+    공유합니다. 원본 전문은 ``parents`` 테이블에 보관하고 마지막 청크가
+    삭제될 때 함께 정리합니다.
+
+    ``doc_fields`` 테이블은 메타데이터 (필드, 값) → 문서 ID 색인으로, 필터
+    검색 시 조건에 맞는 ID 집합을 전체 스캔 없이 구합니다.
+
+    BM25 코퍼스 통계(문서 수, 총 토큰 수)는 전체/카테고리별로 ``store_meta``에
+    두고 문서 추가/삭제와 같은 트랜잭션에서 갱신하므로 검색마다 다시 세지 않습니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블 생성"""
+        with self._lock:
+            has_fields = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'doc_fields'"
+            ).fetchone() is not None
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    vector BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_documents_category ON documents(category);
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+                CREATE TABLE IF NOT EXISTS parents (
+                    category TEXT NOT NULL,
+                    parent_key TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (category, parent_key)
+                );
+                CREATE TABLE IF NOT EXISTS doc_fields (
+                    field TEXT NOT NULL,
+                    value,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (field, value, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_doc_fields_doc ON doc_fields(doc_id);
+            """)
+
+            # 중복 제거용 컬럼 (이전 스키마에는 없음)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+            if 'doc_key' not in columns:
+                self._conn.execute("ALTER TABLE documents ADD COLUMN doc_key TEXT")
+                self._conn.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+                rows = self._conn.execute("SELECT id, text, metadata FROM documents").fetchall()
+                self._conn.executemany(
+                    "UPDATE documents SET doc_key = ?, content_hash = ? WHERE id = ?",
+                    [
+                        (self.document_key(self._row_to_doc(doc_id, text, metadata)), self.content_hash(text), doc_id)
+                        for doc_id, text, metadata in rows
+                    ]
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_key ON documents(category, doc_key)"
+            )
+
+            # 역색인 (이전 스키마에는 없음)
+            if 'token_count' not in columns:
+                self._conn.execute("ALTER TABLE documents ADD COLUMN token_count INTEGER NOT NULL DEFAULT 0")
+                rows = self._conn.execute("SELECT id, text FROM documents").fetchall()
+                self._index_terms(rows)
+
+            # 메타데이터 필터 색인 (이전 스키마에는 없음)
+            if not has_fields:
+                rows = self._conn.execute("SELECT id, category, text, metadata FROM documents").fetchall()
+                self._index_fields([
+                    dict(self._row_to_doc(doc_id, text, metadata), category=category)
+                    for doc_id, category, text, metadata in rows
+                ])
+
+            # BM25 코퍼스 통계 (이전 스키마에는 없음)
+            if self.get_meta(LEXICAL_DOCS) is None:
+                rows = self._conn.execute(
+                    "SELECT category, COUNT(*), COALESCE(SUM(token_count), 0) FROM documents GROUP BY category"
+                ).fetchall()
+                self._conn.execute("DELETE FROM store_meta WHERE key LIKE 'lexical_%'")
+                self._update_lexical_stats({category: (count, tokens) for category, count, tokens in rows})
+            self._conn.commit()
+
+    def _index_terms(self, rows: List[Tuple[int, str]]) -> List[int]:
+        """(문서 ID, 텍스트)의 역색인 기록 (호출자가 커밋) → 문서별 토큰 수"""
+        postings, lengths = [], []
+        for doc_id, text in rows:
+            frequencies, length = term_frequencies(text)
+            postings.extend((term, int(doc_id), tf) for term, tf in frequencies.items())
+            lengths.append((length, int(doc_id)))
+
+        self._conn.executemany("INSERT OR REPLACE INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", postings)
+        self._conn.executemany("UPDATE documents SET token_count = ? WHERE id = ?", lengths)
+        return [length for length, _ in lengths]
+
+    def _update_lexical_stats(self, deltas: Dict[str, Tuple[int, int]]):
+        """카테고리별 (문서 수, 토큰 수) 증감을 BM25 통계에 반영 (호출자가 커밋)"""
+        total_docs = sum(docs for docs, _ in deltas.values())
+        total_tokens = sum(tokens for _, tokens in deltas.values())
+        updates = [(LEXICAL_DOCS, total_docs), (LEXICAL_TOKENS, total_tokens)]
+        for category, (docs, tokens) in deltas.items():
+            updates.append((f"{LEXICAL_DOCS}:{category}", docs))
+            updates.append((f"{LEXICAL_TOKENS}:{category}", tokens))
+        self._conn.executemany(
+            "INSERT INTO store_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE "
+            "SET value = CAST(value AS INTEGER) + CAST(excluded.value AS INTEGER)",
+            [(key, str(int(delta))) for key, delta in updates]
+        )
+
+    def _index_fields(self, docs: List[Dict[str, Any]]):
+        """문서('id' 포함)의 메타데이터 필터 색인 기록 (호출자가 커밋)"""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO doc_fields (field, value, doc_id) VALUES (?, ?, ?)",
+            [(field, value, int(doc['id'])) for doc in docs for field, value in indexable_fields(doc)]
+        )
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """본문 해시"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def document_key(cls, doc: Dict[str, Any]) -> str:
+        """중복 판별 키 (명시적 doc_key → URL → 본문 해시 순)"""
+        return doc.get('doc_key') or doc.get('url') or cls.content_hash(doc['text'])
+
+    @staticmethod
+    def _row_to_doc(doc_id: int, text: str, metadata: str) -> Dict[str, Any]:
+        """DB 행을 문서 딕셔너리로 변환"""
+        doc = json.loads(metadata)
+        doc['id'] = doc_id
+        doc['text'] = text
+        return doc
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """스토어 메타 값 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        """스토어 메타 값 저장"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self._conn.commit()
+
+    def add(self, documents: List[Dict[str, Any]], vectors: np.ndarray,
+            ids: Optional[List[int]] = None,
+            parents: Optional[Dict[Tuple[str, str], str]] = None) -> List[int]:
+        """
+        문서 추가
+
+        Args:
+            documents: 메타데이터 딕셔너리 리스트 ('text', 'category' 포함,
+                청크는 원본 기준 'doc_key'/'content_hash' 지정)
+            vectors: 원본 임베딩 (N, d)
+            ids: 지정할 문서 ID (None이면 새 ID 발급)
+            parents: 청크의 원본 전문 {(카테고리, parent_key): 텍스트}
+
+        Returns:
+            문서 ID 리스트
+        """
+        with self._lock:
+            if ids is None:
+                next_id = int(self.get_meta('next_id', '0'))
+                ids = list(range(next_id, next_id + len(documents)))
+
+            rows = []
+            for doc_id, doc, vector in zip(ids, documents, vectors):
+                metadata = {k: v for k, v in doc.items() if k not in ('id', 'text', 'content_hash')}
+                rows.append((
+                    int(doc_id),
+                    doc.get('category', 'general'),
+                    doc['text'],
+                    json.dumps(metadata, ensure_ascii=False, default=str),
+                    np.ascontiguousarray(vector, dtype='float32').tobytes(),
+                    self.document_key(doc),
+                    doc.get('content_hash') or self.content_hash(doc['text'])
+                ))
+
+            self._conn.executemany(
+                "INSERT INTO documents (id, category, text, metadata, vector, doc_key, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            lengths = self._index_terms([(row[0], row[2]) for row in rows])
+            deltas: Dict[str, Tuple[int, int]] = {}
+            for row, length in zip(rows, lengths):
+                docs, tokens = deltas.get(row[1], (0, 0))
+                deltas[row[1]] = (docs + 1, tokens + length)
+            self._update_lexical_stats(deltas)
+            self._index_fields([
+                dict(doc, id=doc_id, category=doc.get('category', 'general'))
+                for doc_id, doc in zip(ids, documents)
+            ])
+            if parents:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO parents (category, parent_key, text) VALUES (?, ?, ?)",
+                    [(category, key, text) for (category, key), text in parents.items()]
+                )
+            next_id = max([int(self.get_meta('next_id', '0'))] + [doc_id + 1 for doc_id in ids])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('next_id', ?)", (str(next_id),)
+            )
+            self._conn.commit()
+
+        return list(ids)
+
+    def delete(self, ids: List[int]) -> Dict[str, List[int]]:
+        """
+        문서 삭제
+
+        Returns:
+            카테고리별 실제 삭제된 문서 ID
+        """
+        deleted: Dict[str, List[int]] = {}
+        deltas: Dict[str, Tuple[int, int]] = {}
+        keys = set()
+        with self._lock:
+            for start in range(0, len(ids), SQLITE_BATCH):
+                chunk = [int(doc_id) for doc_id in ids[start:start + SQLITE_BATCH]]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, category, doc_key, token_count FROM documents WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for doc_id, category, doc_key, token_count in rows:
+                    deleted.setdefault(category, []).append(doc_id)
+                    keys.add((category, doc_key))
+                    docs, tokens = deltas.get(category, (0, 0))
+                    deltas[category] = (docs - 1, tokens - token_count)
+                self._conn.execute(f"DELETE FROM documents WHERE id IN ({placeholders})", chunk)
+                self._conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", chunk)
+                self._conn.execute(f"DELETE FROM doc_fields WHERE doc_id IN ({placeholders})", chunk)
+
+            # 남은 청크가 없는 원본 전문 정리
+            self._conn.executemany(
+                "DELETE FROM parents WHERE category = ? AND parent_key = ? AND NOT EXISTS "
+                "(SELECT 1 FROM documents WHERE category = ? AND doc_key = ?)",
+                [(category, key, category, key) for category, key in keys]
+            )
+            self._update_lexical_stats(deltas)
+            self._conn.commit()
+        return deleted
+
+    def find_by_keys(self, category: str, keys: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+        """카테고리 내 doc_key로 기존 문서 조회 → {키: [(ID, 본문 해시)]}"""
+        found: Dict[str, List[Tuple[int, str]]] = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_BATCH):
+                chunk = keys[start:start + SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT doc_key, id, content_hash FROM documents "
+                    f"WHERE category = ? AND doc_key IN ({placeholders})",
+                    [category] + chunk
+                ).fetchall()
+                for key, doc_id, content_hash in rows:
+                    found.setdefault(key, []).append((doc_id, content_hash))
+        return found
+
+    @staticmethod
+    def _filter_query(metadata_filter: Dict[str, Any], category: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """
+        메타데이터 필터 → 문서 ID를 돌려주는 SQL (doc_fields 색인만 조회)
+
+        Raises:
+            ValueError: 필터 표현식이 잘못된 경우
+        """
+        if category is not None:
+            metadata_filter = dict(metadata_filter, category=category)
+
+        conditions = compile_filter(metadata_filter)
+        if not conditions:
+            raise ValueError("빈 필터입니다")
+
+        queries, params = [], []
+        for field, comparison, values in conditions:
+            queries.append(f"SELECT doc_id FROM doc_fields WHERE field = ? AND value {comparison}")
+            params.extend([field] + values)
+        return " INTERSECT ".join(queries), params
+
+    def ids_matching(self, metadata_filter: Dict[str, Any], category: Optional[str] = None) -> np.ndarray:
+        """
+        메타데이터 필터에 맞는 문서 ID (filters.compile_filter 표현식, 필드 간 AND)
+
+        Raises:
+            ValueError: 필터 표현식이 잘못된 경우
+        """
+        query, params = self._filter_query(metadata_filter, category)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return np.array(sorted(row[0] for row in rows), dtype='int64')
+
+    def ids_by_field(self, category: str, field: str, value: Any) -> List[int]:
+        """카테고리 내 메타데이터 필드 값이 일치하는 문서 ID"""
+        return self.ids_matching({field: value}, category).tolist()
+
+    def get_many(self, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """ID로 문서 조회 (존재하는 문서만 반환)"""
+        docs = {}
+        with self._lock:
+            for start in range(0, len(ids), SQLITE_BATCH):
+                chunk = [int(doc_id) for doc_id in ids[start:start + SQLITE_BATCH]]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, text, metadata FROM documents WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for doc_id, text, metadata in rows:
+                    docs[doc_id] = self._row_to_doc(doc_id, text, metadata)
+        return docs
+
+    def get_parents(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """청크의 원본 전문 조회 → {(카테고리, parent_key): 텍스트}"""
+        parents = {}
+        with self._lock:
+            for category, key in dict.fromkeys(keys):
+                row = self._conn.execute(
+                    "SELECT text FROM parents WHERE category = ? AND parent_key = ?", (category, key)
+                ).fetchone()
+                if row:
+                    parents[(category, key)] = row[0]
+        return parents
+
+    def has_parents(self) -> bool:
+        """청크로 분할 저장된 문서가 있는지 여부"""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM parents LIMIT 1").fetchone() is not None
+
+    def ids_excluding(self, field: str, values: List[Any]) -> List[int]:
+        """메타데이터 필드 값이 values에 없는 문서 ID (ID 순, 필드가 없는 문서 포함)"""
+        values = [normalize_value(field, value) for value in values]
+        placeholders = ",".join("?" * len(values))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM documents WHERE id NOT IN "
+                f"(SELECT doc_id FROM doc_fields WHERE field = ? AND value IN ({placeholders})) ORDER BY id",
+                [field] + values
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def category_ids(self, category: str) -> np.ndarray:
+        """카테고리의 문서 ID (ID 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM documents WHERE category = ? ORDER BY id", (category,)
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype='int64')
+
+    def ids_since(self, min_id: int) -> List[int]:
+        """min_id 이상인 문서 ID (ID 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM documents WHERE id >= ? ORDER BY id", (int(min_id),)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def key_ids(self) -> Dict[Tuple[str, str], List[int]]:
+        """전체 문서의 (카테고리, doc_key) → 문서 ID 리스트 (청크는 원본 키 공유)"""
+        found: Dict[Tuple[str, str], List[int]] = {}
+        with self._lock:
+            for doc_id, category, doc_key in self._conn.execute("SELECT id, category, doc_key FROM documents"):
+                found.setdefault((category, doc_key), []).append(doc_id)
+        return found
+
+    def vector_dimension(self) -> Optional[int]:
+        """저장된 벡터 차원 (문서가 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT vector FROM documents LIMIT 1").fetchone()
+        return len(row[0]) // np.dtype('float32').itemsize if row else None
+
+    def export(self, ids: List[int]) -> Tuple[List[Dict[str, Any]], np.ndarray, Dict[Tuple[str, str], str]]:
+        """
+        다른 문서 저장소로 옮길 문서 조회 (재임베딩 없이 복사용)
+
+        Returns:
+            (문서 리스트 ('content_hash' 포함, ID 순서), 원본 벡터, 청크 원본 전문)
+        """
+        docs = self.get_many(ids)
+        with self._lock:
+            hashes = {}
+            for start in range(0, len(ids), SQLITE_BATCH):
+                chunk = [int(doc_id) for doc_id in ids[start:start + SQLITE_BATCH]]
+                placeholders = ",".join("?" * len(chunk))
+                hashes.update(self._conn.execute(
+                    f"SELECT id, content_hash FROM documents WHERE id IN ({placeholders})", chunk
+                ).fetchall())
+
+        documents = []
+        for doc_id in ids:
+            doc = docs[int(doc_id)]
+            doc['content_hash'] = hashes[int(doc_id)]
+            documents.append(doc)
+        parents = self.get_parents([
+            (doc.get('category', 'general'), doc['parent_key']) for doc in documents if 'parent_key' in doc
+        ])
+        return documents, self.get_vectors(ids), parents
+
+    def get_vectors(self, ids: List[int]) -> np.ndarray:
+        """ID 순서대로 원본 벡터 조회"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), SQLITE_BATCH):
+                chunk = [int(doc_id) for doc_id in ids[start:start + SQLITE_BATCH]]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, vector FROM documents WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                found.update({doc_id: np.frombuffer(blob, dtype='float32') for doc_id, blob in rows})
+        return np.stack([found[int(doc_id)] for doc_id in ids])
+
+    def normalize_vectors(self) -> int:
+        """
+        저장된 원본 벡터를 L2 정규화해 다시 기록 (한 트랜잭션, cosine 스토어 변환용)
+
+        Returns:
+            갱신된 문서 수
+        """
+        updated, last_id = 0, -1
+        with self._lock:
+            while True:
+                rows = self._conn.execute(
+                    "SELECT id, vector FROM documents WHERE id > ? ORDER BY id LIMIT ?", (last_id, SQLITE_BATCH)
+                ).fetchall()
+                if not rows:
+                    break
+                vectors = l2_normalize(np.stack([np.frombuffer(blob, dtype='float32') for _, blob in rows]))
+                self._conn.executemany(
+                    "UPDATE documents SET vector = ? WHERE id = ?",
+                    [(vector.tobytes(), doc_id) for (doc_id, _), vector in zip(rows, vectors)]
+                )
+                updated += len(rows)
+                last_id = rows[-1][0]
+            self._conn.commit()
+        return updated
+
+    def category_vectors(self, category: str, after_id: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+        """카테고리의 (ID, 원본 벡터) 조회 (인덱스 재구축/재생용, after_id 초과 ID만)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, vector FROM documents WHERE category = ? AND id > ? ORDER BY id",
+                (category, int(after_id))
+            ).fetchall()
+
+        if not rows:
+            return np.zeros(0, dtype='int64'), None
+        ids = np.array([row[0] for row in rows], dtype='int64')
+        vectors = np.stack([np.frombuffer(row[1], dtype='float32') for row in rows])
+        return ids, vectors
+
+    def lexical_stats(self, category: Optional[str] = None,
+                      metadata_filter: Optional[Dict[str, Any]] = None) -> Tuple[int, float]:
+        """
+        BM25 통계 (문서 수, 평균 토큰 수, 필터 지정 시 필터에 맞는 문서 기준)
+
+        필터가 없으면 store_meta에 유지되는 통계를 그대로 읽습니다.
+        """
+        if metadata_filter:
+            filter_query, params = self._filter_query(metadata_filter, category)
+            with self._lock:
+                count, avg_length = self._conn.execute(
+                    f"SELECT COUNT(*), AVG(token_count) FROM documents WHERE id IN ({filter_query})", params
+                ).fetchone()
+            return count, float(avg_length or 0.0)
+
+        suffix = "" if category is None else f":{category}"
+        with self._lock:
+            rows = dict(self._conn.execute(
+                "SELECT key, value FROM store_meta WHERE key IN (?, ?)",
+                (LEXICAL_DOCS + suffix, LEXICAL_TOKENS + suffix)
+            ).fetchall())
+        count = int(rows.get(LEXICAL_DOCS + suffix, 0))
+        tokens = int(rows.get(LEXICAL_TOKENS + suffix, 0))
+        return count, tokens / count if count else 0.0
+
+    def term_postings(self, terms: List[str], category: Optional[str] = None,
+                      metadata_filter: Optional[Dict[str, Any]] = None) -> List[Tuple[str, int, int, int]]:
+        """
+        용어별 postings 조회 → (용어, 문서 ID, tf, 문서 토큰 수)
+
+        필터를 지정하면 필터에 맞는 문서에서 출발해 (term, doc_id) 기본 키로 postings를 찾으므로
+        흔한 용어라도 필터 밖 문서의 postings는 읽지 않습니다.
+        """
+        placeholders = ",".join("?" * len(terms))
+        if metadata_filter:
+            filter_query, filter_params = self._filter_query(metadata_filter, category)
+            query = (
+                f"WITH allowed(doc_id) AS ({filter_query}) "
+                "SELECT p.term, p.doc_id, p.tf, d.token_count FROM allowed a "
+                "CROSS JOIN postings p CROSS JOIN documents d "
+                f"WHERE p.term IN ({placeholders}) AND p.doc_id = a.doc_id AND d.id = a.doc_id"
+            )
+            with self._lock:
+                return self._conn.execute(query, filter_params + list(terms)).fetchall()
+
+        query = (
+            "SELECT p.term, p.doc_id, p.tf, d.token_count FROM postings p "
+            f"JOIN documents d ON d.id = p.doc_id WHERE p.term IN ({placeholders})"
+        )
+        params: List[Any] = list(terms)
+        if category is not None:
+            query += " AND d.category = ?"
+            params.append(category)
+
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def category_counts(self) -> Dict[str, int]:
+        """카테고리별 문서 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*) FROM documents GROUP BY category ORDER BY MIN(id)"
+            ).fetchall()
+        return {category: count for category, count in rows}
+
+    def count(self) -> int:
+        """전체 문서 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
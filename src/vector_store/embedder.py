@@ -1,92 +1,532 @@
 """Korean Embedding Model using Sentence Transformers"""
 
 import os
-from typing import List
-from sentence_transformers import SentenceTransformer
+import time
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import numpy as np
+from .embedding_cache import LRUEmbeddingCache, DiskEmbeddingCache, normalize_text
+from .batching import MicroBatcher
+from .ranking import l2_normalize
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# 추론 백엔드
+# - torch: 기본 PyTorch 모델
+# - torch_int8: Linear 층을 동적 int8 양자화한 PyTorch 모델 (CPU 전용, 추가 의존성 없음)
+# - onnx / onnx_int8: ONNX Runtime (optimum[onnxruntime] 필요, int8은 동적 양자화 모델을 한 번 내보내 재사용)
+EMBEDDING_BACKENDS = ('torch', 'torch_int8', 'onnx', 'onnx_int8')
+
+# 백엔드 일치 검증용 기본 문장 (검색 쿼리/지식 문서와 비슷한 길이)
+PARITY_SAMPLE_TEXTS = [
+    "Python 백엔드 개발자 연봉",
+    "AI 엔지니어 채용 시장 트렌드",
+    "React와 Vue의 차이점은 무엇인가요?",
+    "토스 회사 정보",
+    "Kubernetes는 컨테이너화된 애플리케이션의 배포, 확장, 관리를 자동화하는 오픈소스 플랫폼입니다.",
+    "신입 데이터 사이언티스트의 평균 연봉은 4000만원에서 5000만원 수준이며 경력에 따라 크게 달라집니다.",
+]
+
+
+def load_sentence_transformer(model_name: str, device: str = "cpu", backend: str = "torch",
+                              onnx_dir: Optional[str] = None, revision: Optional[str] = None) -> "SentenceTransformer":
+    """
+    백엔드별 SentenceTransformer 로드 (모두 같은 encode API 제공)
+
+    sentence_transformers(torch 포함)는 import만으로 수 초가 걸리므로 여기서 처음 import합니다.
+
+    Args:
+        model_name: HuggingFace 모델 이름
+        device: 'cpu' 또는 'cuda' (int8 백엔드는 CPU만 지원)
+        backend: EMBEDDING_BACKENDS 중 하나
+        onnx_dir: onnx_int8 모델을 내보낼 디렉토리
+        revision: HuggingFace 모델 리비전 (브랜치/태그/커밋 해시, None이면 기본 브랜치)
+
+    Raises:
+        ValueError: 지원하지 않는 백엔드인 경우
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드: {backend} (사용 가능: {', '.join(EMBEDDING_BACKENDS)})")
+
+    from sentence_transformers import SentenceTransformer
+
+    hub_kwargs = {'revision': revision} if revision else {}
+    if backend == 'torch':
+        return SentenceTransformer(model_name, device=device, **hub_kwargs)
+
+    if backend == 'torch_int8':
+        import torch
+        model = SentenceTransformer(model_name, device='cpu', **hub_kwargs)
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    if backend == 'onnx':
+        return SentenceTransformer(model_name, device=device, backend='onnx', **hub_kwargs)
+
+    # 양자화 ONNX 모델은 한 번 내보낸 뒤 로컬 디렉토리에서 로드
+    quantization = os.getenv('EMBEDDING_ONNX_QUANTIZATION', 'avx512_vnni')
+    model_path = Path(onnx_dir or './vector_store/onnx') / (
+        model_name.replace('/', '__') + (f"@{revision}" if revision else "")
+    )
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    if not (model_path / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        print(f"int8 ONNX 모델 내보내는 중: {model_path / file_name}")
+        exported = SentenceTransformer(model_name, device='cpu', backend='onnx', **hub_kwargs)
+        exported.save(str(model_path))
+        export_dynamic_quantized_onnx_model(exported, quantization, str(model_path))
+    return SentenceTransformer(str(model_path), device=device, backend='onnx', model_kwargs={'file_name': file_name})
+
+
+def model_revision(model: "SentenceTransformer") -> Optional[str]:
+    """로드된 모델의 HuggingFace 커밋 해시 (로컬 경로 등으로 알 수 없으면 None)"""
+    try:
+        return model[0].auto_model.config._commit_hash or None
+    except Exception:
+        return None
+
+
+# 인코딩 프로세스 풀 워커의 모델 (프로세스마다 한 번 로드)
+_worker_model = None
+
+
+def _init_encode_worker(model_name: str, device: str, backend: str, onnx_dir: Optional[str], torch_threads: int,
+                        revision: Optional[str] = None):
+    """인코딩 워커 초기화 (torch 스레드 수 제한 후 모델 로드)"""
+    global _worker_model
+    if torch_threads > 0:
+        import torch
+        torch.set_num_threads(torch_threads)
+    _worker_model = load_sentence_transformer(model_name, device, backend, onnx_dir, revision)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> np.ndarray:
+    """워커 프로세스에서 텍스트 묶음 인코딩"""
+    return _worker_model.encode(
+        texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+    ).astype('float32')
+
 
 class KoreanEmbedder:
     """한국어 임베딩 모델 (무료)"""
 
-    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask", device: str = "cpu"):
+    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask", device: str = "cpu",
+                 cache_size: int = 1024, cache_ttl: float = 3600, disk_cache_path: Optional[str] = None,
+                 pool_workers: int = 0, pool_threads: int = 1, pool_min_batch: int = 64,
+                 backend: str = "torch", onnx_dir: Optional[str] = None,
+                 batch_window_ms: float = 0, batch_max_size: int = 32, token_budget: int = 0,
+                 revision: Optional[str] = None):
         """
         초기화
 
         Args:
             model_name: HuggingFace 모델 이름
             device: 'cpu' 또는 'cuda'
+            cache_size: 쿼리 임베딩 LRU 캐시 크기 (0이면 비활성화)
+            cache_ttl: 쿼리 임베딩 캐시 유효 시간(초, 0이면 만료 없음)
+            disk_cache_path: 문서 임베딩 영구 캐시(SQLite) 경로 (None이면 비활성화)
+            pool_workers: 문서 배치 인코딩 프로세스 수 (1 이하면 현재 프로세스에서 인코딩)
+            pool_threads: 인코딩 프로세스당 torch 스레드 수 (0이면 torch 기본값)
+            pool_min_batch: 프로세스 풀을 사용할 최소 텍스트 수
+            backend: 추론 백엔드 (EMBEDDING_BACKENDS 참고)
+            onnx_dir: onnx_int8 백엔드의 내보낸 모델 디렉토리
+            batch_window_ms: 동시 embed_text 요청을 모으는 시간창 (밀리초, 0이면 요청마다 바로 인코딩)
+            batch_max_size: 한 번에 모을 최대 요청 수
+            token_budget: 문서 배치 인코딩 시 배치당 최대 토큰 수 (패딩 포함, 0이면 batch_size × 최대 길이)
+            revision: 모델 리비전 (None이면 기본 브랜치, 로드 후 실제 커밋 해시로 채움)
         """
         self.model_name = model_name
         self.device = device
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.revision = revision
         self.model = None
+        self.query_cache = LRUEmbeddingCache(max_size=cache_size, ttl=cache_ttl)
+        self.disk_cache = DiskEmbeddingCache(disk_cache_path) if disk_cache_path else None
+        self.pool_workers = pool_workers
+        self.pool_threads = pool_threads
+        self.pool_min_batch = pool_min_batch
+        self._pool: Optional[ProcessPoolExecutor] = None  # 다중 프로세스 인코딩 풀 (필요할 때 시작)
+        self._pool_size = 0
+        self.token_budget = token_budget
+        self._padded_tokens = 0  # 길이별 배치의 패딩 포함 토큰 수 (통계)
+        self._real_tokens = 0
+        self._pool_lock = threading.Lock()
+        self._batcher: Optional[MicroBatcher] = None  # 동시 embed_text 요청 묶음 처리
+        if batch_window_ms > 0:
+            self._batcher = MicroBatcher(self._encode_queries, window_ms=batch_window_ms, max_batch=batch_max_size)
         self._load_model()
 
     def _load_model(self):
         """모델 로드"""
         try:
-            print(f"임베딩 모델 로딩 중: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name, device=self.device)
+            print(f"임베딩 모델 로딩 중: {self.model_name} (백엔드: {self.backend})")
+            self.model = load_sentence_transformer(
+                self.model_name, self.device, self.backend, self.onnx_dir, self.revision
+            )
+            # 풀 워커도 같은 커밋을 받도록 실제 리비전으로 고정
+            self.revision = self.revision or model_revision(self.model)
             print(f"임베딩 모델 로드 완료 (디바이스: {self.device})")
         except Exception as e:
             print(f"임베딩 모델 로드 실패: {e}")
             raise
 
-    def embed_text(self, text: str) -> np.ndarray:
+    def _cache_key(self, text: str):
+        """쿼리 캐시 키 (모델명 + 정규화된 텍스트)"""
+        return (self.model_name, normalize_text(text))
+
+    def embed_text(self, text: str, normalize: bool = False) -> np.ndarray:
         """
-        단일 텍스트 임베딩
+        단일 텍스트 임베딩 (쿼리 LRU 캐시 사용)
 
         Args:
             text: 임베딩할 텍스트
+            normalize: True면 L2 정규화된 벡터 반환 (코사인 유사도용)
 
         Returns:
-            임베딩 벡터 (numpy array)
+            임베딩 벡터 (float32 numpy array)
         """
         if not self.model:
             raise ValueError("모델이 로드되지 않았습니다")
 
         try:
-            embedding = self.model.encode(text, convert_to_numpy=True)
-            return embedding
+            key = self._cache_key(text)
+            embedding = self.query_cache.get(key)
+            if embedding is None:
+                if self._batcher is not None:
+                    # 다른 세션의 동시 요청과 한 번의 배치로 인코딩
+                    embedding = self._batcher.encode(key[1])
+                else:
+                    embedding = self.model.encode(key[1], convert_to_numpy=True).astype('float32')
+                self.query_cache.put(key, embedding)
+
+            return l2_normalize(embedding) if normalize else embedding.copy()
         except Exception as e:
             print(f"텍스트 임베딩 중 오류: {e}")
             raise
 
-    def embed_texts(self, texts: List[str], batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
+    def embed_queries(self, texts: List[str], normalize: bool = False) -> np.ndarray:
         """
-        여러 텍스트 배치 임베딩
+        여러 검색 쿼리 임베딩 (캐시 미스만 한 번의 배치로 인코딩)
+
+        Args:
+            texts: 쿼리 텍스트 리스트
+            normalize: True면 L2 정규화된 벡터 반환 (코사인 유사도용)
+
+        Returns:
+            임베딩 벡터 배열 (float32 numpy array)
+        """
+        if not self.model:
+            raise ValueError("모델이 로드되지 않았습니다")
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self.query_cache.get(key) for key in keys]
+
+        # 같은 배치 안의 중복 쿼리는 한 번만 인코딩
+        missing_keys = list(dict.fromkeys(key for key, embedding in zip(keys, embeddings) if embedding is None))
+        if missing_keys:
+            try:
+                encoded = self._encode_queries([key[1] for key in missing_keys])
+            except Exception as e:
+                print(f"쿼리 임베딩 중 오류: {e}")
+                raise
+
+            encoded_by_key = dict(zip(missing_keys, encoded))
+            for key, embedding in encoded_by_key.items():
+                self.query_cache.put(key, embedding)
+            embeddings = [
+                encoded_by_key[key] if embedding is None else embedding
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        result = np.stack(embeddings) if embeddings else np.zeros((0, self.get_embedding_dim()), dtype='float32')
+        return l2_normalize(result) if normalize else result
+
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
+        """쿼리 묶음 인코딩 (float32, 진행 표시 없음)"""
+        return self.model.encode(texts, batch_size=max(len(texts), 1), show_progress_bar=False,
+                                 convert_to_numpy=True).astype('float32')
+
+    def embed_texts(self, texts: List[str], batch_size: int = 32, show_progress: bool = True,
+                    normalize: bool = False) -> np.ndarray:
+        """
+        여러 텍스트 배치 임베딩 (영구 캐시에 없는 텍스트만 인코딩)
 
         Args:
             texts: 임베딩할 텍스트 리스트
             batch_size: 배치 크기
             show_progress: 진행 상황 표시 여부
+            normalize: True면 L2 정규화된 벡터 반환 (코사인 유사도용)
 
         Returns:
-            임베딩 벡터 배열 (numpy array)
+            임베딩 벡터 배열 (float32 numpy array)
         """
         if not self.model:
             raise ValueError("모델이 로드되지 않았습니다")
 
         try:
-            embeddings = self.model.encode(
-                texts,
-                batch_size=batch_size,
-                show_progress_bar=show_progress,
-                convert_to_numpy=True
-            )
+            if self.disk_cache is None:
+                embeddings = self._encode(texts, batch_size, show_progress)
+            else:
+                embeddings = self._embed_texts_cached(texts, batch_size, show_progress)
+            if normalize:
+                embeddings = l2_normalize(embeddings)
             return embeddings
         except Exception as e:
             print(f"배치 임베딩 중 오류: {e}")
             raise
 
+    def start_multi_process_pool(self, workers: Optional[int] = None) -> bool:
+        """
+        문서 배치 인코딩용 다중 프로세스 풀 시작 (프로세스마다 모델을 로드)
+
+        torch와 fork가 섞이지 않도록 spawn으로 시작하며, 워커마다 torch 스레드 수를
+        pool_threads로 제한해 코어를 나눠 씁니다.
+
+        Returns:
+            풀 사용 가능 여부
+        """
+        workers = self.pool_workers if workers is None else workers
+        if workers <= 1:
+            return False
+
+        with self._pool_lock:
+            if self._pool is None:
+                print(f"임베딩 프로세스 풀 시작: {workers}개 프로세스 (프로세스당 torch 스레드 {self.pool_threads or '기본값'})")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_encode_worker,
+                    initargs=(self.model_name, self.device, self.backend, self.onnx_dir, self.pool_threads,
+                              self.revision)
+                )
+                self._pool_size = workers
+        return True
+
+    def stop_multi_process_pool(self):
+        """다중 프로세스 풀 종료"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _length_buckets(self, texts: List[str], batch_size: int) -> List[List[int]]:
+        """
+        토큰 길이순으로 정렬해 토큰 예산 안에서 묶은 배치 (텍스트 인덱스 리스트)
+
+        배치는 가장 긴 텍스트 길이로 패딩되므로 길이가 비슷한 텍스트끼리 묶고,
+        (배치 크기 × 최장 길이)가 토큰 예산을 넘지 않게 배치 크기를 정합니다.
+        짧은 지식 섹션은 큰 배치로, 긴 기사는 작은 배치로 인코딩됩니다.
+        기본 예산(batch_size × 최대 길이)은 고정 배치의 최대 패딩 크기와 같습니다.
+        """
+        max_length = self.get_max_seq_length()
+        budget = self.token_budget or batch_size * max_length
+        lengths = [
+            len(ids) for ids in self.model.tokenizer(texts, truncation=True, max_length=max_length)['input_ids']
+        ]
+
+        # 긴 텍스트부터 (첫 배치가 가장 큰 메모리를 쓰므로 문제가 있으면 바로 드러남)
+        order = sorted(range(len(texts)), key=lengths.__getitem__, reverse=True)
+        buckets: List[List[int]] = []
+        for i in order:
+            if buckets and (len(buckets[-1]) + 1) * lengths[buckets[-1][0]] <= budget:
+                buckets[-1].append(i)
+            else:
+                buckets.append([i])
+
+        self._padded_tokens += sum(len(bucket) * lengths[bucket[0]] for bucket in buckets)
+        self._real_tokens += sum(lengths)
+        return buckets
+
+    def _encode(self, texts: List[str], batch_size: int, show_progress: bool) -> np.ndarray:
+        """
+        모델 배치 인코딩 (float32, 입력 순서 유지)
+
+        길이별 배치(_length_buckets)로 인코딩하고, 텍스트가 pool_min_batch개 이상이면
+        배치들을 프로세스 풀에 나누어 병렬 인코딩합니다.
+        """
+        if not texts:
+            return np.zeros((0, self.get_embedding_dim()), dtype='float32')
+
+        buckets = self._length_buckets(texts, batch_size)
+        batches = [[texts[i] for i in bucket] for bucket in buckets]
+        if show_progress:
+            print(f"임베딩: {len(texts)}개 텍스트 → 길이별 {len(batches)}개 배치")
+
+        encoded = None
+        if len(texts) >= self.pool_min_batch and self.start_multi_process_pool():
+            try:
+                encoded = list(self._pool.map(_encode_in_worker, batches, [len(batch) for batch in batches]))
+            except BrokenProcessPool as e:
+                # 워커가 죽으면(메모리 부족 등) 풀을 끄고 현재 프로세스에서 인코딩
+                print(f"임베딩 프로세스 풀 오류, 단일 프로세스로 전환: {e}")
+                self.stop_multi_process_pool()
+                self.pool_workers = 0
+
+        if encoded is None:
+            encoded = [
+                self.model.encode(batch, batch_size=len(batch), show_progress_bar=False, convert_to_numpy=True)
+                for batch in batches
+            ]
+
+        embeddings = np.empty((len(texts), encoded[0].shape[1]), dtype='float32')
+        for bucket, batch_embeddings in zip(buckets, encoded):
+            embeddings[bucket] = batch_embeddings
+        return embeddings
+
+    def _embed_texts_cached(self, texts: List[str], batch_size: int, show_progress: bool) -> np.ndarray:
+        """영구 캐시를 조회하고 새 텍스트(중복 제거)만 인코딩"""
+        keys = [DiskEmbeddingCache.content_key(self.model_name, text, self.revision, self.backend) for text in texts]
+        cached = self.disk_cache.get_many(list(dict.fromkeys(keys)))
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            encoded = self._encode(list(missing.values()), batch_size, show_progress)
+            new_embeddings = dict(zip(missing.keys(), encoded))
+            self.disk_cache.put_many(new_embeddings)
+            cached.update(new_embeddings)
+
+        if show_progress:
+            print(f"임베딩 캐시: {len(texts) - len(missing)}건 재사용, {len(missing)}건 신규 인코딩")
+
+        if not keys:
+            return np.zeros((0, self.get_embedding_dim()), dtype='float32')
+        return np.stack([cached[key] for key in keys])
+
     def get_embedding_dim(self) -> int:
         """임베딩 차원 반환"""
         if not self.model:
             raise ValueError("모델이 로드되지 않았습니다")
         return self.model.get_sentence_embedding_dimension()
 
+    def get_max_seq_length(self) -> int:
+        """모델 최대 입력 토큰 수 (초과분은 인코딩 시 잘림)"""
+        if not self.model:
+            raise ValueError("모델이 로드되지 않았습니다")
+        return int(self.model.max_seq_length or 512)
+
+    def count_tokens(self, text: str) -> int:
+        """모델 토크나이저 기준 토큰 수 (특수 토큰 제외)"""
+        if not self.model:
+            raise ValueError("모델이 로드되지 않았습니다")
+        return len(self.model.tokenizer.tokenize(text))
+
+    def check_parity(self, texts: Optional[List[str]] = None, min_cosine: float = 0.99,
+                     repeats: int = 5) -> Dict[str, Any]:
+        """
+        현재 백엔드와 기준(torch) 모델의 임베딩 일치도 및 쿼리 지연 비교
+
+        기존 인덱스는 기준 모델 벡터로 만들어졌으므로, 다른 백엔드는 코사인 유사도가
+        min_cosine 이상일 때만 같은 인덱스에 사용할 수 있습니다.
+
+        Args:
+            texts: 비교할 문장 (기본값: PARITY_SAMPLE_TEXTS)
+            min_cosine: 통과 기준 최소 코사인 유사도
+            repeats: 지연 측정 반복 횟수
+
+        Returns:
+            {'backend', 'min_cosine', 'mean_cosine', 'passed', 'reference_ms', 'backend_ms', 'speedup'}
+        """
+        if not self.model:
+            raise ValueError("모델이 로드되지 않았습니다")
+
+        texts = texts or PARITY_SAMPLE_TEXTS
+        reference = self.model if self.backend == 'torch' else load_sentence_transformer(
+            self.model_name, self.device, 'torch', revision=self.revision
+        )
+
+        def _single_query_ms(model: "SentenceTransformer") -> float:
+            model.encode(texts[0], convert_to_numpy=True)  # 워밍업
+            started = time.perf_counter()
+            for _ in range(repeats):
+                for text in texts:
+                    model.encode(text, convert_to_numpy=True)
+            return (time.perf_counter() - started) * 1000 / (repeats * len(texts))
+
+        expected = l2_normalize(reference.encode(texts, convert_to_numpy=True).astype('float32'))
+        actual = l2_normalize(self.model.encode(texts, convert_to_numpy=True).astype('float32'))
+        cosines = np.sum(expected * actual, axis=1)
+
+        reference_ms = _single_query_ms(reference)
+        backend_ms = _single_query_ms(self.model)
+        return {
+            'backend': self.backend,
+            'min_cosine': float(cosines.min()),
+            'mean_cosine': float(cosines.mean()),
+            'passed': bool(cosines.min() >= min_cosine),
+            'reference_ms': reference_ms,
+            'backend_ms': backend_ms,
+            'speedup': reference_ms / max(backend_ms, 1e-9)
+        }
+
+    def cache_info(self) -> Dict[str, Any]:
+        """임베딩 캐시 통계 (쿼리 LRU 캐시 + 문서 영구 캐시)"""
+        info = self.query_cache.info()
+        if self.disk_cache is not None:
+            info['disk'] = self.disk_cache.info()
+        if self._batcher is not None:
+            info['batching'] = self._batcher.info()
+        if self._padded_tokens:
+            info['padding_ratio'] = 1 - self._real_tokens / self._padded_tokens
+        return info
+
 
 # 전역 임베더 인스턴스
 _embedder_instance = None
+_embedder_lock = threading.Lock()
+
+def create_embedder(model_name: Optional[str] = None, device: Optional[str] = None,
+                    revision: Optional[str] = None) -> KoreanEmbedder:
+    """
+    환경변수 설정으로 새 임베더 생성 (전역 인스턴스와 별개)
+
+    저장된 벡터 스토어가 다른 모델로 만들어졌을 때, 재임베딩이 끝날 때까지 그 모델로
+    쿼리를 임베딩하는 데 사용합니다.
+
+    Args:
+        model_name: 모델 이름 (기본값: 환경변수 또는 jhgan/ko-sroberta-multitask)
+        device: 디바이스 (기본값: 환경변수 또는 cpu)
+        revision: 모델 리비전 (기본값: 환경변수 EMBEDDING_MODEL_REVISION)
+    """
+    if model_name is None:
+        model_name = os.getenv('EMBEDDING_MODEL', 'jhgan/ko-sroberta-multitask')
+    if device is None:
+        device = os.getenv('EMBEDDING_DEVICE', 'cpu')
+    if revision is None:
+        revision = os.getenv('EMBEDDING_MODEL_REVISION') or None
+
+    disk_cache_path = None
+    if os.getenv('EMBEDDING_DISK_CACHE', 'true').lower() == 'true':
+        disk_cache_path = os.getenv('EMBEDDING_CACHE_PATH') or os.path.join(
+            os.getenv('VECTOR_STORE_PATH', './vector_store'), 'embedding_cache.sqlite'
+        )
+
+    embedder = KoreanEmbedder(
+        model_name=model_name,
+        device=device,
+        cache_size=int(os.getenv('EMBEDDING_CACHE_SIZE', '1024')),
+        cache_ttl=float(os.getenv('EMBEDDING_CACHE_TTL', '3600')),
+        disk_cache_path=disk_cache_path,
+        pool_workers=int(os.getenv('EMBEDDING_POOL_WORKERS', '0')),
+        pool_threads=int(os.getenv('EMBEDDING_POOL_THREADS', '1')),
+        pool_min_batch=int(os.getenv('EMBEDDING_POOL_MIN_BATCH', '64')),
+        backend=os.getenv('EMBEDDING_BACKEND', 'torch'),
+        onnx_dir=os.getenv('EMBEDDING_ONNX_DIR') or os.path.join(
+            os.getenv('VECTOR_STORE_PATH', './vector_store'), 'onnx'
+        ),
+        batch_window_ms=float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', '3')),
+        batch_max_size=int(os.getenv('EMBEDDING_BATCH_MAX_SIZE', '32')),
+        token_budget=int(os.getenv('EMBEDDING_TOKEN_BUDGET', '0')),
+        revision=revision
+    )
+    atexit.register(embedder.stop_multi_process_pool)
+    return embedder
+
 
 def get_embedder(model_name: str = None, device: str = None) -> KoreanEmbedder:
     """
@@ -98,12 +538,9 @@ def get_embedder(model_name: str = None, device: str = None) -> KoreanEmbedder:
     """
     global _embedder_instance
 
-    if _embedder_instance is None:
-        if model_name is None:
-            model_name = os.getenv('EMBEDDING_MODEL', 'jhgan/ko-sroberta-multitask')
-        if device is None:
-            device = os.getenv('EMBEDDING_DEVICE', 'cpu')
-
-        _embedder_instance = KoreanEmbedder(model_name=model_name, device=device)
+    # 여러 세션이 동시에 처음 호출해도 모델은 한 번만 로드
+    with _embedder_lock:
+        if _embedder_instance is None:
+            _embedder_instance = create_embedder(model_name, device)
 
-    return _embedder_instance
\ No newline at end of file
+    return _embedder_instance
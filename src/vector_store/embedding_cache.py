@@ -0,0 +1,160 @@
+"""Embedding caches for KoreanEmbedder"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from .doc_store import SQLITE_BATCH
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize('NFC', text).split())
+
+
+class LRUEmbeddingCache:
+    """쿼리 임베딩 LRU 캐시 (크기 및 TTL 제한, 스레드 안전)"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        """
+        초기화
+
+        Args:
+            max_size: 최대 항목 수 (0이면 캐시 비활성화)
+            ttl: 항목 유효 시간(초, 0이면 만료 없음)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        """캐시 조회 (만료된 항목은 제거)"""
+        if self.max_size <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, embedding = entry
+                if self.ttl <= 0 or time.monotonic() - created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return embedding
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[str, str], embedding: np.ndarray):
+        """캐시 저장 (용량 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+
+        embedding = embedding.copy()
+        embedding.setflags(write=False)  # 캐시된 벡터가 호출자에 의해 변경되지 않도록
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 및 카운터 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl
+            }
+
+
+class DiskEmbeddingCache:
+    """콘텐츠 해시 기반 영구 임베딩 캐시 (SQLite)
+
+    키는 ``sha256(모델명@리비전/백엔드 + 텍스트)``이므로 같은 문서가 여러 키워드/업로드에서
+    반복되어도 모델은 한 번만 호출되고, 리비전이나 추론 정밀도가 바뀌면 다시 인코딩합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_key(model_name: str, text: str, revision: Optional[str] = None, backend: str = "torch") -> str:
+        """모델(이름, 리비전, 백엔드) + 텍스트 내용 해시"""
+        return hashlib.sha256(f"{model_name}@{revision or ''}/{backend}\n{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """여러 키 일괄 조회 → 캐시에 있는 항목만 반환"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_BATCH):
+                chunk = keys[start:start + SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype='float32')
+
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """여러 임베딩 저장"""
+        rows = [
+            (key, int(embedding.shape[-1]), np.ascontiguousarray(embedding, dtype='float32').tobytes())
+            for key, embedding in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def info(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': size,
+                'path': str(self.db_path)
+            }
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
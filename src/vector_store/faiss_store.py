@@ -1,81 +1,705 @@
-"""FAISS Vector Store for Knowledge Base"""
+"""FAISS Vector Store for Knowledge Base
+
+저장 구조
+    카테고리마다 ``IndexIDMap2`` 인덱스를 두고 ID로 문서 저장소(SQLite)의 전역 문서 ID를
+    사용합니다. 문서와 벡터는 추가 즉시 문서 저장소에 커밋되고(append-only 로그), 인덱스
+    파일은 스냅샷이라 로드 시 스냅샷 이후 문서만 재생합니다. 인덱스 타입/메트릭은
+    ``IndexConfig``가 정하며, cosine 스토어는 쓰기 시점에 한 번 정규화한 벡터를 저장합니다.
+
+동시성
+    검색은 읽기 잠금, 문서 저장소와 인덱스를 함께 바꾸는 쓰기는 쓰기 잠금으로 처리합니다.
+    임베딩과 인덱스 재구축은 잠금 밖에서 하고 교체 시점에 그 사이 변경분만 반영합니다.
+    IVF/HNSW 삭제는 tombstone으로 검색에서 제외하고 비율을 넘으면 백그라운드에서 재구축합니다.
+
+세대
+    지식 베이스 재구축과 재임베딩은 ``generations/<세대>``에 새 세대를 만든 뒤 ``CURRENT``
+    포인터를 원자적으로 바꿉니다(없으면 ``store_path`` 자체가 데이터 디렉토리). 빌드/전환/정리는
+    스토어 파일 잠금으로 프로세스 간 직렬화하고, 사용 중인 세대는 정리하지 않습니다.
+    ``VECTOR_INDEX_MMAP``/``VECTOR_INDEX_RELOAD_INTERVAL``로 여러 프로세스가 스냅샷을 공유합니다.
+
+모델 명세
+    각 세대에 벡터를 만든 임베딩 모델 명세를 기록하고, 모델이 바뀌면
+    ``VECTOR_MODEL_MISMATCH``에 따라 로드를 거부하거나(error) 재임베딩한 세대로 전환합니다(reembed).
+    긴 문서는 토큰 기준 청크로 색인하고 검색은 원본 문서마다 가장 유사한 청크 하나를 반환합니다.
+"""
 
 import os
 import pickle
-from typing import List, Dict, Any, Optional
+import shutil
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 import numpy as np
 import faiss
 from pathlib import Path
-from .embedder import get_embedder
+from .embedder import KoreanEmbedder, create_embedder, get_embedder
+from .doc_store import SQLITE_BATCH, DocumentStore
+from .locking import ReadWriteLock
+from .lexical import BM25Retriever, reciprocal_rank_fusion
+from .chunker import TextChunker
+from .ranking import l2_normalize, maximal_marginal_relevance
+from .ingest import ingest_stream
+from .registry import describe_spec, embedding_spec, incompatible_fields, read_spec, write_spec
+from .snapshot import (
+    acquire_lease, cleanup_generations, current_generation, generation_path, new_generation_id,
+    read_manifest, set_current_generation, store_lock, write_atomic, write_manifest
+)
+from .index_factory import (
+    QUANTIZED_TYPES, REMOVABLE_TYPES, IndexConfig, build_index, index_kind, index_metric, reconstruct_vectors, search_parameters
+)
+
+# mmap으로 읽을 때의 플래그 (Flat/SQ 코드 배열을 파일에서 직접 매핑)
+_MMAP_FLAG = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
 
 class FAISSVectorStore:
-    """FAISS 기반 벡터 스토어"""
+    """FAISS 기반 벡터 스토어
+
+    카테고리별 인덱스와 SQLite 문서 저장소를 함께 관리하며, 하나의 인스턴스를 여러
+    세션이 공유합니다 (저장 구조와 동시성 설계는 모듈 docstring 참고).
+    """
 
-    def __init__(self, store_path: str = "./vector_store"):
+    CHUNK_FETCH_FACTOR = 3  # 원본별 중복 청크 제거를 위한 후보 배수
+
+    def __init__(self, store_path: str = "./vector_store", index_config: Optional[IndexConfig] = None,
+                 compact_threshold: Optional[int] = None, mmap_indexes: Optional[bool] = None,
+                 reload_interval: Optional[float] = None, generation: Optional[str] = None,
+                 embedder: Optional[KoreanEmbedder] = None):
         self.store_path = Path(store_path)
         self.store_path.mkdir(parents=True, exist_ok=True)
 
-        self.embedder = get_embedder()
+        # 세대 디렉토리 (지정하지 않으면 CURRENT 포인터가 가리키는 세대)
+        self.generation = generation or current_generation(self.store_path)
+        self.data_path = generation_path(self.store_path, self.generation) if self.generation else self.store_path
+        self.data_path.mkdir(parents=True, exist_ok=True)
+        self._lease = acquire_lease(self.data_path)  # 사용 중인 세대는 다른 프로세스가 정리하지 않음
+        self.index_dir = self.data_path / "indexes"
+
+        # 카테고리별 FAISS 인덱스 + 문서 메타데이터 저장소
+        self.category_indexes: Dict[str, faiss.Index] = {}
+        self.doc_store = DocumentStore(str(self.data_path / "documents.sqlite"))
+        self._migrate_legacy_metadata()  # 모델 확인 전에 변환해야 이전 벡터를 현재 모델 것으로 기록하지 않음
+
+        # 저장된 벡터의 모델과 다르면 재임베딩 전까지 저장된 모델로 검색
+        self.index_config = index_config or IndexConfig.from_env()
+        self.embedder = embedder or get_embedder()
+        self._target_embedder: Optional[KoreanEmbedder] = None
+        self._check_embedding_model()
         self.embedding_dim = self.embedder.get_embedding_dim()
+        self.chunker = self._create_chunker()
+        self.lexical = BM25Retriever(self.doc_store)  # 역색인은 문서 저장소에 함께 저장
+
+        # 스냅샷에 반영되지 않은 변경 추적 (백그라운드 compaction 기준)
+        if compact_threshold is None:
+            compact_threshold = int(os.getenv('VECTOR_COMPACT_THRESHOLD', '500'))
+        self.compact_threshold = compact_threshold
+        self._dirty_categories = set()
+        self._pending_documents = 0
+        self._lock = ReadWriteLock()
+        self._compact_mutex = threading.Lock()
+        self._compact_thread: Optional[threading.Thread] = None
 
-        # FAISS 인덱스
-        self.index = None
-        self.documents = []  # 문서 메타데이터
-        self.categories = {}  # 카테고리별 문서 인덱스
+        # IVF/HNSW에서 삭제된 문서 (검색에서 제외, 비율을 넘으면 백그라운드 재구축)
+        self.tombstone_ratio = float(os.getenv('VECTOR_TOMBSTONE_RATIO', '0.1'))
+        self._tombstones: Dict[str, Set[int]] = {}
+        self._stale_categories: Set[str] = set()
+        self._rebuild_guard = threading.Lock()
+        self._rebuild_thread: Optional[threading.Thread] = None
 
+        # mmap 로드 및 다른 프로세스의 스냅샷 갱신 감지
+        if mmap_indexes is None:
+            mmap_indexes = os.getenv('VECTOR_INDEX_MMAP', 'false').lower() == 'true'
+        if reload_interval is None:
+            reload_interval = float(os.getenv('VECTOR_INDEX_RELOAD_INTERVAL', '0'))
+        self.mmap_indexes = mmap_indexes
+        self._mmapped_categories = set()
+        self._index_mtimes: Dict[str, int] = {}
+        self._watcher_stop = threading.Event()
+        self._watcher_thread: Optional[threading.Thread] = None
+
+        self._unit_vectors = False  # 저장 벡터(와 쿼리)를 L2 정규화하는지 (_normalize_stored_vectors에서 결정)
         self._load_or_create_index()
+        self.rebuild_async()
+        if reload_interval > 0:
+            self.start_reload_watcher(reload_interval)
+
+    @property
+    def embedding_spec(self) -> Dict[str, Any]:
+        """검색에 사용 중인 임베딩 모델 명세"""
+        return embedding_spec(self.embedder, self.index_config.metric == 'cosine')
+
+    def score_threshold(self, min_cosine: Optional[float]) -> Optional[float]:
+        """
+        코사인 유사도 기준 임계값을 이 스토어의 점수 척도로 변환
+
+        Returns:
+            search의 min_score로 넘길 값 (정규화되지 않은 L2 스토어는 대응 관계가 없어 None)
+        """
+        if min_cosine is None or not self._unit_vectors:
+            return None
+        return self.index_config.cosine_to_score(min_cosine)
+
+    @property
+    def needs_reembedding(self) -> bool:
+        """저장된 벡터가 설정된 모델과 달라 재임베딩이 필요한지 여부"""
+        return self._target_embedder is not None
+
+    def _check_embedding_model(self):
+        """
+        저장된 모델 명세와 현재 임베더 비교 (로드 시 호출)
+
+        명세는 벡터를 실제로 만든 모델을 나타내므로 비어 있는 스토어(또는 재임베딩한 세대)에만
+        현재 명세를 기록합니다. 명세가 없는 이전 버전 스토어는 매니페스트의 모델/차원 또는
+        저장된 벡터 차원으로 확인합니다.
+
+        Raises:
+            ValueError: 벡터 공간이 다른데 VECTOR_MODEL_MISMATCH=error이거나,
+                이전 버전 스토어의 벡터 차원이 현재 모델과 다른 경우
+        """
+        current = self.embedding_spec
+        if self.doc_store.count() == 0:
+            if self._pending_pickle_metadata() is None:  # 변환에 실패한 이전 버전 벡터는 다음 시작 때 들어옴
+                write_spec(self.doc_store, current)
+            return
+
+        stored = read_spec(self.doc_store)
+        if stored is None:
+            manifest = self.manifest
+            if manifest.get('model'):
+                stored = {'model': manifest['model'], 'revision': manifest.get('revision'),
+                          'dimension': manifest.get('dimension')}
+                write_spec(self.doc_store, stored)
+            else:
+                stored_dim = self.doc_store.vector_dimension()
+                if stored_dim != current['dimension']:
+                    raise ValueError(
+                        f"저장된 벡터 차원({stored_dim})이 현재 모델 {describe_spec(current)}과 다릅니다. "
+                        f"EMBEDDING_MODEL을 원래 모델로 설정하거나 지식 베이스를 force=True로 재구축하세요"
+                    )
+                return  # 어떤 모델로 만든 벡터인지 알 수 없으므로 명세를 기록하지 않음
+
+        changed = incompatible_fields(stored, current)
+        if not changed:
+            if stored.get('backend') not in (None, current['backend']):
+                # 같은 벡터 공간의 근사 추론 → 저장된 명세는 벡터를 만든 백엔드로 유지
+                print(f"저장된 벡터는 {stored['backend']} 백엔드로 생성됨 (쿼리 백엔드: {current['backend']})")
+            return
+
+        message = (f"임베딩 모델 변경 감지 ({', '.join(changed)}): "
+                   f"저장 {describe_spec(stored)} → 현재 {describe_spec(current)}")
+        if os.getenv('VECTOR_MODEL_MISMATCH', 'reembed').lower() == 'error':
+            raise ValueError(f"{message}. VECTOR_MODEL_MISMATCH=reembed로 재임베딩하거나 모델 설정을 되돌리세요")
+
+        print(f"{message}, 재임베딩 완료 전까지 저장된 모델로 검색합니다")
+        stored_embedder = create_embedder(stored['model'], revision=stored.get('revision'))
+        if stored.get('dimension') and stored_embedder.get_embedding_dim() != stored['dimension']:
+            raise ValueError(f"저장된 모델을 로드했지만 차원이 다릅니다: {describe_spec(stored)}")
+        self._target_embedder = self.embedder
+        self.embedder = stored_embedder
+
+    def _create_chunker(self) -> Optional[TextChunker]:
+        """환경변수 기반 청크 분할기 생성 (비활성화 시 None)"""
+        if os.getenv('VECTOR_CHUNKING', 'true').lower() != 'true':
+            return None
+
+        # 기본 크기는 모델 최대 길이에서 특수 토큰([CLS], [SEP])을 뺀 값
+        chunk_size = int(os.getenv('VECTOR_CHUNK_SIZE', '0')) or self.embedder.get_max_seq_length() - 2
+        chunk_overlap = int(os.getenv('VECTOR_CHUNK_OVERLAP', '32'))
+        return TextChunker(self.embedder.count_tokens, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    @property
+    def ntotal(self) -> int:
+        """전체 인덱싱된 벡터 수"""
+        return sum(index.ntotal for index in list(self.category_indexes.values()))
 
     def _load_or_create_index(self):
-        """인덱스 로드 또는 생성"""
-        index_path = self.store_path / "faiss.index"
-        metadata_path = self.store_path / "metadata.pkl"
+        """
+        인덱스 로드 또는 생성
+
+        문서 저장소가 원본 벡터를 갖고 있으므로 스냅샷 파일을 읽을 수 없으면 그 카테고리만
+        저장된 벡터로 재구축합니다 (문서 저장소 자체의 오류는 그대로 전달).
+        """
+        self._normalize_stored_vectors()
+
+        category_counts = self.doc_store.category_counts()
+        if not category_counts:
+            self._create_new_index()
+            return
+
+        for category, count in category_counts.items():
+            index_path = self.index_dir / f"{category}.index"
+            if index_path.exists():
+                try:
+                    self._load_category_index(category, index_path)
+                    replayed = self._reconcile_category(category)
+                except (RuntimeError, OSError) as e:
+                    print(f"  {category}: 인덱스 스냅샷 로드 실패 ({e}), 저장된 벡터로 재구축합니다")
+                    self.category_indexes.pop(category, None)
+                    self._mmapped_categories.discard(category)
+                else:
+                    if replayed:
+                        print(f"  {category}: 스냅샷 이후 문서 {replayed}개 재생")
+            if category not in self.category_indexes or self._indexed_count(category) != count:
+                # 인덱스 파일이 없거나 읽을 수 없거나 문서 저장소와 어긋나면 저장된 벡터로 재구축
+                self._rebuild_category_index(category)
+
+        print(f"벡터 스토어 로드 완료: {self.doc_store.count()}개 문서")
+        stored_metric = self.doc_store.get_meta('metric', 'l2')  # 메트릭 기록 이전 버전은 L2
+        if stored_metric != self.index_config.metric:
+            print(f"메트릭 변경 감지 ({stored_metric} → {self.index_config.metric})")
+
+        # 설정된 인덱스 타입/메트릭과 다르면 재구축 (마이그레이션)
+        self.rebuild_indexes(only_mismatched=True)
+        if self._dirty_categories or stored_metric != self.index_config.metric:
+            self.save()
+
+    def _normalize_stored_vectors(self):
+        """
+        cosine 스토어의 저장 벡터를 한 번만 L2 정규화 (정규화 이전 버전 변환)
 
-        if index_path.exists() and metadata_path.exists():
+        정규화는 쓰기 시점(_prepare_vectors)에 한 번만 하고, 재구축/재생/재순위화/MMR은
+        저장된 벡터를 그대로 사용합니다.
+        """
+        self._unit_vectors = self.doc_store.get_meta('vectors_normalized') == '1'
+        if self._unit_vectors or not self.index_config.normalize:
+            if self._unit_vectors and not self.index_config.normalize and self.doc_store.count():
+                print("저장된 벡터가 정규화되어 있어 L2 거리는 코사인과 같은 순위를 냅니다")
+            return
+
+        if self.doc_store.count():
+            print("저장된 벡터 L2 정규화 중 (cosine 메트릭, 최초 1회)...")
+            print(f"  {self.doc_store.normalize_vectors()}개 벡터 정규화 완료")
+        self.doc_store.set_meta('vectors_normalized', '1')
+        self._unit_vectors = True
+
+    def _pending_pickle_metadata(self) -> Optional[Path]:
+        """아직 변환하지 않은 이전 버전 metadata.pkl 경로 (없으면 None)"""
+        metadata_path = self.data_path / "metadata.pkl"
+        if not metadata_path.exists() or self.doc_store.get_meta('pickle_migrated') is not None:
+            return None
+        return metadata_path if self.doc_store.count() == 0 else None
+
+    def _migrate_legacy_metadata(self):
+        """
+        이전 버전(pickle 메타데이터) 변환 (원본 파일은 그대로 두고 변환 여부는 store_meta에 기록)
+
+        변환한 벡터를 만든 모델은 알 수 없으므로 모델 명세는 기록하지 않습니다
+        (_check_embedding_model이 저장된 벡터 차원으로만 확인).
+        """
+        metadata_path = self._pending_pickle_metadata()
+        if metadata_path is None:
+            return
+        try:
+            self._migrate_pickle_metadata(metadata_path)
+        except (OSError, RuntimeError, KeyError, pickle.UnpicklingError) as e:
+            # 원본 파일은 그대로 두므로 다음 시작 시 다시 변환 시도
+            print(f"metadata.pkl 변환 실패: {e}, 빈 스토어로 시작합니다")
+
+    def _migrate_pickle_metadata(self, metadata_path: Path):
+        """metadata.pkl + FAISS 인덱스를 SQLite 문서 저장소로 변환 (벡터 차원은 기존 인덱스 기준)"""
+        print("metadata.pkl을 SQLite 문서 저장소로 변환 중...")
+        with open(metadata_path, 'rb') as f:
+            data = pickle.load(f)
+        documents = data['documents']
+        if not documents:
+            self.doc_store.set_meta('pickle_migrated', metadata_path.name)
+            return
+
+        # 원본 벡터는 기존 인덱스에서 복원
+        legacy_index_path = self.data_path / "faiss.index"
+        if self.index_dir.exists():
+            vectors = None
+            for category in data['categories']:
+                ids, category_vectors = reconstruct_vectors(
+                    faiss.read_index(str(self.index_dir / f"{category}.index"))
+                )
+                if vectors is None:
+                    vectors = np.zeros((len(documents), category_vectors.shape[1]), dtype='float32')
+                vectors[ids] = category_vectors
+        elif legacy_index_path.exists():
+            legacy_index = faiss.read_index(str(legacy_index_path))
+            vectors = legacy_index.reconstruct_n(0, legacy_index.ntotal)
+        else:
+            raise FileNotFoundError(f"인덱스 파일이 없습니다: {self.index_dir}")
+
+        self.doc_store.add(documents, vectors, ids=[doc['id'] for doc in documents])
+        self.doc_store.set_meta('metric', data.get('metric', 'l2'))
+        self.doc_store.set_meta('pickle_migrated', metadata_path.name)
+        print(f"  {len(documents)}개 문서 변환 완료")
+
+    def _read_index(self, path: Path) -> Tuple[faiss.Index, bool]:
+        """인덱스 파일 읽기 → (인덱스, mmap 여부) (mmap을 지원하지 않으면 일반 읽기)"""
+        if self.mmap_indexes:
             try:
-                self.index = faiss.read_index(str(index_path))
-                with open(metadata_path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.documents = data['documents']
-                    self.categories = data['categories']
-                print(f"벡터 스토어 로드 완료: {len(self.documents)}개 문서")
-            except Exception as e:
-                print(f"벡터 스토어 로드 실패: {e}, 새로 생성합니다")
-                self._create_new_index()
+                return faiss.read_index(str(path), _MMAP_FLAG), True
+            except RuntimeError as e:
+                print(f"mmap 로드 실패, 일반 로드로 대체: {path.name} ({e})")
+        return faiss.read_index(str(path)), False
+
+    def _load_category_index(self, category: str, path: Path):
+        """카테고리 스냅샷 로드 (파일 수정 시각 기록)"""
+        mtime = path.stat().st_mtime_ns
+        index, mmapped = self._read_index(path)
+        self._set_index(category, index, mmapped)
+        self._index_mtimes[category] = mtime
+
+    def _set_index(self, category: str, index: faiss.Index, mmapped: bool = False):
+        """카테고리 인덱스 교체"""
+        self.category_indexes[category] = index
+        if mmapped:
+            self._mmapped_categories.add(category)
         else:
-            self._create_new_index()
+            self._mmapped_categories.discard(category)
+
+    def _writable_index(self, category: str) -> faiss.Index:
+        """변경할 인덱스 반환 (mmap 인덱스는 읽기 전용이므로 메모리 사본으로 교체)"""
+        index = self.category_indexes[category]
+        if category in self._mmapped_categories:
+            index = faiss.deserialize_index(faiss.serialize_index(index))
+            self._set_index(category, index)
+        return index
+
+    @staticmethod
+    def _max_indexed_id(index: faiss.Index) -> int:
+        """인덱스에 포함된 최대 문서 ID (비어 있으면 -1)"""
+        ids = faiss.vector_to_array(index.id_map)
+        return int(ids.max()) if ids.size else -1
+
+    def _replay_category(self, category: str) -> int:
+        """스냅샷 이후 문서 저장소에 추가된 문서를 인덱스에 재생"""
+        index = self.category_indexes[category]
+        ids, vectors = self.doc_store.category_vectors(category, after_id=self._max_indexed_id(index))
+        if ids.size == 0:
+            return 0
+
+        index = self._writable_index(category)
+        index.add_with_ids(vectors, ids)
+        self._dirty_categories.add(category)
+        return int(ids.size)
+
+    def _remove_from_index(self, category: str, ids: List[int]):
+        """
+        카테고리 인덱스에서 문서 제거 (쓰기 잠금 안에서 호출)
+
+        Flat/SQ는 remove_ids로 바로 지우고, IVF/HNSW는 삭제된 ID를 tombstone으로 기록해
+        검색에서 제외합니다. tombstone이 tombstone_ratio를 넘으면 재구축 대상으로 표시합니다.
+        """
+        index = self.category_indexes[category]
+        self._dirty_categories.add(category)
+        if index_kind(index) in REMOVABLE_TYPES:
+            self._writable_index(category).remove_ids(np.asarray(ids, dtype='int64'))
+            return
+
+        tombstones = self._tombstones.setdefault(category, set())
+        tombstones.update(int(doc_id) for doc_id in ids)
+        if len(tombstones) > self.tombstone_ratio * max(index.ntotal, 1):
+            self._stale_categories.add(category)
+
+    def _indexed_count(self, category: str) -> int:
+        """검색 가능한 벡터 수 (tombstone 제외)"""
+        return self.category_indexes[category].ntotal - len(self._tombstones.get(category, ()))
+
+    def _reconcile_category(self, category: str) -> int:
+        """
+        스냅샷을 문서 저장소에 맞춤 (이후 추가된 문서는 재생, 이후 삭제된 문서는 제거)
+
+        Returns:
+            재생된 문서 수
+        """
+        replayed = self._replay_category(category)
+        indexed = faiss.vector_to_array(self.category_indexes[category].id_map)
+        removed = np.setdiff1d(indexed, self.doc_store.category_ids(category), assume_unique=True)
+        if removed.size:
+            self._remove_from_index(category, removed.tolist())
+        return replayed
+
+    def _new_category_index(self) -> faiss.Index:
+        """빈 카테고리 인덱스 생성 (전역 문서 ID 매핑)"""
+        empty = np.zeros((0, self.embedding_dim), dtype='float32')
+        return build_index(self.index_config, self.embedding_dim, empty, np.zeros(0, dtype='int64'))
+
+    def _prepare_vectors(self, embeddings: np.ndarray) -> np.ndarray:
+        """새 임베딩을 저장 형식으로 변환 (정규화 스토어면 쓰기 시점에 한 번만 L2 정규화)"""
+        if self._unit_vectors:
+            return l2_normalize(embeddings)
+        return np.ascontiguousarray(embeddings, dtype='float32')
+
+    def _rebuild_category_index(self, category: str):
+        """
+        카테고리 인덱스를 저장된 원본 벡터로 현재 설정의 타입/메트릭에 맞게 재구축
+
+        새 인덱스는 잠금 밖에서 만들고, 교체 시점에 빌드 중 추가/삭제된 문서만 반영합니다.
+        쓰기 잠금을 가진 채 호출하면 빌드 내내 검색이 막히므로 rebuild_async를 사용합니다.
+        """
+        doc_store = self.doc_store
+        index = self._build_from_store(category)
+
+        with self._lock.write_locked():
+            if self.doc_store is not doc_store:
+                return  # 빌드 중 다른 세대로 전환됨
+            self._set_index(category, index)
+            self._tombstones.pop(category, None)
+            self._reconcile_category(category)
+            self._dirty_categories.add(category)
+
+    def rebuild_async(self):
+        """재구축 대상 카테고리를 백그라운드 스레드에서 재구축 (대상이 없거나 이미 실행 중이면 무시)"""
+        with self._rebuild_guard:
+            if self._rebuild_thread is not None or not self._stale_categories:
+                return
+
+            def _run():
+                while True:
+                    with self._lock.write_locked():
+                        category = self._stale_categories.pop() if self._stale_categories else None
+                    if category is None:
+                        # 쓰기 잠금을 가진 채 rebuild_async를 부르는 경로가 있으므로 두 잠금을 겹쳐 잡지 않음
+                        with self._rebuild_guard:
+                            if not self._stale_categories:
+                                self._rebuild_thread = None
+                                return
+                        continue
+                    try:
+                        print(f"인덱스 백그라운드 재구축: {category}")
+                        self._rebuild_category_index(category)
+                    except Exception as e:
+                        print(f"인덱스 백그라운드 재구축 실패: {category} ({e})")
+
+            self._rebuild_thread = threading.Thread(target=_run, name="vector-store-rebuild-index", daemon=True)
+            self._rebuild_thread.start()
+
+    def _build_from_store(self, category: str) -> faiss.Index:
+        """문서 저장소의 원본 벡터로 카테고리 인덱스 생성"""
+        ids, vectors = self.doc_store.category_vectors(category)
+        if ids.size == 0:
+            return self._new_category_index()
+        return build_index(self.index_config, self.embedding_dim, vectors, ids)
+
+    def _index_matches_config(self, index: faiss.Index) -> bool:
+        """인덱스 타입/메트릭이 현재 설정과 일치하고 IVF nlist가 벡터 수에 맞는지 여부"""
+        return (
+            index_kind(index) == self.index_config.target_type(index.ntotal)
+            and index_metric(index) == self.index_config.metric
+            and not self.index_config.needs_retrain(index)
+        )
+
+    def rebuild_indexes(self, only_mismatched: bool = False) -> List[str]:
+        """
+        카테고리 인덱스를 설정된 타입으로 재구축
+
+        Args:
+            only_mismatched: True면 현재 타입이 설정과 다른 인덱스만 재구축
+
+        Returns:
+            재구축된 카테고리 리스트
+        """
+        rebuilt = []
+        for category, index in list(self.category_indexes.items()):
+            if only_mismatched and self._index_matches_config(index):
+                continue
+
+            current = f"{index_kind(index)}/{index_metric(index)}"
+            target = f"{self.index_config.target_type(index.ntotal)}/{self.index_config.metric}"
+            print(f"인덱스 재구축: {category} ({current} → {target}, {index.ntotal}개 벡터)")
+            self._rebuild_category_index(category)
+            rebuilt.append(category)
+
+        return rebuilt
 
     def _create_new_index(self):
         """새 인덱스 생성"""
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
-        self.documents = []
-        self.categories = {}
+        self.category_indexes = {}
         print(f"새 벡터 인덱스 생성 완료 (차원: {self.embedding_dim})")
 
-    def add_documents(self, texts: List[str], metadata: List[Dict[str, Any]] = None):
-        """문서 추가"""
+    def _deduplicate(self, texts: List[str], metadata: List[Dict[str, Any]],
+                     upsert: bool) -> Tuple[List[str], List[Dict[str, Any]], List[int]]:
+        """
+        중복 문서 제거
+
+        같은 카테고리에서 doc_key(URL 또는 본문 해시)가 같은 문서는 한 번만 저장합니다.
+        기존 문서와 키는 같고 본문이 다르면 upsert=True일 때 교체 대상으로 반환합니다.
+
+        Returns:
+            (추가할 텍스트, 추가할 메타데이터, 교체되어 삭제할 기존 문서 ID)
+        """
+        seen = set()
+        candidates: Dict[str, List[int]] = {}
+        for i, meta in enumerate(metadata):
+            category = meta.get('category', 'general')
+            key = (category, DocumentStore.document_key(meta))
+            if key in seen:
+                continue
+            seen.add(key)
+            candidates.setdefault(category, []).append(i)
+
+        keep, replaced_ids = [], []
+        for category, rows in candidates.items():
+            existing = self.doc_store.find_by_keys(
+                category, [DocumentStore.document_key(metadata[i]) for i in rows]
+            )
+            for i in rows:
+                matches = existing.get(DocumentStore.document_key(metadata[i]), [])
+                if not matches:
+                    keep.append(i)
+                elif upsert and DocumentStore.content_hash(texts[i]) not in {h for _, h in matches}:
+                    keep.append(i)
+                    replaced_ids.extend(doc_id for doc_id, _ in matches)
+
+        keep.sort()
+        skipped = len(texts) - len(keep)
+        if skipped or replaced_ids:
+            print(f"중복 문서 {skipped}건 제외, 기존 문서 {len(replaced_ids)}건 교체")
+        return [texts[i] for i in keep], [metadata[i] for i in keep], replaced_ids
+
+    def _chunk_documents(self, texts: List[str], metadata: List[Dict[str, Any]]
+                         ) -> Tuple[List[str], List[Dict[str, Any]], Dict[Tuple[str, str], str]]:
+        """
+        긴 문서를 청크로 분할
+
+        청크는 원본의 doc_key/본문 해시를 공유하므로 중복 판별과 upsert는 원본 단위로
+        동작하고, 'parent_key'/'chunk_index'/'chunk_count'로 원본을 찾을 수 있습니다.
+
+        Returns:
+            (청크 텍스트, 청크 메타데이터, 원본 전문 {(카테고리, parent_key): 텍스트})
+        """
+        if self.chunker is None:
+            return texts, metadata, {}
+
+        chunk_texts, chunk_metadata, parents = [], [], {}
+        for text, meta in zip(texts, metadata):
+            pieces = self.chunker.chunk(text, header=meta.get('title') or None)
+            if len(pieces) == 1:
+                chunk_texts.append(text)
+                chunk_metadata.append(meta)
+                continue
+
+            parent_key = DocumentStore.document_key(meta)
+            parents[(meta.get('category', 'general'), parent_key)] = text
+            content_hash = DocumentStore.content_hash(text)
+            for i, piece in enumerate(pieces):
+                chunk_texts.append(piece)
+                chunk_metadata.append(dict(
+                    meta, text=piece, doc_key=parent_key, content_hash=content_hash,
+                    parent_key=parent_key, chunk_index=i, chunk_count=len(pieces)
+                ))
+
+        if parents:
+            print(f"긴 문서 {len(parents)}건을 청크로 분할 (총 {len(chunk_texts)}개 청크)")
+        return chunk_texts, chunk_metadata, parents
+
+    def add_documents(self, texts: List[str], metadata: List[Dict[str, Any]] = None,
+                      upsert: bool = True) -> List[int]:
+        """
+        문서 추가 (중복 제거 및 upsert)
+
+        Args:
+            texts: 문서 텍스트 리스트
+            metadata: 문서별 메타데이터 ('category', 'url', 'doc_key' 등)
+            upsert: True면 키가 같고 내용이 바뀐 기존 문서를 새 문서로 교체
+
+        Returns:
+            새로 추가된 문서 ID 리스트 (청크로 분할된 문서는 청크 ID)
+        """
         if metadata is None:
             metadata = [{"text": text} for text in texts]
 
-        # 임베딩 생성
+        for i, meta in enumerate(metadata):
+            meta['text'] = texts[i]
+        texts, metadata, replaced_ids = self._deduplicate(texts, metadata, upsert)
+        if not texts:
+            print("추가할 새 문서가 없습니다")
+            return []
+        num_documents = len(texts)
+        texts, metadata, parents = self._chunk_documents(texts, metadata)
+
+        # 임베딩 생성 (원본 벡터는 문서 저장소에 보관, 잠금 밖에서 수행)
         embeddings = self.embedder.embed_texts(texts)
 
-        # FAISS 인덱스에 추가
-        self.index.add(embeddings.astype('float32'))
+        # 문서 저장소와 인덱스를 함께 갱신 (검색은 갱신 전/후 상태만 보게 됨)
+        with self._lock.write_locked():
+            doc_ids = self._insert(metadata, embeddings, parents, replaced_ids)
+            should_compact = self._pending_documents >= self.compact_threshold
 
-        # 메타데이터 저장
-        for i, meta in enumerate(metadata):
-            doc_id = len(self.documents)
-            meta['id'] = doc_id
-            meta['text'] = texts[i]
-            self.documents.append(meta)
+        print(f"{num_documents}개 문서 추가 완료 (총 {self.doc_store.count()}개)")
+        self.rebuild_async()
 
-            # 카테고리 인덱싱
-            category = meta.get('category', 'general')
-            if category not in self.categories:
-                self.categories[category] = []
-            self.categories[category].append(doc_id)
+        # 문서는 이미 저장소에 커밋됨 → 인덱스 스냅샷은 일정량마다 백그라운드에서 갱신
+        if should_compact:
+            self.compact_async()
+
+        return doc_ids
+
+    def _insert(self, metadata: List[Dict[str, Any]], embeddings: np.ndarray,
+                parents: Dict[Tuple[str, str], str], replaced_ids: List[int]) -> List[int]:
+        """임베딩된 문서를 문서 저장소와 카테고리 인덱스에 함께 추가"""
+        with self._lock.write_locked():
+            # 교체 대상 삭제 후 메타데이터 저장
+            if replaced_ids:
+                self.delete(replaced_ids)
+            vectors = self._prepare_vectors(embeddings)
+            doc_ids = self.doc_store.add(metadata, vectors, parents=parents)
 
-        print(f"{len(texts)}개 문서 추가 완료 (총 {len(self.documents)}개)")
+            new_ids_by_category: Dict[str, List[int]] = {}
+            rows_by_category: Dict[str, List[int]] = {}
+            for i, (meta, doc_id) in enumerate(zip(metadata, doc_ids)):
+                meta['id'] = doc_id
+
+                # 카테고리 인덱싱
+                category = meta.get('category', 'general')
+                new_ids_by_category.setdefault(category, []).append(doc_id)
+                rows_by_category.setdefault(category, []).append(i)
+
+            # 카테고리별 FAISS 인덱스에 추가
+            for category, category_ids in new_ids_by_category.items():
+                if category not in self.category_indexes:
+                    self._set_index(category, self._new_category_index())
+                self._writable_index(category).add_with_ids(
+                    vectors[rows_by_category[category]],
+                    np.asarray(category_ids, dtype='int64')
+                )
+                self._dirty_categories.add(category)
+
+                # 벡터 수가 학습 기준을 넘으면 근사 인덱스로 전환 (재구축 전까지는 기존 인덱스로 검색)
+                if not self._index_matches_config(self.category_indexes[category]):
+                    self._stale_categories.add(category)
+
+            self._pending_documents += len(doc_ids)
+            return doc_ids
+
+    def delete(self, ids: List[int]) -> int:
+        """
+        문서 삭제
+
+        Args:
+            ids: 삭제할 문서 ID 리스트
+
+        Returns:
+            삭제된 문서 수
+        """
+        with self._lock.write_locked():
+            deleted = self.doc_store.delete(ids)
+
+            for category, doc_ids in deleted.items():
+                if category in self.category_indexes:
+                    self._remove_from_index(category, doc_ids)
+
+            count = sum(len(doc_ids) for doc_ids in deleted.values())
+            self._pending_documents += count
+
+        self.rebuild_async()
+        if count:
+            print(f"{count}개 문서 삭제 완료 (총 {self.doc_store.count()}개)")
+        return count
+
+    def delete_company_info(self, company_name: str) -> int:
+        """특정 회사의 수집 정보 전체 삭제"""
+        return self.delete(self.doc_store.ids_by_field('company_info', 'company_name', company_name))
+
+    def replace_company_info(self, company_name: str, search_results: List[Dict[str, Any]]):
+        """회사 정보 새로고침 (기존 문서 전체 삭제 후 새 검색 결과로 교체)"""
+        removed = self.delete_company_info(company_name)
+        if removed:
+            print(f"'{company_name}' 기존 회사 정보 {removed}건을 삭제했습니다.")
+        self.add_company_info(company_name, search_results)
 
     def add_company_info(self, company_name: str, search_results: List[Dict[str, Any]]):
         """회사 정보를 벡터 스토어에 추가"""
@@ -105,90 +729,919 @@ class FAISSVectorStore:
                 # 발행일이 있으면 추가
                 if 'published_date' in result:
                     meta['published_date'] = result['published_date']
+
+                # 같은 회사의 같은 URL은 한 번만 저장 (키워드가 달라도 동일 문서)
+                if meta['url']:
+                    meta['doc_key'] = f"{company_name}:{meta['url']}"
                     
                 metadata.append(meta)
         
         if texts:
-            self.add_documents(texts, metadata)
-            print(f"'{company_name}' 회사 정보 {len(texts)}건을 벡터 스토어에 추가했습니다.")
+            added = self.add_documents(texts, metadata)
+            added_docs = {doc.get('parent_key', doc['id']) for doc in self.doc_store.get_many(added).values()}
+            print(f"'{company_name}' 회사 정보 {len(added_docs)}건을 벡터 스토어에 추가했습니다. (수집 {len(texts)}건)")
         else:
             print(f"'{company_name}'에 대한 검색 결과가 없어 벡터 스토어에 추가하지 않았습니다.")
 
-    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """벡터 검색"""
-        if self.index.ntotal == 0:
-            return []
+    def _search_index(self, index: faiss.Index, query_embeddings: np.ndarray, top_k: int,
+                      selector: Optional[faiss.IDSelector] = None) -> List[List[Tuple[int, float]]]:
+        """단일 인덱스 배치 검색 → 쿼리별 (문서 ID, 점수) 리스트"""
+        k = min(top_k, index.ntotal)
+        if k == 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        # 압축 인덱스는 후보를 넉넉히 찾은 뒤 float32 원본 벡터로 재순위화
+        rerank = index_kind(index) in QUANTIZED_TYPES and self.index_config.rerank_factor > 1
+        fetch_k = min(k * self.index_config.rerank_factor, index.ntotal) if rerank else k
+
+        params = search_parameters(index, self.index_config, selector)
+        distances, ids = index.search(query_embeddings, fetch_k, params=params)
+        if rerank:
+            return self._rerank_exact(query_embeddings, ids, k)
+        return [
+            [
+                (int(doc_id), self.index_config.to_score(distance))
+                for doc_id, distance in zip(row_ids, row_distances)
+                if doc_id >= 0
+            ]
+            for row_ids, row_distances in zip(ids, distances)
+        ]
 
-        # 쿼리 임베딩
-        query_embedding = self.embedder.embed_text(query).astype('float32').reshape(1, -1)
+    def _rerank_exact(self, query_embeddings: np.ndarray, candidate_ids: np.ndarray,
+                      top_k: int) -> List[List[Tuple[int, float]]]:
+        """압축 인덱스 후보 (Q, fetch_k)를 문서 저장소의 float32 벡터로 정확히 다시 점수화"""
+        unique_ids = np.unique(candidate_ids[candidate_ids >= 0])
+        if unique_ids.size == 0:
+            return [[] for _ in range(len(query_embeddings))]
 
-        # 검색
-        distances, indices = self.index.search(query_embedding, top_k)
+        vectors = self.doc_store.get_vectors(unique_ids.tolist())
+        rows = np.searchsorted(unique_ids, candidate_ids)
 
-        # 결과 포맷팅
         results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx].copy()
-                doc['score'] = float(1 / (1 + distances[0][i]))  # 거리를 점수로 변환
+        for query, row_ids, row_positions in zip(query_embeddings, candidate_ids, rows):
+            valid = row_ids >= 0
+            row_ids, candidates = row_ids[valid], vectors[row_positions[valid]]
+            distances = self._exact_distances(candidates, query)
+            order = np.argsort(-distances if self.index_config.metric == 'cosine' else distances)[:top_k]
+            results.append([(int(row_ids[i]), self.index_config.to_score(distances[i])) for i in order])
+        return results
+
+    def _exact_distances(self, vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """저장된 float32 벡터 (N, d)와 쿼리의 인덱스 척도 거리 (cosine은 내적, L2는 제곱 거리)"""
+        if self.index_config.metric == 'cosine':
+            return vectors @ query
+        return ((vectors - query) ** 2).sum(axis=1)
+
+    def _dense_scores(self, query_embedding: np.ndarray, ids: List[int]) -> Dict[int, float]:
+        """벡터 검색 후보에 없던 문서의 벡터 점수 (문서 저장소의 원본 벡터로 계산)"""
+        if not ids:
+            return {}
+        distances = self._exact_distances(self.doc_store.get_vectors(ids), query_embedding)
+        return {int(doc_id): self.index_config.to_score(distance) for doc_id, distance in zip(ids, distances)}
+
+    def _search_embeddings(self, query_embeddings: np.ndarray, category: Optional[str], top_k: int,
+                           allowed_ids: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """
+        쿼리 임베딩 (Q, d) 검색 (카테고리 미지정 시 카테고리별 결과 병합)
+
+        allowed_ids가 주어지면 FAISS 검색 중에 ID selector로 해당 문서만 거리 계산합니다.
+        """
+        if allowed_ids is not None:
+            if allowed_ids.size == 0:
+                return [[] for _ in range(len(query_embeddings))]
+            top_k = min(top_k, int(allowed_ids.size))
+
+        if category is not None:
+            index = self.category_indexes.get(category)
+            if index is None:
+                return [[] for _ in range(len(query_embeddings))]
+            return self._search_index(index, query_embeddings, top_k, self._selector(category, allowed_ids))
+
+        merged = [[] for _ in range(len(query_embeddings))]
+        for name, index in self.category_indexes.items():
+            selector = self._selector(name, allowed_ids)
+            for hits, category_hits in zip(merged, self._search_index(index, query_embeddings, top_k, selector)):
+                hits.extend(category_hits)
+
+        return [sorted(hits, key=lambda hit: hit[1], reverse=True)[:top_k] for hits in merged]
+
+    def _selector(self, category: str, allowed_ids: Optional[np.ndarray]) -> Optional[faiss.IDSelector]:
+        """검색 ID selector (메타데이터 필터로 허용된 ID에서 tombstone 제외)"""
+        selector = faiss.IDSelectorBatch(allowed_ids) if allowed_ids is not None else None
+        tombstones = self._tombstones.get(category)
+        if tombstones:
+            # IDSelectorNot/And는 하위 selector 참조를 유지함
+            deleted = faiss.IDSelectorBatch(np.fromiter(tombstones, dtype='int64', count=len(tombstones)))
+            excluded = faiss.IDSelectorNot(deleted)
+            selector = excluded if selector is None else faiss.IDSelectorAnd(selector, excluded)
+        return selector
+
+    def _format_results(self, hits: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+        """(문서 ID, 점수) 리스트를 결과 문서로 변환 (히트한 행만 조회)"""
+        docs = self.doc_store.get_many([doc_id for doc_id, _ in hits])
+        results = []
+        for doc_id, score in hits:
+            doc = docs.get(doc_id)
+            if doc is not None:
+                doc['score'] = score
                 results.append(doc)
+        return results
 
+    def _fetch_k(self, top_k: int) -> int:
+        """검색 후보 수 (청크 문서가 있으면 원본별 중복 제거를 위해 넉넉히)"""
+        return top_k * self.CHUNK_FETCH_FACTOR if self.doc_store.has_parents() else top_k
+
+    def _collect_results(self, hits: List[Tuple[int, float]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        검색 결과 정리 (원본 문서별 최고 점수 청크만 유지)
+
+        Args:
+            hits: 점수 내림차순 (문서 ID, 점수) 리스트
+            top_k: 반환할 결과 수
+        """
+        results, seen = [], set()
+        for doc in self._format_results(hits):
+            if 'parent_key' in doc:
+                parent = (doc.get('category', 'general'), doc['parent_key'])
+                if parent in seen:
+                    continue
+                seen.add(parent)
+            results.append(doc)
+            if len(results) == top_k:
+                break
         return results
 
-    def search_by_category(self, query: str, category: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """카테고리별 검색"""
-        if category not in self.categories:
+    def _expand_parents(self, results: List[Dict[str, Any]]):
+        """청크 결과의 'text'를 원본 전문으로 교체 (청크는 'chunk_text'에 보관)"""
+        parents = self.doc_store.get_parents([
+            (doc.get('category', 'general'), doc['parent_key']) for doc in results if 'parent_key' in doc
+        ])
+        for doc in results:
+            parent_text = parents.get((doc.get('category', 'general'), doc.get('parent_key')))
+            if parent_text is not None:
+                doc['chunk_text'] = doc['text']
+                doc['text'] = parent_text
+
+    def _refine_results(self, query_embedding: np.ndarray, docs: List[Dict[str, Any]], top_k: int,
+                        min_score: Optional[float], mmr_lambda: Optional[float],
+                        expand_parent: bool) -> List[Dict[str, Any]]:
+        """점수 임계값 필터 → MMR 다양화 → 원본 확장"""
+        if min_score is not None:
+            docs = [doc for doc in docs if doc['score'] >= min_score]
+
+        if mmr_lambda is not None and len(docs) > 1:
+            # 후보의 원본 벡터는 문서 저장소에서 조회 (근사 인덱스는 벡터 복원이 부정확)
+            vectors = self.doc_store.get_vectors([doc['id'] for doc in docs])
+            if not self._unit_vectors:
+                vectors, query_embedding = l2_normalize(vectors), l2_normalize(query_embedding)
+            docs = [docs[i] for i in maximal_marginal_relevance(query_embedding, vectors, top_k, mmr_lambda)]
+        else:
+            docs = docs[:top_k]
+
+        if expand_parent:
+            self._expand_parents(docs)
+        return docs
+
+    @staticmethod
+    def _candidate_k(top_k: int, mmr_lambda: Optional[float]) -> int:
+        """MMR 사용 시 다양화 대상 후보 수"""
+        return max(top_k * 4, 20) if mmr_lambda is not None else top_k
+
+    def _search_documents(self, query_embeddings: np.ndarray, category: Optional[str], top_k: int,
+                          expand_parent: bool, min_score: Optional[float] = None,
+                          mmr_lambda: Optional[float] = None,
+                          metadata_filter: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """쿼리 임베딩 검색 → 쿼리별 결과 문서 (한 원본의 청크가 후보를 채우면 후보를 늘려 재검색)"""
+        allowed_ids = self.doc_store.ids_matching(metadata_filter) if metadata_filter else None
+        candidate_k = self._candidate_k(top_k, mmr_lambda)
+        fetch_k = self._fetch_k(candidate_k)
+        while True:
+            batch_hits = self._search_embeddings(query_embeddings, category, fetch_k, allowed_ids)
+            candidates = [self._collect_results(hits, candidate_k) for hits in batch_hits]
+            if fetch_k == candidate_k or all(
+                len(docs) == candidate_k or len(hits) < fetch_k for docs, hits in zip(candidates, batch_hits)
+            ):
+                break
+            fetch_k *= 2
+
+        return [
+            self._refine_results(query_embedding, docs, top_k, min_score, mmr_lambda, expand_parent)
+            for query_embedding, docs in zip(query_embeddings, candidates)
+        ]
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """검색 쿼리 임베딩 (1, d)"""
+        return self.embedder.embed_text(query, normalize=self._unit_vectors).reshape(1, -1)
+
+    def search(self, query: str, top_k: int = 5, expand_parent: bool = False,
+               min_score: Optional[float] = None, mmr_lambda: Optional[float] = None,
+               metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        벡터 검색 (카테고리별 인덱스 결과 병합)
+
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 최대 결과 수
+            expand_parent: True면 청크 대신 원본 전문 반환
+            min_score: 이 점수 미만의 결과 제외 (None이면 미적용)
+            mmr_lambda: 지정 시 MMR로 유사 문서 중복을 줄임 (1이면 유사도 순, 0이면 다양성 우선)
+            metadata_filter: 메타데이터 필터 (예: {'company_name': '토스',
+                'published_date': {'$gte': '2024-01-01'}}, 문법은 filters.compile_filter 참고)
+        """
+        if self.ntotal == 0:
             return []
 
-        # 해당 카테고리의 문서만 검색
-        category_doc_ids = self.categories[category]
-        if not category_doc_ids:
+        query_embedding = self._embed_query(query)
+        with self._lock.read_locked():
+            return self._search_documents(
+                query_embedding, None, top_k, expand_parent, min_score, mmr_lambda, metadata_filter
+            )[0]
+
+    def search_by_category(self, query: str, category: str, top_k: int = 5, expand_parent: bool = False,
+                           min_score: Optional[float] = None, mmr_lambda: Optional[float] = None,
+                           metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """카테고리별 검색 (해당 카테고리 인덱스만 탐색, 인자는 search와 동일)"""
+        index = self.category_indexes.get(category)
+        if index is None or index.ntotal == 0:
             return []
 
-        # 전체 검색 후 필터링 (충분히 많이 검색)
-        search_k = max(len(self.documents), top_k * 5)
-        all_results = self.search(query, top_k=search_k)
-        filtered_results = [
-            r for r in all_results
-            if r['id'] in category_doc_ids
-        ][:top_k]
+        query_embedding = self._embed_query(query)
+        with self._lock.read_locked():
+            return self._search_documents(
+                query_embedding, category, top_k, expand_parent, min_score, mmr_lambda, metadata_filter
+            )[0]
 
-        return filtered_results
+    def search_many(self, queries: List[str], category: Optional[str] = None,
+                    top_k: int = 5, expand_parent: bool = False, min_score: Optional[float] = None,
+                    mmr_lambda: Optional[float] = None,
+                    metadata_filter: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리 일괄 검색 (캐시 미스 임베딩 1회 배치 + 인덱스 검색 1회)
 
-    def save(self):
-        """인덱스 저장"""
-        index_path = self.store_path / "faiss.index"
-        metadata_path = self.store_path / "metadata.pkl"
+        Args:
+            queries: 검색 쿼리 리스트
+            category: 검색할 카테고리 (None이면 전체)
+            top_k: 쿼리별 반환 결과 수
+            expand_parent: True면 청크 대신 원본 전문 반환
+            min_score: 이 점수 미만의 결과 제외
+            mmr_lambda: 지정 시 쿼리별 결과를 MMR로 다양화
+            metadata_filter: 메타데이터 필터 (모든 쿼리에 공통 적용)
+
+        Returns:
+            쿼리 순서대로의 검색 결과 리스트
+        """
+        if not queries or self.ntotal == 0:
+            return [[] for _ in queries]
+
+        query_embeddings = self.embedder.embed_queries(queries, normalize=self._unit_vectors)
+        with self._lock.read_locked():
+            return self._search_documents(
+                query_embeddings, category, top_k, expand_parent, min_score, mmr_lambda, metadata_filter
+            )
+
+    def hybrid_search(self, query: str, category: Optional[str] = None, top_k: int = 5,
+                      fetch_k: Optional[int] = None, rrf_k: int = 60, expand_parent: bool = False,
+                      mmr_lambda: Optional[float] = None,
+                      metadata_filter: Optional[Dict[str, Any]] = None,
+                      min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        하이브리드 검색 (BM25 + 벡터 검색, Reciprocal Rank Fusion)
+
+        기술명/회사명처럼 정확한 표기가 중요한 쿼리에서 벡터 검색의 재현율을 보완합니다.
+
+        Args:
+            query: 검색 쿼리
+            category: 검색할 카테고리 (None이면 전체)
+            top_k: 반환할 결과 수
+            fetch_k: 각 검색기에서 가져올 후보 수 (기본값: max(top_k * 4, 20))
+            rrf_k: RRF 순위 완화 상수
+            expand_parent: True면 청크 대신 원본 전문 반환
+            mmr_lambda: 지정 시 결합 순위 후보를 MMR로 다양화
+            metadata_filter: 메타데이터 필터 (벡터/BM25 검색 모두에 적용)
+            min_score: 벡터 점수가 이 값 미만인 후보 제외 (BM25로만 찾은 후보는 저장된 벡터로
+                점수 계산, None이면 미적용)
+
+        Returns:
+            결합 점수('score')와 개별 점수('dense_score', 'lexical_score')가 포함된 문서 리스트
+        """
+        if self.ntotal == 0:
+            return []
+
+        fetch_k = fetch_k or max(top_k * 4, 20)
+        query_embedding = self._embed_query(query)
+
+        with self._lock.read_locked():
+            allowed_ids = self.doc_store.ids_matching(metadata_filter) if metadata_filter else None
+            dense_hits = self._search_embeddings(query_embedding, category, fetch_k, allowed_ids)[0]
+            lexical_hits = self.lexical.search(query, category, fetch_k, metadata_filter)
+            fused = reciprocal_rank_fusion(
+                [[doc_id for doc_id, _ in dense_hits], [doc_id for doc_id, _ in lexical_hits]], k=rrf_k
+            )
+            if min_score is not None:
+                # 결합 점수(RRF)는 순위 기반이라 임계값은 후보의 벡터 점수에 적용
+                similarities = dict(dense_hits)
+                similarities.update(self._dense_scores(
+                    query_embedding[0], [doc_id for doc_id, _ in fused if doc_id not in similarities]
+                ))
+                fused = [(doc_id, score) for doc_id, score in fused if similarities[doc_id] >= min_score]
+            candidates = self._collect_results(fused, self._candidate_k(top_k, mmr_lambda))
+            results = self._refine_results(query_embedding[0], candidates, top_k, None, mmr_lambda, expand_parent)
+
+        dense_scores, lexical_scores = dict(dense_hits), dict(lexical_hits)
+        for doc in results:
+            doc['dense_score'] = dense_scores.get(doc['id'])
+            doc['lexical_score'] = lexical_scores.get(doc['id'])
+        return results
+
+    def evaluate_recall(self, category: Optional[str] = None, num_queries: int = 100,
+                        top_k: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        인덱스 재현율 측정 (정확한 float32 Flat 검색 대비)
+
+        저장된 문서 벡터 일부를 쿼리로 사용해 현재 인덱스의 recall@k를
+        재순위화 전/후로 측정하고, 인덱스 크기를 float32 Flat과 비교합니다.
+
+        Args:
+            category: 측정할 카테고리 (None이면 전체)
+            num_queries: 카테고리별 샘플 쿼리 수
+            top_k: recall@k의 k
+
+        Returns:
+            카테고리별 {'index_type', 'recall', 'reranked_recall', 'recall_delta',
+            'index_bytes', 'flat_bytes'} ('recall_delta'는 정확 검색 대비 재순위화 후 차이)
+        """
+        report = {}
+        with self._lock.read_locked():
+            for name in ([category] if category else list(self.category_indexes)):
+                index = self.category_indexes.get(name)
+                if index is None or index.ntotal == 0:
+                    continue
+
+                ids, vectors = self.doc_store.category_vectors(name)
+                sample = np.random.default_rng(0).choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+                queries, k = vectors[sample], min(top_k, len(ids))
+
+                exact = faiss.IndexFlat(self.embedding_dim, self.index_config.faiss_metric)
+                exact.add(vectors)
+                truth = [set(ids[row].tolist()) for row in exact.search(queries, k)[1]]
+
+                _, approx_ids = index.search(queries, k, params=search_parameters(index, self.index_config))
+                reranked = [[doc_id for doc_id, _ in hits] for hits in self._search_index(index, queries, k)]
+
+                def recall(rows) -> float:
+                    return float(np.mean([len(expected & set(row)) / k for expected, row in zip(truth, rows)]))
+
+                reranked_recall = recall(reranked)
+                report[name] = {
+                    'index_type': index_kind(index),
+                    'recall': recall([row.tolist() for row in approx_ids]),
+                    'reranked_recall': reranked_recall,
+                    'recall_delta': reranked_recall - 1.0,
+                    'index_bytes': int(faiss.serialize_index(index).size),
+                    'flat_bytes': int(vectors.nbytes)
+                }
+
+        for name, result in report.items():
+            print(
+                f"{name} ({result['index_type']}): recall@{top_k} {result['recall']:.3f} → "
+                f"재순위화 {result['reranked_recall']:.3f} (Δ {result['recall_delta']:+.3f}), "
+                f"인덱스 {result['index_bytes'] / 1024:.0f}KB / float32 {result['flat_bytes'] / 1024:.0f}KB"
+            )
+        return report
+
+    def compact(self) -> List[str]:
+        """
+        변경된 카테고리 인덱스 스냅샷을 디스크에 기록
+
+        Returns:
+            기록된 카테고리 리스트
+        """
+        with self._compact_mutex:
+            # 직렬화는 읽기 잠금으로 검색과 병행하고, 파일 쓰기는 잠금 밖에서 수행
+            with self._lock.read_locked():
+                snapshots = {
+                    category: faiss.serialize_index(self.category_indexes[category])
+                    for category in self._dirty_categories
+                    if category in self.category_indexes
+                }
+                self._dirty_categories.clear()
+                self._pending_documents = 0
+
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                for category, data in snapshots.items():
+                    path = self.index_dir / f"{category}.index"
+                    write_atomic(path, data.tobytes())
+                    self._index_mtimes[category] = path.stat().st_mtime_ns
+            except Exception:
+                # 기록 실패 시 다음 compaction에서 다시 시도
+                with self._lock.write_locked():
+                    self._dirty_categories.update(snapshots)
+                raise
+
+            if self.mmap_indexes:
+                self._remap_snapshots(list(snapshots))
+            return list(snapshots)
+
+    def _remap_snapshots(self, categories: List[str]):
+        """방금 기록한 스냅샷을 mmap으로 다시 열어 메모리 사본을 해제"""
+        for category in categories:
+            path = self.index_dir / f"{category}.index"
+            index, mmapped = self._read_index(path)
+            if not mmapped:
+                continue
+            with self._lock.write_locked():
+                # 기록 이후 변경된 카테고리는 메모리 사본 유지 (다음 스냅샷에서 다시 시도)
+                if category not in self._dirty_categories and category in self.category_indexes:
+                    self._set_index(category, index, mmapped=True)
+
+    def reload_changed_indexes(self) -> List[str]:
+        """
+        다른 프로세스가 갱신한 인덱스 스냅샷 다시 로드
+
+        파일 수정 시각이 마지막으로 읽거나 쓴 시각과 다른 스냅샷만 읽고, 스냅샷 이후
+        문서 저장소에 추가된 문서는 재생합니다.
+
+        Returns:
+            다시 로드된 카테고리 리스트
+        """
+        if self._follow_current_generation():
+            return sorted(self.category_indexes)
+
+        if not self.index_dir.exists():
+            return []
+
+        reloaded = []
+        for path in sorted(self.index_dir.glob("*.index")):
+            category = path.stem
+            mtime = path.stat().st_mtime_ns
+            if self._index_mtimes.get(category) == mtime:
+                continue
+
+            # 파일 읽기는 잠금 밖에서, 교체와 재생만 쓰기 잠금 안에서 수행
+            index, mmapped = self._read_index(path)
+            with self._lock.write_locked():
+                if self._index_mtimes.get(category) == mtime:
+                    continue  # 그사이 이 프로세스가 같은 스냅샷을 기록함
+                self._set_index(category, index, mmapped)
+                self._index_mtimes[category] = mtime
+                self._tombstones.pop(category, None)
+                self._reconcile_category(category)
+                if self._indexed_count(category) != self.doc_store.category_counts().get(category, 0):
+                    self._stale_categories.add(category)
+            reloaded.append(category)
+
+        self.rebuild_async()
+
+        if reloaded:
+            print(f"변경된 인덱스 스냅샷 다시 로드: {', '.join(reloaded)}")
+        return reloaded
+
+    def start_reload_watcher(self, interval: float):
+        """interval초마다 스냅샷 변경을 확인하는 백그라운드 스레드 시작"""
+        if self._watcher_thread is not None and self._watcher_thread.is_alive():
+            return
+
+        def _watch():
+            while not self._watcher_stop.wait(interval):
+                try:
+                    self.reload_changed_indexes()
+                except Exception as e:
+                    print(f"인덱스 스냅샷 다시 로드 실패: {e}")
+
+        self._watcher_stop.clear()
+        self._watcher_thread = threading.Thread(target=_watch, name="vector-store-reload", daemon=True)
+        self._watcher_thread.start()
+
+    def stop_reload_watcher(self):
+        """스냅샷 변경 감지 스레드 중지"""
+        self._watcher_stop.set()
+        if self._watcher_thread is not None:
+            self._watcher_thread.join()
+            self._watcher_thread = None
+
+    def compact_async(self):
+        """백그라운드 스레드에서 compaction 실행 (이미 실행 중이면 무시)"""
+        if self._compact_thread is not None and self._compact_thread.is_alive():
+            return
+
+        def _run():
+            try:
+                written = self.compact()
+                if written:
+                    print(f"벡터 스토어 백그라운드 저장 완료: {', '.join(written)}")
+            except Exception as e:
+                print(f"벡터 스토어 백그라운드 저장 실패: {e}")
+
+        self._compact_thread = threading.Thread(target=_run, name="vector-store-compaction", daemon=True)
+        self._compact_thread.start()
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """현재 세대 매니페스트 (원본 파일 해시, 모델, 차원, 메트릭)"""
+        return read_manifest(self.data_path)
+
+    def _build_manifest(self, sources: Dict[str, str]) -> Dict[str, Any]:
+        """현재 상태로 세대 매니페스트 생성"""
+        return {
+            'generation': self.generation,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'model': self.embedder.model_name,
+            'revision': self.embedder.revision,
+            'dimension': self.embedding_dim,
+            'metric': self.index_config.metric,
+            'index_type': self.index_config.index_type,
+            'sources': sources,
+            'document_count': self.doc_store.count()
+        }
 
-        faiss.write_index(self.index, str(index_path))
+    def manifest_compatible(self) -> bool:
+        """현재 세대 벡터가 지금 모델/차원/메트릭과 호환되는지 여부 (매니페스트가 없으면 호환으로 간주)"""
+        manifest = self.manifest
+        if not manifest:
+            return True
+        return (
+            manifest.get('model') == self.embedder.model_name
+            and manifest.get('dimension') == self.embedding_dim
+            and manifest.get('metric') == self.index_config.metric
+        )
 
-        with open(metadata_path, 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'categories': self.categories
-            }, f)
+    def manifest_matches(self, sources: Dict[str, str]) -> bool:
+        """현재 세대가 같은 원본 파일/모델/차원/메트릭으로 만들어졌는지 여부"""
+        manifest = self.manifest
+        return bool(manifest) and manifest.get('sources') == sources and self.manifest_compatible()
 
-        print(f"벡터 스토어 저장 완료: {index_path}")
+    def add_stream(self, documents: Iterable[Dict[str, Any]], batch_size: Optional[int] = None,
+                   queue_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        문서 스트림 수집 (전체를 메모리에 올리지 않고 배치 단위로 임베딩/색인)
+
+        배치가 EMBEDDING_POOL_MIN_BATCH 이상이면 임베더의 다중 프로세스 풀에서 인코딩됩니다.
+
+        Args:
+            documents: 'text'를 포함한 문서 메타데이터 이터러블 (제너레이터 가능)
+            batch_size: 배치당 문서 수 (기본값: INGEST_BATCH_SIZE)
+            queue_size: 파싱이 앞서 나갈 수 있는 최대 배치 수 (기본값: INGEST_QUEUE_SIZE)
+
+        Returns:
+            수집 통계 (ingest.ingest_stream 참고)
+        """
+        if batch_size is None:
+            batch_size = int(os.getenv('INGEST_BATCH_SIZE', '256'))
+        if queue_size is None:
+            queue_size = int(os.getenv('INGEST_QUEUE_SIZE', '4'))
+
+        def _add_batch(batch: List[Dict[str, Any]]) -> int:
+            return len(self.add_documents([doc['text'] for doc in batch], batch))
+
+        return ingest_stream(documents, _add_batch, batch_size=batch_size, queue_size=queue_size)
+
+    def sync_documents(self, documents: Iterable[Dict[str, Any]], synced_sources: List[str],
+                       sources: Dict[str, str]) -> Tuple[int, int]:
+        """
+        원본 파일 단위 증분 동기화 (현재 세대에서 바로 갱신)
+
+        synced_sources 파일의 문서를 주어진 섹션으로 맞춥니다. doc_key가 같고 본문 해시도
+        같은 섹션은 임베딩을 건너뛰고, 바뀐 섹션은 교체하며, 더 이상 없는 섹션은 삭제합니다.
+
+        Args:
+            documents: 변경된 원본 파일의 섹션 ('text', 'category', 'source', 'doc_key' 포함, 스트림 가능)
+            synced_sources: 동기화할 원본 파일 (변경/삭제된 파일, 섹션의 'source' 값)
+            sources: 전체 원본 파일명 → 내용 해시 (매니페스트에 기록)
+
+        Returns:
+            (추가/교체된 문서 수, 삭제된 문서 수)
+        """
+        wanted = set()
+
+        def _track(stream: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for doc in stream:
+                wanted.add((doc.get('category', 'general'), DocumentStore.document_key(doc)))
+                yield doc
+
+        added = self.add_stream(_track(documents))['added']
+
+        stale = []
+        if synced_sources:
+            existing = self.doc_store.ids_matching({'source': {'$in': list(synced_sources)}}).tolist()
+            for start in range(0, len(existing), SQLITE_BATCH):
+                docs = self.doc_store.get_many(existing[start:start + SQLITE_BATCH])
+                stale.extend(
+                    doc_id for doc_id, doc in docs.items()
+                    if (doc.get('category', 'general'), DocumentStore.document_key(doc)) not in wanted
+                )
+        removed = self.delete(stale) if stale else 0
+
+        self.save()
+        write_manifest(self.data_path, self._build_manifest(sources))
+        return added, removed
+
+    def rebuild_generation(self, documents: Iterable[Dict[str, Any]], sources: Dict[str, str],
+                           background: bool = False) -> Optional[threading.Thread]:
+        """
+        새 세대로 재구축 후 원자적으로 전환
+
+        지식 파일에서 온 문서(현재 매니페스트나 sources에 있는 'source')는 새 문서로 교체하고,
+        그 외 문서(업로드된 회사 정보 등)는 현재 세대에서 재임베딩 없이 복사합니다. 삭제된 지식
+        파일의 문서는 새 세대에 남지 않습니다. 빌드 중에는 현재 세대로 계속 검색하며,
+        전환 직전 빌드 중 추가/삭제된 문서를 반영한 뒤 ``CURRENT`` 포인터를 바꿉니다.
+
+        Args:
+            documents: 새 세대에 넣을 문서 ('text', 'category', 'source' 포함, 스트림 가능)
+            sources: 원본 파일명 → 내용 해시 (매니페스트에 기록)
+            background: True면 백그라운드 스레드에서 실행하고 스레드 반환
+
+        Returns:
+            background=True면 빌드 스레드, 아니면 None
+        """
+        def _build():
+            generation = new_generation_id()
+            print(f"새 세대 빌드 시작: {generation}")
+            # 이전/새 지식 파일의 문서는 복사하지 않음 (삭제된 파일이나 카테고리가 바뀐 섹션 포함)
+            replaced_sources = sorted(set(self.manifest.get('sources', {})) | set(sources))
+
+            try:
+                # 복사하는 벡터와 같은 모델로 빌드 (모델 변경은 reembed_generation에서 처리)
+                builder = FAISSVectorStore(
+                    self.store_path, index_config=self.index_config, compact_threshold=self.compact_threshold,
+                    mmap_indexes=self.mmap_indexes, reload_interval=0, generation=generation,
+                    embedder=self.embedder
+                )
+                builder.add_stream(documents)
+                carried = self._carry_over(builder, replaced_sources, {})
+                builder.save()
+            except Exception:
+                # 실패한 세대는 남기지 않음 (CURRENT는 그대로)
+                shutil.rmtree(generation_path(self.store_path, generation), ignore_errors=True)
+                raise
+
+            with self._compact_mutex, self._lock.write_locked():
+                self._carry_over(builder, replaced_sources, carried)
+                write_manifest(builder.data_path, builder._build_manifest(sources))
+                set_current_generation(self.store_path, generation)
+                self._adopt(builder)
+            self.rebuild_async()
+
+            removed = cleanup_generations(self.store_path, keep=int(os.getenv('VECTOR_KEEP_GENERATIONS', '2')))
+            print(f"세대 전환 완료: {generation} ({self.doc_store.count()}개 문서, 이전 세대 {len(removed)}개 정리)")
+
+        def _run():
+            # 다른 프로세스의 빌드/전환/정리와 겹치지 않도록 정리까지 스토어 잠금 유지
+            with store_lock(self.store_path):
+                self._follow_current_generation()
+                _build()
+
+        if not background:
+            _run()
+            return None
+
+        def _run_logged():
+            try:
+                _run()
+            except Exception as e:
+                print(f"새 세대 빌드 실패 (현재 세대 유지): {e}")
+
+        thread = threading.Thread(target=_run_logged, name="vector-store-rebuild", daemon=True)
+        thread.start()
+        return thread
+
+    def _carry_over(self, builder: "FAISSVectorStore", replaced_sources: List[str],
+                    carried: Dict[int, int]) -> Dict[int, int]:
+        """
+        지식 파일에서 오지 않은 문서를 새 세대로 복사 (이미 복사한 문서는 건너뜀)
+
+        Args:
+            builder: 새 세대 스토어
+            replaced_sources: 새 문서로 교체되는 지식 파일 ('source' 값)
+            carried: 현재 세대 문서 ID → 새 세대 문서 ID (이전 호출 결과)
+
+        Returns:
+            갱신된 ID 매핑 (현재 세대에서 삭제된 문서는 새 세대에서도 삭제)
+        """
+        live_ids = self.doc_store.ids_excluding('source', replaced_sources)
+        live_set = set(live_ids)
+
+        removed = [carried.pop(doc_id) for doc_id in list(carried) if doc_id not in live_set]
+        if removed:
+            builder.delete(removed)
+
+        new_ids = [doc_id for doc_id in live_ids if doc_id not in carried]
+        for start in range(0, len(new_ids), SQLITE_BATCH):
+            batch = new_ids[start:start + SQLITE_BATCH]
+            documents, vectors, parents = self.doc_store.export(batch)
+            carried.update(zip(batch, builder._insert(documents, vectors, parents, [])))
+        return carried
+
+    def reembed_generation(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        설정된 임베딩 모델로 전체 문서를 재임베딩한 새 세대를 만든 뒤 원자적으로 전환
+
+        문서 저장소의 원본(청크는 원본 전문)을 새 모델로 다시 청크 분할/임베딩합니다.
+        빌드 중에는 저장된 모델로 계속 검색하며, 빌드 중 추가/교체/삭제된 문서는 전환 직전에
+        반영합니다. 재임베딩이 필요 없으면 아무것도 하지 않습니다.
+
+        Args:
+            background: True면 백그라운드 스레드에서 실행하고 스레드 반환
+
+        Returns:
+            background=True이고 재임베딩을 시작했으면 빌드 스레드, 아니면 None
+        """
+        if self._target_embedder is None:
+            return None
+
+        def _reembed(target: KoreanEmbedder):
+            source_generation = self.generation
+            generation = new_generation_id()
+            target_spec = embedding_spec(target, self.index_config.metric == 'cosine')
+            print(f"재임베딩 시작: {describe_spec(self.embedding_spec)} → {describe_spec(target_spec)} "
+                  f"(세대: {generation})")
+
+            try:
+                synced_id = int(self.doc_store.get_meta('next_id', '0'))
+                builder = FAISSVectorStore(
+                    self.store_path, index_config=self.index_config, compact_threshold=self.compact_threshold,
+                    mmap_indexes=self.mmap_indexes, reload_interval=0, generation=generation, embedder=target
+                )
+                builder.add_stream(self._iter_source_documents(self.doc_store.ids_since(0)))
+                # 빌드 중 변경분은 잠금 밖에서 먼저 반영해 전환 시 쓰기 잠금 구간을 줄임
+                synced_id = self._sync_reembedded(builder, synced_id)
+                builder.save()
+            except Exception:
+                shutil.rmtree(generation_path(self.store_path, generation), ignore_errors=True)
+                raise
+
+            with self._compact_mutex, self._lock.write_locked():
+                if self.generation != source_generation:
+                    # 빌드 중 다른 세대로 전환됨 → 문서 ID 기준이 달라 반영할 수 없음
+                    builder.doc_store.close()
+                    builder._lease.close()
+                    shutil.rmtree(generation_path(self.store_path, generation), ignore_errors=True)
+                    raise RuntimeError(f"재임베딩 중 세대가 바뀌었습니다: {source_generation} → {self.generation}")
+                self._sync_reembedded(builder, synced_id)
+                write_manifest(builder.data_path, builder._build_manifest(self.manifest.get('sources', {})))
+                set_current_generation(self.store_path, generation)
+                self._adopt(builder)
+                self._target_embedder = None
+            self.rebuild_async()
+
+            removed = cleanup_generations(self.store_path, keep=int(os.getenv('VECTOR_KEEP_GENERATIONS', '2')))
+            print(f"재임베딩 완료: {generation} ({self.doc_store.count()}개 문서, 이전 세대 {len(removed)}개 정리)")
+
+        def _run():
+            # 여러 프로세스가 동시에 시작해도 재임베딩은 한 번만 (나머지는 잠금 대기 후 결과 세대로 전환)
+            with store_lock(self.store_path):
+                self._follow_current_generation()
+                if self._target_embedder is None:
+                    print(f"다른 프로세스가 재임베딩한 세대로 전환했습니다: {self.generation}")
+                    return
+                _reembed(self._target_embedder)
+
+        if not background:
+            _run()
+            return None
+
+        def _run_logged():
+            try:
+                _run()
+            except Exception as e:
+                print(f"재임베딩 실패 (저장된 모델로 계속 검색): {e}")
+
+        thread = threading.Thread(target=_run_logged, name="vector-store-reembed", daemon=True)
+        thread.start()
+        return thread
+
+    def _iter_source_documents(self, ids: List[int]) -> Iterator[Dict[str, Any]]:
+        """문서 ID 순으로 원본 문서 생성 (청크는 원본 전문 하나로 복원, 재임베딩용)"""
+        seen_parents = set()
+        for start in range(0, len(ids), SQLITE_BATCH):
+            batch = ids[start:start + SQLITE_BATCH]
+            docs = self.doc_store.get_many(batch)
+            parents = self.doc_store.get_parents(list({
+                (doc.get('category', 'general'), doc['parent_key']) for doc in docs.values() if 'parent_key' in doc
+            } - seen_parents))
+
+            for doc_id in batch:
+                doc = docs.get(int(doc_id))
+                if doc is None:
+                    continue  # 읽는 사이 삭제됨
+                doc.pop('id')
+                if 'parent_key' in doc:
+                    key = (doc.get('category', 'general'), doc['parent_key'])
+                    if key in seen_parents or key not in parents:
+                        continue
+                    seen_parents.add(key)
+                    doc = {k: v for k, v in doc.items() if k not in ('parent_key', 'chunk_index', 'chunk_count')}
+                    doc['text'] = parents[key]
+                yield doc
+
+    def _sync_reembedded(self, builder: "FAISSVectorStore", after_id: int) -> int:
+        """
+        재임베딩 중 현재 세대에서 바뀐 문서를 새 세대에 반영
+
+        after_id 이후 추가/교체된 문서는 새 모델로 임베딩해 upsert하고, 현재 세대에 더 이상
+        없는 (카테고리, doc_key)의 문서는 새 세대에서도 삭제합니다.
+
+        Returns:
+            다음 호출의 기준 ID
+        """
+        next_id = int(self.doc_store.get_meta('next_id', '0'))
+        new_ids = self.doc_store.ids_since(after_id)
+        if new_ids:
+            builder.add_stream(self._iter_source_documents(new_ids))
+
+        live_keys = self.doc_store.key_ids()
+        stale = [
+            doc_id for key, doc_ids in builder.doc_store.key_ids().items() if key not in live_keys
+            for doc_id in doc_ids
+        ]
+        if stale:
+            builder.delete(stale)
+        return next_id
+
+    def _adopt(self, other: "FAISSVectorStore"):
+        """다른 인스턴스(새 세대)의 문서 저장소와 인덱스로 교체 (쓰기 잠금 안에서 호출)"""
+        previous_doc_store, previous_lease = self.doc_store, self._lease
+        for attr in ('generation', 'data_path', '_lease', 'index_dir', 'doc_store', 'lexical', 'category_indexes',
+                     '_mmapped_categories', '_index_mtimes', '_dirty_categories', '_pending_documents',
+                     '_tombstones', '_stale_categories', '_unit_vectors', 'embedder', 'embedding_dim', 'chunker'):
+            setattr(self, attr, getattr(other, attr))
+        previous_doc_store.close()
+        previous_lease.close()  # 이전 세대는 이제 정리 대상
+
+    def _follow_current_generation(self) -> bool:
+        """
+        CURRENT 포인터가 다른 세대를 가리키면 그 세대로 전환
+
+        Returns:
+            전환했으면 True
+        """
+        generation = current_generation(self.store_path)
+        if generation is None or generation == self.generation:
+            return False
+        # 다른 프로세스가 새 세대로 전환함 → 세대 전체 교체
+        self._switch_generation(generation)
+        return True
+
+    def _switch_generation(self, generation: str):
+        """다른 프로세스가 만든 세대로 전환 (로드는 잠금 밖에서 수행)"""
+        loaded = FAISSVectorStore(
+            self.store_path, index_config=self.index_config, compact_threshold=self.compact_threshold,
+            mmap_indexes=self.mmap_indexes, reload_interval=0, generation=generation
+        )
+        with self._compact_mutex, self._lock.write_locked():
+            self._adopt(loaded)
+            self._target_embedder = loaded._target_embedder
+        self.rebuild_async()
+        print(f"세대 전환 감지: {generation}")
+
+    def save(self):
+        """인덱스 저장 (문서 메타데이터는 추가 시점에 이미 저장됨, 변경된 인덱스만 기록)"""
+        if self._compact_thread is not None:
+            self._compact_thread.join()
+        # 재구축 대기 중인 카테고리를 반영한 뒤 스냅샷 기록
+        self.rebuild_async()
+        rebuild_thread = self._rebuild_thread
+        if rebuild_thread is not None:
+            rebuild_thread.join()
+
+        self.compact()
+        self.doc_store.set_meta('metric', self.index_config.metric)
+
+        print(f"벡터 스토어 저장 완료: {self.index_dir}")
 
     def get_stats(self) -> Dict[str, Any]:
         """통계 반환"""
+        with self._lock.read_locked():
+            index_types = {cat: index_kind(index) for cat, index in self.category_indexes.items()}
+
         return {
-            'total_documents': len(self.documents),
-            'categories': {cat: len(docs) for cat, docs in self.categories.items()},
-            'embedding_dim': self.embedding_dim
+            'total_documents': self.doc_store.count(),
+            'categories': self.doc_store.category_counts(),
+            'embedding_dim': self.embedding_dim,
+            'embedding_model': self.embedding_spec,
+            'reembedding': self.needs_reembedding,
+            'generation': self.generation,
+            'metric': self.index_config.metric,
+            'embedding_cache': self.embedder.cache_info(),
+            'index_types': index_types
         }
 
 
 # 전역 벡터 스토어 인스턴스
 _vector_store_instance = None
+_vector_store_lock = threading.Lock()
 
 def get_vector_store(store_path: str = None) -> FAISSVectorStore:
     """전역 벡터 스토어 반환"""
     global _vector_store_instance
 
-    if _vector_store_instance is None:
-        if store_path is None:
-            store_path = os.getenv('VECTOR_STORE_PATH', './vector_store')
-        _vector_store_instance = FAISSVectorStore(store_path=store_path)
+    # 여러 세션이 동시에 처음 호출해도 인스턴스는 하나만 생성
+    with _vector_store_lock:
+        if _vector_store_instance is None:
+            if store_path is None:
+                store_path = os.getenv('VECTOR_STORE_PATH', './vector_store')
+            _vector_store_instance = FAISSVectorStore(store_path=store_path)
+            # 저장된 벡터가 다른 모델로 만들어졌으면 백그라운드에서 재임베딩 후 전환
+            _vector_store_instance.reembed_generation(background=True)
 
     return _vector_store_instance
\ No newline at end of file
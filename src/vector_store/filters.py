@@ -0,0 +1,90 @@
+"""Metadata filter expressions for vector search"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Tuple
+
+# 연산자 → SQL 비교식
+_OPERATORS = {
+    '$eq': '=',
+    '$ne': '!=',
+    '$gt': '>',
+    '$gte': '>=',
+    '$lt': '<',
+    '$lte': '<=',
+}
+
+# 필터 색인에서 제외하는 필드 (본문/내부 키)
+UNFILTERED_FIELDS = {'text', 'title', 'doc_key', 'parent_key', 'content_hash'}
+
+
+def is_date_field(field: str) -> bool:
+    """날짜로 비교할 필드 여부 (published_date, date 등)"""
+    return field == 'date' or field.endswith('_date')
+
+
+def normalize_value(field: str, value: Any) -> Any:
+    """
+    필터 색인/조회용 값 정규화
+
+    날짜 필드는 ISO 8601(UTC) 문자열로 바꿔 범위 비교가 가능하게 합니다.
+    Tavily의 ``published_date``처럼 RFC 2822 형식("Wed, 15 May 2024 ...")도 처리합니다.
+    해석할 수 없는 값은 그대로 둡니다.
+    """
+    if not is_date_field(field) or not isinstance(value, str):
+        return value
+
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            parsed = None
+        if parsed is None:
+            return value
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def indexable_fields(doc: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """문서 메타데이터에서 필터 색인 대상 (필드, 값) 추출 (스칼라 값만)"""
+    fields = []
+    for field, value in doc.items():
+        if field in UNFILTERED_FIELDS or not isinstance(value, (str, int, float)):
+            continue
+        fields.append((field, normalize_value(field, value)))
+    return fields
+
+
+def compile_filter(metadata_filter: Dict[str, Any]) -> List[Tuple[str, str, List[Any]]]:
+    """
+    필터 표현식을 (필드, SQL 비교식, 값 리스트) 조건으로 변환
+
+    표현식 예시 (필드 간에는 AND)::
+
+        {'company_name': '토스'}                               # 일치
+        {'source': {'$in': ['tavily_search', 'upload']}}      # 포함
+        {'published_date': {'$gte': '2024-01-01', '$lt': '2025-01-01'}}  # 범위
+
+    Raises:
+        ValueError: 지원하지 않는 연산자이거나 값 형식이 잘못된 경우
+    """
+    conditions = []
+    for field, condition in metadata_filter.items():
+        if not isinstance(condition, dict):
+            condition = {'$eq': condition}
+
+        for operator, operand in condition.items():
+            if operator == '$in':
+                if not isinstance(operand, (list, tuple, set)):
+                    raise ValueError(f"'$in' 값은 리스트여야 합니다: {field}")
+                values = [normalize_value(field, value) for value in operand]
+                conditions.append((field, f"IN ({','.join('?' * len(values))})", values))
+            elif operator in _OPERATORS:
+                conditions.append((field, f"{_OPERATORS[operator]} ?", [normalize_value(field, operand)]))
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자: {operator}")
+    return conditions
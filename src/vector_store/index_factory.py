@@ -0,0 +1,219 @@
+"""FAISS 인덱스 팩토리 (Flat / IVF-Flat / IVF-PQ / HNSW / Scalar Quantizer)"""
+
+import os
+import math
+from typing import Optional, Tuple
+import numpy as np
+import faiss
+
+INDEX_TYPES = ('flat', 'ivf_flat', 'ivf_pq', 'hnsw', 'sq_fp16', 'sq_int8')
+
+# 벡터를 압축 저장해 거리가 근사값인 타입 (원본 float32 벡터로 재순위화)
+QUANTIZED_TYPES = ('ivf_pq', 'sq_fp16', 'sq_int8')
+
+# IDMap2.remove_ids 후에도 ID 매핑이 유지되는 타입 (코드를 배열로 저장해 삭제 시 앞으로 당김)
+# IVF는 역리스트에서만 지워져 매핑이 어긋나고, HNSW는 삭제를 지원하지 않음
+REMOVABLE_TYPES = ('flat', 'sq_fp16', 'sq_int8')
+METRICS = ('cosine', 'l2')
+
+
+class IndexConfig:
+    """벡터 인덱스 설정
+
+    근사 인덱스(IVF/HNSW)는 카테고리 벡터 수가 ``min_train_size`` 이상일 때만
+    사용되며, 그 전까지는 정확한 Flat 인덱스를 유지합니다.
+    ``cosine`` 메트릭은 L2 정규화된 벡터에 대한 내적(inner product) 인덱스입니다.
+
+    ``sq_fp16``/``sq_int8``은 벡터를 float16/int8로 저장하는 Scalar Quantizer
+    인덱스로 메모리를 2배/4배 줄입니다. 압축 인덱스(PQ 포함)는 ``rerank_factor``배
+    후보를 찾은 뒤 문서 저장소의 float32 원본 벡터로 정확한 점수를 다시 계산합니다.
+    """
+
+    def __init__(self, index_type: str = "flat", nlist: int = 0, nprobe: int = 8,
+                 pq_m: int = 16, pq_nbits: int = 8, hnsw_m: int = 32,
+                 ef_construction: int = 40, ef_search: int = 64,
+                 min_train_size: int = 1000, metric: str = "cosine", rerank_factor: int = 4,
+                 retrain_factor: float = 2.0):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"지원하지 않는 인덱스 타입입니다: {index_type} (지원: {', '.join(INDEX_TYPES)})")
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 메트릭입니다: {metric} (지원: {', '.join(METRICS)})")
+
+        self.index_type = index_type
+        self.metric = metric
+        self.nlist = nlist  # 0이면 벡터 수에 맞춰 자동 결정
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.min_train_size = min_train_size
+        self.rerank_factor = rerank_factor  # 1 이하이면 재순위화 안 함
+        self.retrain_factor = retrain_factor  # IVF nlist가 목표값과 이 배수 이상 벌어지면 재학습
+
+    @classmethod
+    def from_env(cls) -> "IndexConfig":
+        """환경변수에서 설정 로드"""
+        return cls(
+            index_type=os.getenv('VECTOR_INDEX_TYPE', 'flat').lower(),
+            nlist=int(os.getenv('VECTOR_IVF_NLIST', '0')),
+            nprobe=int(os.getenv('VECTOR_IVF_NPROBE', '8')),
+            pq_m=int(os.getenv('VECTOR_PQ_M', '16')),
+            pq_nbits=int(os.getenv('VECTOR_PQ_NBITS', '8')),
+            hnsw_m=int(os.getenv('VECTOR_HNSW_M', '32')),
+            ef_construction=int(os.getenv('VECTOR_HNSW_EF_CONSTRUCTION', '40')),
+            ef_search=int(os.getenv('VECTOR_HNSW_EF_SEARCH', '64')),
+            min_train_size=int(os.getenv('VECTOR_INDEX_MIN_TRAIN_SIZE', '1000')),
+            metric=os.getenv('VECTOR_METRIC', 'cosine').lower(),
+            rerank_factor=int(os.getenv('VECTOR_RERANK_FACTOR', '4')),
+            retrain_factor=float(os.getenv('VECTOR_IVF_RETRAIN_FACTOR', '2'))
+        )
+
+    @property
+    def normalize(self) -> bool:
+        """벡터를 L2 정규화해야 하는지 여부"""
+        return self.metric == 'cosine'
+
+    @property
+    def faiss_metric(self) -> int:
+        """FAISS 메트릭 상수"""
+        return faiss.METRIC_INNER_PRODUCT if self.metric == 'cosine' else faiss.METRIC_L2
+
+    def to_score(self, distance: float) -> float:
+        """검색 거리를 점수로 변환 (클수록 유사)"""
+        if self.metric == 'cosine':
+            return float(distance)  # 코사인 유사도 그대로 사용
+        return float(1 / (1 + distance))
+
+    def cosine_to_score(self, similarity: float) -> float:
+        """코사인 유사도 임계값을 검색 점수 척도로 변환 (L2는 단위 벡터의 제곱 거리 2 - 2cos 기준)"""
+        if self.metric == 'cosine':
+            return float(similarity)
+        return self.to_score(2 - 2 * similarity)
+
+    def train_size(self) -> int:
+        """근사 인덱스로 전환하기 위한 최소 벡터 수"""
+        if self.index_type == 'ivf_pq':
+            # PQ 코드북 학습에는 최소 2^nbits개의 벡터가 필요
+            return max(self.min_train_size, 2 ** self.pq_nbits)
+        if self.index_type == 'sq_fp16':
+            return 0  # float16 변환은 학습이 필요 없음
+        return self.min_train_size
+
+    def target_type(self, ntotal: int) -> str:
+        """벡터 수에 따라 실제로 사용할 인덱스 타입"""
+        if self.index_type == 'flat' or ntotal < self.train_size():
+            return 'flat'
+        return self.index_type
+
+    def target_nlist(self, ntotal: int) -> int:
+        """벡터 수에 맞는 IVF 클러스터 수"""
+        nlist = self.nlist or int(4 * math.sqrt(ntotal))
+        return max(1, min(nlist, ntotal // 39 or 1))  # 센트로이드당 최소 39개 학습 벡터
+
+    def needs_retrain(self, index: faiss.Index) -> bool:
+        """IVF 인덱스의 nlist가 현재 벡터 수의 목표값과 retrain_factor배 이상 벌어졌는지 여부"""
+        built = index_nlist(index)
+        if not built:
+            return False
+        target = self.target_nlist(index.ntotal)
+        return max(built, target) >= self.retrain_factor * min(built, target)
+
+    def descriptor(self, dim: int, ntotal: int) -> str:
+        """faiss.index_factory 문자열 생성"""
+        index_type = self.target_type(ntotal)
+
+        if index_type == 'flat':
+            return "IDMap2,Flat"
+        if index_type == 'hnsw':
+            return f"IDMap2,HNSW{self.hnsw_m}"
+        if index_type == 'sq_fp16':
+            return "IDMap2,SQfp16"
+        if index_type == 'sq_int8':
+            return "IDMap2,SQ8"
+
+        nlist = self.target_nlist(ntotal)
+        if index_type == 'ivf_flat':
+            return f"IDMap2,IVF{nlist},Flat"
+
+        # PQ 서브벡터 수는 차원의 약수여야 함
+        pq_m = self.pq_m
+        while dim % pq_m != 0:
+            pq_m -= 1
+        return f"IDMap2,IVF{nlist},PQ{pq_m}x{self.pq_nbits}"
+
+
+def index_kind(index: faiss.Index) -> str:
+    """IDMap2로 감싼 인덱스의 실제 타입 판별"""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap2) else faiss.downcast_index(index)
+
+    if isinstance(inner, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(inner, faiss.IndexScalarQuantizer):
+        return 'sq_fp16' if inner.sq.qtype == faiss.ScalarQuantizer.QT_fp16 else 'sq_int8'
+    if isinstance(inner, faiss.IndexIVFPQ):
+        return 'ivf_pq'
+    if isinstance(inner, faiss.IndexIVF):
+        return 'ivf_flat'
+    return 'flat'
+
+
+def index_nlist(index: faiss.Index) -> int:
+    """IVF 인덱스가 학습된 클러스터 수 (IVF가 아니면 0)"""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap2) else faiss.downcast_index(index)
+    return int(inner.nlist) if isinstance(inner, faiss.IndexIVF) else 0
+
+
+def index_metric(index: faiss.Index) -> str:
+    """인덱스의 메트릭 판별"""
+    return 'cosine' if index.metric_type == faiss.METRIC_INNER_PRODUCT else 'l2'
+
+
+def build_index(config: IndexConfig, dim: int, vectors: np.ndarray, ids: np.ndarray) -> faiss.Index:
+    """설정에 맞는 인덱스를 생성하고 (필요하면 학습 후) 벡터 추가"""
+    ntotal = len(ids)
+    index = faiss.index_factory(dim, config.descriptor(dim, ntotal), config.faiss_metric)
+
+    inner = faiss.downcast_index(index.index)
+    if isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efConstruction = config.ef_construction
+
+    if ntotal > 0:
+        vectors = np.ascontiguousarray(vectors, dtype='float32')
+        if not index.is_trained:
+            index.train(vectors)
+        index.add_with_ids(vectors, np.asarray(ids, dtype='int64'))
+
+    return index
+
+
+def reconstruct_vectors(index: faiss.Index) -> Tuple[np.ndarray, np.ndarray]:
+    """IDMap2 인덱스에서 (ID, 벡터) 복원 (PQ는 근사값)"""
+    ids = faiss.vector_to_array(index.id_map).astype('int64')
+    inner = faiss.downcast_index(index.index)
+    if ids.size == 0:
+        return ids, np.zeros((0, index.d), dtype='float32')
+
+    if isinstance(inner, faiss.IndexIVF):
+        inner.make_direct_map()
+    return ids, inner.reconstruct_n(0, inner.ntotal)
+
+
+def search_parameters(index: faiss.Index, config: IndexConfig,
+                      selector: Optional[faiss.IDSelector] = None) -> Optional[faiss.SearchParameters]:
+    """인덱스 타입별 검색 파라미터 (nprobe / efSearch, 메타데이터 필터용 ID selector)"""
+    kind = index_kind(index)
+    if kind in ('ivf_flat', 'ivf_pq'):
+        params = faiss.SearchParametersIVF(nprobe=config.nprobe)
+    elif kind == 'hnsw':
+        params = faiss.SearchParametersHNSW(efSearch=config.ef_search)
+    elif selector is not None:
+        params = faiss.SearchParameters()
+    else:
+        return None
+
+    # IDMap2가 selector의 외부 ID(문서 ID)를 내부 순번으로 변환해 적용
+    if selector is not None:
+        params.sel = selector
+    return params
@@ -0,0 +1,124 @@
+"""Streaming ingestion pipeline (bounded queue + batched embedding)"""
+
+import time
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_DONE = object()
+
+
+def iter_parallel(func: Callable[[T], R], items: Iterable[T], workers: int = 0) -> Iterator[R]:
+    """
+    items를 순서대로 func에 적용한 결과를 하나씩 생성
+
+    workers > 1이면 프로세스 풀에서 실행하되, 동시에 제출하는 작업을 workers × 2개로 제한해
+    결과가 소비되기 전에 메모리에 쌓이지 않게 합니다. func는 모듈 최상위 함수여야 합니다.
+    수집 생산자/배치 임베딩/워밍업 스레드가 도는 프로세스에서 fork하면 잠금을 가진 채 복제될 수
+    있으므로 임베딩 풀과 같이 spawn으로 시작합니다.
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """이터러블을 batch_size개씩 묶음"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest_stream(documents: Iterable[Dict[str, Any]], add_batch: Callable[[List[Dict[str, Any]]], int],
+                  batch_size: int = 256, queue_size: int = 4) -> Dict[str, Any]:
+    """
+    문서 스트림을 배치 단위로 수집
+
+    생산자 스레드가 documents(파싱 제너레이터)를 batch_size개씩 묶어 크기 queue_size의
+    큐에 넣고, 호출 스레드가 배치마다 add_batch(임베딩 + 색인)를 호출합니다. 파싱과
+    임베딩이 겹쳐 진행되며, 메모리에는 최대 (queue_size + 2)개 배치만 존재합니다.
+
+    Args:
+        documents: 'text'를 포함한 문서 메타데이터 이터러블
+        add_batch: 배치를 저장하고 추가된 문서 수를 반환하는 함수
+        batch_size: 배치당 문서 수
+        queue_size: 대기할 수 있는 최대 배치 수
+
+    Returns:
+        {'documents': 읽은 문서 수, 'added': 추가된 문서 수, 'batches': 배치 수,
+         'seconds': 소요 시간, 'docs_per_second': 처리량}
+    """
+    batches: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    producer_error: List[BaseException] = []
+
+    def _produce():
+        try:
+            for batch in batched(documents, batch_size):
+                while not stop.is_set():
+                    try:
+                        batches.put(batch, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except BaseException as e:
+            producer_error.append(e)
+        finally:
+            batches.put(_DONE)
+
+    producer = threading.Thread(target=_produce, name="ingest-producer", daemon=True)
+    started = time.perf_counter()
+    producer.start()
+
+    stats = {'documents': 0, 'added': 0, 'batches': 0}
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                break
+            stats['added'] += add_batch(batch)
+            stats['documents'] += len(batch)
+            stats['batches'] += 1
+            elapsed = time.perf_counter() - started
+            print(f"수집 진행: {stats['documents']}개 문서 ({stats['documents'] / max(elapsed, 1e-9):.1f} docs/s)")
+    finally:
+        # 소비 중 오류가 나면 생산자를 멈추고 큐를 비워 종료시킴
+        stop.set()
+        while producer.is_alive():
+            try:
+                batches.get(timeout=0.5)
+            except queue.Empty:
+                pass
+        producer.join()
+
+    if producer_error:
+        raise producer_error[0]
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['docs_per_second'] = stats['documents'] / max(stats['seconds'], 1e-9)
+    print(f"수집 완료: {stats['documents']}개 문서, {stats['added']}개 추가 "
+          f"({stats['seconds']:.1f}초, {stats['docs_per_second']:.1f} docs/s)")
+    return stats
@@ -2,17 +2,77 @@
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from .faiss_store import get_vector_store
+from .ingest import iter_parallel
+from .snapshot import file_hash
 
-def load_knowledge_file(file_path: Path, category: str) -> List[Dict[str, Any]]:
-    """지식 파일 로드 및 파싱"""
+# 지식 파일로 읽을 확장자 (디렉토리 아래 전체를 재귀 탐색)
+KNOWLEDGE_EXTENSIONS = ('.txt', '.md')
+
+
+def parse_front_matter(content: str) -> Tuple[Dict[str, str], str]:
+    """
+    파일 앞의 front-matter 분리
+
+    ::
+
+        ---
+        category: market_trends
+        region: KR
+        ---
+        # 제목 ...
+
+    Returns:
+        (front-matter 키/값, 본문)
+    """
+    if not content.startswith('---'):
+        return {}, content
+
+    end = content.find('\n---', 3)
+    if end == -1:
+        return {}, content
+
+    front_matter = {}
+    for line in content[3:end].splitlines():
+        key, sep, value = line.partition(':')
+        if sep and key.strip():
+            front_matter[key.strip()] = value.strip().strip('"\'')
+
+    body_start = content.find('\n', end + 4)
+    return front_matter, content[body_start + 1:] if body_start != -1 else ""
+
+
+def discover_knowledge_files(data_path: Path) -> Dict[str, Path]:
+    """디렉토리 아래 지식 파일 탐색 → {원본 이름(data_path 기준 상대 경로): 경로}"""
+    return {
+        path.relative_to(data_path).as_posix(): path
+        for path in sorted(data_path.rglob('*'))
+        if path.is_file() and path.suffix.lower() in KNOWLEDGE_EXTENSIONS
+    }
+
+
+def load_knowledge_file(file_path: Path, category: Optional[str] = None,
+                        source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    지식 파일 로드 및 파싱
+
+    카테고리는 인자 → front-matter의 ``category`` → 파일명(확장자 제외) 순으로 정합니다.
+    front-matter의 나머지 키는 각 섹션 메타데이터에 들어가 필터 검색에 쓸 수 있습니다.
+    섹션은 ``{source}#{제목}``을 doc_key로 가지므로 제목이 같은 섹션은 본문 해시로 변경 여부를 판별합니다.
+    """
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    front_matter, content = parse_front_matter(content)
+    category = category or front_matter.pop('category', None) or file_path.stem
+    front_matter.pop('category', None)
+    source = source or file_path.name
+
     # 섹션별로 분할 (## 기준)
     sections = content.split('\n## ')
     documents = []
+    seen_titles: Dict[str, int] = {}
 
     for section in sections:
         if not section.strip():
@@ -27,17 +87,64 @@ def load_knowledge_file(file_path: Path, category: str) -> List[Dict[str, Any]]:
         text = lines[1].strip() if len(lines) > 1 else ""
 
         if text:
+            # 같은 파일 안에서 제목이 겹치면 순번으로 구분
+            seen_titles[title] = seen_titles.get(title, 0) + 1
+            doc_key = f"{source}#{title}"
+            if seen_titles[title] > 1:
+                doc_key += f"#{seen_titles[title]}"
+
             documents.append({
+                **front_matter,
                 'title': title,
                 'text': f"{title}\n{text}",
                 'category': category,
-                'source': file_path.name
+                'source': source,
+                'doc_key': doc_key
             })
 
     return documents
 
-def initialize_knowledge_base(data_dir: str = "./data/unstructured/knowledge"):
-    """지식 베이스 초기화"""
+
+def _load_source(item: Tuple[str, Path]) -> List[Dict[str, Any]]:
+    """(원본 이름, 경로) 하나를 섹션으로 파싱 (프로세스 풀 작업 단위)"""
+    source, file_path = item
+    return load_knowledge_file(file_path, source=source)
+
+
+def iter_knowledge_sections(files: Dict[str, Path], workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    지식 파일 섹션을 하나씩 생성 (파일 전체를 한 번에 메모리에 올리지 않음)
+
+    Args:
+        files: 원본 이름 → 경로
+        workers: 파싱 프로세스 수 (기본값: KNOWLEDGE_PARSE_WORKERS, 1 이하면 현재 프로세스에서 파싱)
+    """
+    if workers is None:
+        workers = int(os.getenv('KNOWLEDGE_PARSE_WORKERS', '0'))
+
+    for source, documents in zip(files, iter_parallel(_load_source, files.items(), workers)):
+        category = documents[0]['category'] if documents else '-'
+        print(f"로딩 중: {source} (카테고리: {category}, {len(documents)}개 섹션)")
+        yield from documents
+
+
+def initialize_knowledge_base(data_dir: str = "./data/unstructured/knowledge", force: bool = False,
+                              background: bool = False):
+    """
+    지식 베이스 초기화/동기화
+
+    디렉토리 아래 모든 지식 파일(.txt, .md)을 읽어 파일 해시를 현재 세대 매니페스트와 비교합니다.
+
+    - 모두 같으면 건너뜀
+    - 일부 파일만 바뀌었으면 해당 파일만 섹션 단위로 동기화 (바뀐 섹션만 임베딩, 없어진 섹션 삭제)
+    - 스토어가 비어 있거나 임베딩 모델/차원/메트릭이 바뀌었거나 force=True면 새 세대를 빌드한 뒤
+      원자적으로 전환 (빌드 중에도 기존 세대로 검색 가능)
+
+    Args:
+        data_dir: 지식 파일 디렉토리
+        force: True면 변경이 없어도 새 세대로 재구축
+        background: True면 새 세대 빌드를 백그라운드에서 실행하고 스레드 반환
+    """
     print("=" * 60)
     print("지식 베이스 초기화 시작")
     print("=" * 60)
@@ -49,52 +156,45 @@ def initialize_knowledge_base(data_dir: str = "./data/unstructured/knowledge"):
 
     vector_store = get_vector_store()
 
-    # 기존 문서가 있으면 스킵
-    if vector_store.index.ntotal > 0:
-        print(f"이미 {vector_store.index.ntotal}개의 문서가 로드되어 있습니다")
+    files = discover_knowledge_files(data_path)
+    sources = {source: file_hash(path) for source, path in files.items()}
+
+    # 원본 파일이 바뀌지 않았으면 스킵
+    if not force and vector_store.manifest_matches(sources):
+        print(f"지식 베이스가 최신 상태입니다 (세대: {vector_store.generation}, {vector_store.ntotal}개 문서)")
         stats = vector_store.get_stats()
         print(f"카테고리별 문서 수: {stats['categories']}")
         return
 
-    # 지식 파일 매핑
-    knowledge_files = {
-        'tech_info.txt': 'tech_info',
-        'market_trends.txt': 'market_trends',
-        'salary_info.txt': 'salary_info'
-    }
-
-    all_documents = []
-    all_texts = []
-
-    for filename, category in knowledge_files.items():
-        file_path = data_path / filename
-
-        if not file_path.exists():
-            print(f"경고: 파일을 찾을 수 없습니다: {filename}")
-            continue
-
-        print(f"\n로딩 중: {filename} (카테고리: {category})")
-        documents = load_knowledge_file(file_path, category)
-        print(f"  {len(documents)}개 섹션 로드")
+    if force or vector_store.ntotal == 0 or not vector_store.manifest_compatible():
+        if not files:
+            print("로드할 문서가 없습니다")
+            return
 
-        all_documents.extend(documents)
-        all_texts.extend([doc['text'] for doc in documents])
-
-    if all_documents:
-        print(f"\n총 {len(all_documents)}개 문서를 벡터 스토어에 추가 중...")
-        vector_store.add_documents(all_texts, all_documents)
-        vector_store.save()
-
-        stats = vector_store.get_stats()
-        print("\n" + "=" * 60)
-        print("지식 베이스 초기화 완료")
-        print("=" * 60)
-        print(f"총 문서 수: {stats['total_documents']}")
-        print(f"카테고리별 문서:")
-        for cat, count in stats['categories'].items():
-            print(f"  - {cat}: {count}개")
+        print(f"\n지식 파일 {len(files)}개로 새 세대 빌드 중...")
+        thread = vector_store.rebuild_generation(iter_knowledge_sections(files), sources, background=background)
+        if thread is not None:
+            print("백그라운드에서 빌드 중입니다 (완료 시 자동 전환)")
+            return thread
     else:
-        print("로드할 문서가 없습니다")
+        previous = vector_store.manifest.get('sources', {})
+        changed = {source: path for source, path in files.items() if previous.get(source) != sources[source]}
+        removed = [source for source in previous if source not in sources]
+
+        print(f"변경된 파일 {len(changed)}개, 삭제된 파일 {len(removed)}개 동기화 중...")
+        added, deleted = vector_store.sync_documents(
+            iter_knowledge_sections(changed), list(changed) + removed, sources
+        )
+        print(f"동기화 완료: 문서 {added}개 추가/교체, {deleted}개 삭제")
+
+    stats = vector_store.get_stats()
+    print("\n" + "=" * 60)
+    print("지식 베이스 초기화 완료")
+    print("=" * 60)
+    print(f"총 문서 수: {stats['total_documents']}")
+    print(f"카테고리별 문서:")
+    for cat, count in stats['categories'].items():
+        print(f"  - {cat}: {count}개")
 
 if __name__ == "__main__":
-    initialize_knowledge_base()
\ No newline at end of file
+    initialize_knowledge_base()
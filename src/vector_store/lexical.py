@@ -0,0 +1,96 @@
+"""BM25 Lexical Retriever (Korean character n-grams)"""
+
+import re
+import math
+import unicodedata
+from collections import Counter
+from typing import Any, List, Dict, Tuple, Optional
+
+# 한글 연속 구간은 음절 bigram, 영문/숫자는 단어 단위 (c++, c# 등 기호 포함)
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+[+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 친화 토크나이저
+
+    형태소 분석기 없이도 "비바리퍼블리카", "토스의" 같은 복합어/조사 결합형을
+    부분 일치시킬 수 있도록 한글은 음절 bigram으로 분해합니다.
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.findall(unicodedata.normalize('NFC', text).lower()):
+        if '가' <= match[0] <= '힣' and len(match) > 1:
+            tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        else:
+            tokens.append(match)
+    return tokens
+
+
+def term_frequencies(text: str) -> Tuple[Dict[str, int], int]:
+    """텍스트의 (용어별 빈도, 전체 토큰 수)"""
+    tokens = tokenize(text)
+    return dict(Counter(tokens)), len(tokens)
+
+
+class BM25Retriever:
+    """문서 저장소의 역색인(postings)을 사용하는 BM25 검색기"""
+
+    def __init__(self, doc_store, k1: float = 1.2, b: float = 0.75):
+        self.doc_store = doc_store
+        self.k1 = k1
+        self.b = b
+
+    def search(self, query: str, category: Optional[str] = None, top_k: int = 5,
+               metadata_filter: Optional[Dict[str, Any]] = None) -> List[Tuple[int, float]]:
+        """
+        BM25 검색
+
+        필터를 지정하면 문서 수/평균 길이/문서 빈도도 필터에 맞는 문서 집합 기준으로 계산하고,
+        필터 조건은 SQL에서 적용되어 필터 밖 문서의 postings는 조회하지 않습니다.
+
+        Args:
+            query: 검색 쿼리
+            category: 검색할 카테고리 (None이면 전체)
+            top_k: 반환할 결과 수
+            metadata_filter: 메타데이터 필터 (filters.compile_filter 표현식)
+
+        Returns:
+            (문서 ID, BM25 점수) 리스트 (점수 내림차순)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total_docs, avg_length = self.doc_store.lexical_stats(category, metadata_filter)
+        if total_docs == 0:
+            return []
+
+        postings = self.doc_store.term_postings(terms, category, metadata_filter)
+        doc_freq = Counter(term for term, _, _, _ in postings)
+
+        scores: Dict[int, float] = {}
+        for term, doc_id, tf, length in postings:
+            df = doc_freq[term]
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    여러 순위 리스트를 RRF(Reciprocal Rank Fusion)로 결합
+
+    Args:
+        rankings: 문서 ID 순위 리스트들
+        k: 순위 완화 상수
+
+    Returns:
+        (문서 ID, 결합 점수) 리스트 (점수 내림차순)
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
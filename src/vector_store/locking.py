@@ -0,0 +1,83 @@
+"""Read-write lock for the shared vector store"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """쓰기 우선 읽기/쓰기 잠금
+
+    여러 스레드가 동시에 읽을 수 있고, 쓰기는 단독으로 수행됩니다. 대기 중인
+    쓰기가 있으면 새 읽기는 기다리므로 검색이 많아도 수집이 굶지 않습니다.
+    쓰기 잠금은 같은 스레드에서 재진입할 수 있고, 쓰기 잠금을 가진 스레드는
+    읽기 잠금도 얻을 수 있습니다. 읽기 잠금의 중첩 획득은 지원하지 않습니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """읽기 잠금 획득"""
+        with self._cond:
+            if self._writer == threading.get_ident():
+                self._write_depth += 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        """읽기 잠금 해제"""
+        with self._cond:
+            if self._writer == threading.get_ident():
+                self._write_depth -= 1
+                return
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        """쓰기 잠금 획득"""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """쓰기 잠금 해제"""
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """읽기 잠금 컨텍스트"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """쓰기 잠금 컨텍스트"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,53 @@
+"""Vector normalization and result re-ranking utilities (MMR diversification)"""
+
+from typing import List
+import numpy as np
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """마지막 축 기준 L2 정규화 (float32, 영벡터는 그대로 유지)"""
+    vectors = np.asarray(vectors, dtype='float32')
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+def maximal_marginal_relevance(query_embedding: np.ndarray, candidate_embeddings: np.ndarray,
+                               top_k: int, lambda_mult: float = 0.5) -> List[int]:
+    """
+    MMR(Maximal Marginal Relevance)로 후보 선택
+
+    쿼리와의 유사도는 높고 이미 선택된 문서와의 유사도는 낮은 후보를 차례로 고릅니다.
+    입력은 L2 정규화된 벡터여야 합니다 (내적 = 코사인 유사도).
+    후보 간 유사도 행렬을 한 번 계산하고, 선택된 문서와의 최대 유사도는
+    선택할 때마다 벡터 연산으로 갱신하므로 O(top_k × 후보 수)로 동작합니다.
+
+    Args:
+        query_embedding: 정규화된 쿼리 임베딩 (d,)
+        candidate_embeddings: 정규화된 후보 임베딩 (N, d)
+        top_k: 선택할 후보 수
+        lambda_mult: 관련도 가중치 (1이면 유사도 순, 0이면 다양성만 고려)
+
+    Returns:
+        선택된 후보의 인덱스 리스트 (선택 순서)
+    """
+    num_candidates = len(candidate_embeddings)
+    if num_candidates == 0 or top_k <= 0:
+        return []
+
+    candidates = np.asarray(candidate_embeddings, dtype='float32')
+    relevance = candidates @ np.asarray(query_embedding, dtype='float32').reshape(-1)
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = pairwise[selected[0]].copy()
+    available = np.ones(num_candidates, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(top_k, num_candidates):
+        mmr_scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        mmr_scores[~available] = -np.inf
+        best = int(np.argmax(mmr_scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, pairwise[best], out=max_similarity)
+
+    return selected
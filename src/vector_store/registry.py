@@ -0,0 +1,68 @@
+"""Embedding model registry persisted with each vector store"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .doc_store import DocumentStore
+
+# 문서 저장소 store_meta에 기록하는 키
+REGISTRY_KEY = "embedding_model"
+
+# 값이 다르면 저장된 벡터와 쿼리 벡터가 같은 공간이 아님 (재임베딩 필요)
+VECTOR_SPACE_FIELDS = ('model', 'revision', 'dimension')
+
+
+def embedding_spec(embedder, normalize: bool) -> Dict[str, Any]:
+    """
+    임베더의 모델 명세
+
+    Args:
+        embedder: KoreanEmbedder
+        normalize: 검색 시 벡터 정규화 여부 (cosine 메트릭)
+
+    Returns:
+        {'model', 'revision', 'dimension', 'normalize', 'backend'}
+    """
+    return {
+        'model': embedder.model_name,
+        'revision': embedder.revision,
+        'dimension': embedder.get_embedding_dim(),
+        'normalize': normalize,
+        'backend': embedder.backend
+    }
+
+
+def read_spec(doc_store: DocumentStore) -> Optional[Dict[str, Any]]:
+    """저장된 모델 명세 (기록 이전 버전이면 None)"""
+    value = doc_store.get_meta(REGISTRY_KEY)
+    return json.loads(value) if value else None
+
+
+def write_spec(doc_store: DocumentStore, spec: Dict[str, Any]):
+    """모델 명세 기록"""
+    doc_store.set_meta(REGISTRY_KEY, json.dumps(spec, ensure_ascii=False, sort_keys=True))
+
+
+def incompatible_fields(stored: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    저장된 벡터를 현재 모델로 검색할 수 없게 만드는 차이
+
+    revision은 양쪽 모두 알 때만 비교합니다. 정규화는 인덱스 재구축으로, 백엔드(int8/ONNX)는
+    같은 모델의 근사 추론이므로 재임베딩 대상이 아닙니다.
+
+    Returns:
+        값이 다른 필드 이름 리스트 (비어 있으면 호환)
+    """
+    changed = []
+    for field in VECTOR_SPACE_FIELDS:
+        if field == 'revision' and not (stored.get(field) and current.get(field)):
+            continue
+        if stored.get(field) != current.get(field):
+            changed.append(field)
+    return changed
+
+
+def describe_spec(spec: Dict[str, Any]) -> str:
+    """로그용 명세 요약"""
+    revision = f"@{spec['revision'][:12]}" if spec.get('revision') else ""
+    return f"{spec.get('model')}{revision} ({spec.get('dimension')}차원, {spec.get('backend')})"
@@ -0,0 +1,149 @@
+"""Versioned vector store generations (manifest + CURRENT pointer)"""
+
+import os
+import json
+import shutil
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Dict, Any, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작 (단일 프로세스 기준)
+    fcntl = None
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+GENERATIONS_DIR = "generations"
+LOCK_NAME = ".lock"
+LEASE_NAME = ".lease"
+
+
+def file_hash(path: Path) -> str:
+    """파일 내용 해시 (sha256)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def new_generation_id() -> str:
+    """새 세대 ID (생성 시각 기준, 사전순 = 시간순)"""
+    return datetime.now().strftime("gen-%Y%m%d-%H%M%S-%f")
+
+
+def generation_path(root: Path, generation: str) -> Path:
+    """세대 디렉토리 경로"""
+    return Path(root) / GENERATIONS_DIR / generation
+
+
+def current_generation(root: Path) -> Optional[str]:
+    """현재 서비스 중인 세대 ID (CURRENT 포인터가 없으면 None = 이전 단일 디렉토리 구조)"""
+    pointer = Path(root) / CURRENT_NAME
+    if not pointer.exists():
+        return None
+    generation = pointer.read_text(encoding='utf-8').strip()
+    return generation or None
+
+
+@contextmanager
+def store_lock(root: Path) -> Iterator[None]:
+    """
+    세대 빌드/전환/정리를 프로세스 간 직렬화하는 배타 잠금 (스토어 루트의 .lock 파일)
+
+    같은 프로세스의 다른 스레드끼리도 서로 다른 파일 디스크립터로 잠그므로 함께 직렬화됩니다.
+    """
+    with open(Path(root) / LOCK_NAME, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def acquire_lease(data_path: Path) -> IO:
+    """
+    세대 사용 중 표시 (공유 잠금, 반환된 파일을 닫으면 해제)
+
+    세대를 읽거나 빌드하는 동안 열어 두면 다른 프로세스의 cleanup_generations가 삭제하지 않습니다.
+    """
+    lease = open(Path(data_path) / LEASE_NAME, 'a')
+    if fcntl is not None:
+        fcntl.flock(lease.fileno(), fcntl.LOCK_SH)
+    return lease
+
+
+def _in_use(path: Path) -> bool:
+    """다른 인스턴스가 세대 사용권을 쥐고 있는지 여부"""
+    lease_path = path / LEASE_NAME
+    if fcntl is None or not lease_path.exists():
+        return False
+    with open(lease_path, 'a') as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    return False
+
+
+def write_atomic(path: Path, data: Union[bytes, str]):
+    """임시 파일에 쓰고 fsync 후 원자적으로 교체 (문자열은 UTF-8로 기록)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def set_current_generation(root: Path, generation: str):
+    """CURRENT 포인터를 원자적으로 교체 (읽는 쪽은 이전/새 세대 중 하나만 보게 됨)"""
+    write_atomic(Path(root) / CURRENT_NAME, generation + "\n")
+
+
+def read_manifest(data_path: Path) -> Dict[str, Any]:
+    """세대 매니페스트 읽기 (없으면 빈 딕셔너리)"""
+    path = Path(data_path) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(data_path: Path, manifest: Dict[str, Any]):
+    """세대 매니페스트 기록"""
+    write_atomic(Path(data_path) / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+def cleanup_generations(root: Path, keep: int = 2) -> List[str]:
+    """
+    오래된 세대 삭제 (현재 세대와 최근 keep개, 사용 중인 세대는 유지)
+
+    store_lock 안에서 호출해야 다른 프로세스의 빌드와 겹치지 않습니다.
+
+    Returns:
+        삭제된 세대 ID 리스트
+    """
+    generations_dir = Path(root) / GENERATIONS_DIR
+    if not generations_dir.exists():
+        return []
+
+    current = current_generation(root)
+    generations = sorted(path.name for path in generations_dir.iterdir() if path.is_dir())
+    old_generations = generations[:-keep] if keep > 0 else generations
+    removable = [
+        generation for generation in old_generations
+        if generation != current and not _in_use(generations_dir / generation)
+    ]
+    for generation in removable:
+        shutil.rmtree(generations_dir / generation, ignore_errors=True)
+    return removable
@@ -0,0 +1,82 @@
+"""테스트 공통 설정 (sentence-transformers 없이 결정적인 가짜 모델 사용)"""
+
+import hashlib
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from src.vector_store import embedder as embedder_module
+from src.vector_store import faiss_store
+
+DIM = 32
+
+
+class FakeTokenizer:
+    """공백 단위 토크나이저"""
+
+    def __call__(self, texts: List[str], truncation: bool = True, max_length: Optional[int] = None):
+        return {'input_ids': [[0] * min(len(text.split()) + 2, max_length or 1 << 30) for text in texts]}
+
+    def tokenize(self, text: str) -> List[str]:
+        return text.split()
+
+
+class FakeSentenceTransformer:
+    """텍스트마다 고정된 난수 벡터를 돌려주는 모델 (모델명/리비전이 바뀌면 벡터도 바뀜)"""
+
+    max_seq_length = 128
+
+    def __init__(self, name: str, revision: Optional[str] = None):
+        self.name = name
+        self.revision = revision
+        self.tokenizer = FakeTokenizer()
+        self.encoded = 0
+
+    def vector(self, text: str) -> np.ndarray:
+        digest = hashlib.sha256(f"{self.name}@{self.revision}\n{text}".encode('utf-8')).digest()
+        return np.random.default_rng(int.from_bytes(digest[:8], 'little')).standard_normal(DIM).astype('float32')
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            self.encoded += 1
+            return self.vector(texts)
+        self.encoded += len(texts)
+        return np.stack([self.vector(text) for text in texts]) if texts else np.zeros((0, DIM), dtype='float32')
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+
+@pytest.fixture(autouse=True)
+def fake_models(monkeypatch, tmp_path) -> List[FakeSentenceTransformer]:
+    """모델 로드를 가짜 모델로 대체하고 전역 인스턴스/환경변수를 테스트마다 초기화 (로드된 모델 리스트 반환)"""
+    loaded: List[FakeSentenceTransformer] = []
+
+    def _load(model_name, device='cpu', backend='torch', onnx_dir=None, revision=None):
+        model = FakeSentenceTransformer(model_name, revision)
+        loaded.append(model)
+        return model
+
+    monkeypatch.setattr(embedder_module, 'load_sentence_transformer', _load)
+    monkeypatch.setattr(embedder_module, '_embedder_instance', None)
+    monkeypatch.setattr(faiss_store, '_vector_store_instance', None)
+
+    env = {
+        'EMBEDDING_MODEL': 'fake-model',
+        'EMBEDDING_BACKEND': 'torch',
+        'EMBEDDING_DISK_CACHE': 'false',
+        'EMBEDDING_BATCH_WINDOW_MS': '0',
+        'EMBEDDING_POOL_WORKERS': '0',
+        'VECTOR_STORE_PATH': str(tmp_path / 'vector_store'),
+        'VECTOR_INDEX_TYPE': 'flat',
+        'VECTOR_METRIC': 'cosine',
+        'VECTOR_INDEX_MMAP': 'false',
+        'VECTOR_INDEX_RELOAD_INTERVAL': '0',
+        'VECTOR_MODEL_MISMATCH': 'reembed',
+    }
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.delenv('EMBEDDING_MODEL_REVISION', raising=False)
+    return loaded
@@ -0,0 +1,86 @@
+"""동시 embed_text 요청 마이크로 배치 (결과 분배, 예외 전파)"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.vector_store.batching import MicroBatcher
+from src.vector_store.embedder import KoreanEmbedder
+
+
+def fake_encode(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        return np.stack([np.full(4, float(len(text)), dtype='float32') for text in texts])
+    return encode
+
+
+def test_fans_out_results_to_each_request():
+    calls = []
+    batcher = MicroBatcher(fake_encode(calls), window_ms=200, max_batch=8)
+    texts = ["가", "가나", "가나다", "가나"]
+
+    futures = [batcher.submit(text) for text in texts]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert calls == [["가", "가나", "가나다"]]  # 한 배치, 같은 텍스트는 한 번만 인코딩
+    assert [result[0] for result in results] == [1, 2, 3, 2]
+    results[1][:] = 0  # 요청마다 별도 복사본
+    assert results[3][0] == 2
+    assert batcher.info()['avg_batch_size'] == 4
+
+
+def test_max_batch_splits_requests():
+    calls = []
+    batcher = MicroBatcher(fake_encode(calls), window_ms=200, max_batch=2)
+    futures = [batcher.submit(str(i)) for i in range(5)]
+    assert [future.result(timeout=5)[0] for future in futures] == [1] * 5
+    assert [len(batch) for batch in calls] == [2, 2, 1]
+
+
+def test_encode_error_reaches_every_request_and_worker_survives():
+    calls = []
+    succeed = fake_encode(calls)
+
+    def encode(texts):
+        if "실패" in texts:
+            raise RuntimeError("encode failed")
+        return succeed(texts)
+
+    batcher = MicroBatcher(encode, window_ms=200, max_batch=8)
+    failed = [batcher.submit(text) for text in ["실패", "정상"]]
+    for future in failed:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+    assert batcher.encode("다음")[0] == 2  # 워커는 계속 다음 배치를 처리
+    assert batcher.info()['batches'] == 1
+
+
+def test_embedder_batches_concurrent_queries(fake_models, monkeypatch):
+    embedder = KoreanEmbedder("fake-model", batch_window_ms=200, batch_max_size=8)
+    model = fake_models[-1]
+    batches = []
+    original_encode = model.encode
+    monkeypatch.setattr(model, 'encode', lambda texts, **kwargs: batches.append(list(texts)) or
+                        original_encode(texts, **kwargs))
+
+    queries = [f"쿼리 {i}" for i in range(6)]
+    results = {}
+    barrier = threading.Barrier(len(queries))
+
+    def run(query):
+        barrier.wait()
+        results[query] = embedder.embed_text(query)
+
+    threads = [threading.Thread(target=run, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(batches) < len(queries)
+    assert sorted(text for batch in batches for text in batch) == sorted(queries)
+    for query in queries:
+        np.testing.assert_array_equal(results[query], model.vector(query))
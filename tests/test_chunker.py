@@ -0,0 +1,73 @@
+"""토큰 기준 청크 분할 (문장 경계, 겹침)과 원본 전문 확장"""
+
+import pytest
+
+from src.vector_store.chunker import TextChunker, split_sentences
+from src.vector_store.embedder import get_embedder
+from src.vector_store.faiss_store import FAISSVectorStore
+
+# 문장마다 3토큰 (가짜 토크나이저는 공백 단위)
+SENTENCES = [f"문장{i} 토큰 하나." for i in range(10)]
+TEXT = " ".join(SENTENCES)
+
+
+def make_chunker(chunk_size: int = 10, chunk_overlap: int = 4) -> TextChunker:
+    return TextChunker(get_embedder().count_tokens, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def test_chunks_follow_sentence_boundaries_with_overlap(fake_models):
+    chunker = make_chunker()
+    chunks = chunker.chunk(TEXT)
+
+    assert len(chunks) > 1
+    assert all(chunker.count_tokens(chunk) <= 10 for chunk in chunks)
+    for chunk in chunks:
+        assert set(split_sentences(chunk)) <= set(SENTENCES)  # 문장 중간에서 자르지 않음
+    for previous, current in zip(chunks, chunks[1:]):
+        # 이전 청크의 마지막 문장(3토큰 ≤ overlap 4)이 다음 청크 앞에 겹침
+        assert split_sentences(current)[0] == split_sentences(previous)[-1]
+
+    covered = []
+    for chunk in chunks:
+        covered.extend(sentence for sentence in split_sentences(chunk) if sentence not in covered)
+    assert covered == SENTENCES
+
+
+def test_long_sentence_split_and_header(fake_models):
+    chunker = make_chunker(chunk_size=5, chunk_overlap=1)
+    assert chunker.chunk("짧은 문장.") == ["짧은 문장."]
+
+    long_sentence = " ".join(f"단어{i}" for i in range(12))
+    chunks = chunker.chunk(long_sentence)
+    assert all(chunker.count_tokens(chunk) <= 5 for chunk in chunks)
+    assert " ".join(chunks).split() == long_sentence.split()
+
+    # 제목은 두 번째 청크부터 붙고, 제목 토큰만큼 본문 한도가 줄어듦
+    titled = chunker.chunk(long_sentence, header="제목")
+    assert not titled[0].startswith("제목") and all(chunk.startswith("제목\n") for chunk in titled[1:])
+    assert all(chunker.count_tokens(chunk) <= 5 for chunk in titled)
+
+    with pytest.raises(ValueError):
+        make_chunker(chunk_size=4, chunk_overlap=4)
+
+
+def test_store_chunks_long_documents_and_expands_parent(tmp_path, monkeypatch, fake_models):
+    monkeypatch.setenv('VECTOR_CHUNK_SIZE', '10')
+    monkeypatch.setenv('VECTOR_CHUNK_OVERLAP', '4')
+    store = FAISSVectorStore(str(tmp_path / 'store'), reload_interval=0)
+    store.add_documents([TEXT, "짧은 문서"], [{'category': 'tech', 'doc_key': 'long'}, {'category': 'tech', 'doc_key': 'short'}])
+
+    docs = store.doc_store.get_many(store.doc_store.category_ids('tech').tolist()).values()
+    chunks = sorted((doc for doc in docs if doc['doc_key'] == 'long'), key=lambda doc: doc['chunk_index'])
+    assert len(chunks) > 1 and [doc['chunk_index'] for doc in chunks] == list(range(len(chunks)))
+    assert {doc['parent_key'] for doc in chunks} == {'long'} and chunks[0]['chunk_count'] == len(chunks)
+
+    # 같은 원본의 청크는 결과에 한 번만, expand_parent면 원본 전문으로 교체
+    results = store.search_by_category(chunks[1]['text'], 'tech', top_k=5)
+    assert [doc['doc_key'] for doc in results].count('long') == 1
+    expanded = store.search_by_category(chunks[1]['text'], 'tech', top_k=1, expand_parent=True)[0]
+    assert expanded['text'] == TEXT and expanded['chunk_text'] == chunks[1]['text']
+
+    # 마지막 청크가 삭제되면 원본 전문도 정리
+    store.delete([doc['id'] for doc in chunks])
+    assert store.doc_store.get_parents([('tech', 'long')]) == {}
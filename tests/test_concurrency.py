@@ -0,0 +1,130 @@
+"""읽기/쓰기 잠금, 스냅샷 재생, 백그라운드 재구축 동시성"""
+
+import threading
+
+from src.vector_store import faiss_store
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.index_factory import IndexConfig, index_kind
+
+
+def add_docs(store: FAISSVectorStore, start: int, count: int, category: str = 'tech'):
+    store.add_documents(
+        [f"문서 {i}" for i in range(start, start + count)],
+        [{'category': category, 'doc_key': f"d{i}"} for i in range(start, start + count)]
+    )
+
+
+def top_key(store: FAISSVectorStore, text: str, category: str = 'tech') -> str:
+    results = store.search_by_category(text, category, top_k=1)
+    return results[0]['doc_key'] if results else None
+
+
+def test_search_not_blocked_by_index_rebuild(tmp_path, monkeypatch):
+    store = FAISSVectorStore(str(tmp_path / 'store'), index_config=IndexConfig('hnsw', min_train_size=50),
+                             reload_interval=0)
+    add_docs(store, 0, 40)
+
+    building, release = threading.Event(), threading.Event()
+    original_build = faiss_store.build_index
+
+    def slow_build(*args, **kwargs):
+        building.set()
+        release.wait(10)
+        return original_build(*args, **kwargs)
+
+    monkeypatch.setattr(faiss_store, 'build_index', slow_build)
+    adder = threading.Thread(target=add_docs, args=(store, 40, 20))  # 학습 기준을 넘어 HNSW로 전환
+    adder.start()
+    assert building.wait(10)
+
+    # 재구축이 진행 중이어도 검색은 기존 인덱스로 바로 응답
+    searched = []
+    searcher = threading.Thread(target=lambda: searched.append(top_key(store, "문서 3")))
+    searcher.start()
+    searcher.join(5)
+    assert searched == ['d3']
+
+    release.set()
+    adder.join(10)
+    store.save()
+    assert index_kind(store.category_indexes['tech']) == 'hnsw'
+    assert top_key(store, "문서 55") == 'd55'
+
+
+def test_concurrent_reads_and_writes(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), index_config=IndexConfig('ivf_flat', min_train_size=100,
+                                                                                nprobe=64), reload_interval=0)
+    add_docs(store, 0, 50)
+    stop, errors = threading.Event(), []
+
+    def reader():
+        while not stop.is_set():
+            try:
+                assert top_key(store, "문서 7") == 'd7'
+                store.hybrid_search("문서", 'tech', top_k=3)
+            except Exception as e:  # noqa: BLE001 - 스레드 오류를 메인 스레드에서 검증
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for start in range(50, 250, 25):
+        add_docs(store, start, 25)
+        store.delete([doc_id for doc_id, doc in store.doc_store.get_many(
+            store.doc_store.category_ids('tech').tolist()).items() if doc['doc_key'] == f"d{start - 1}"])
+    stop.set()
+    for thread in readers:
+        thread.join()
+    store.save()
+
+    assert errors == []
+    assert store._indexed_count('tech') == store.doc_store.category_counts()['tech']
+    assert top_key(store, "문서 200") == 'd200'
+    assert top_key(store, "문서 99") != 'd99'
+
+
+def test_reopen_replays_documents_after_snapshot(tmp_path):
+    path = str(tmp_path / 'store')
+    store = FAISSVectorStore(path, reload_interval=0)
+    add_docs(store, 0, 10)
+    store.save()
+    add_docs(store, 10, 5)  # 스냅샷 이후 문서 (문서 저장소에만 커밋됨)
+    store.doc_store.close()
+
+    reopened = FAISSVectorStore(path, reload_interval=0)
+    assert reopened.ntotal == 15
+    assert top_key(reopened, "문서 12") == 'd12'
+
+
+def test_corrupt_snapshot_rebuilt_from_document_store(tmp_path):
+    path = tmp_path / 'store'
+    store = FAISSVectorStore(str(path), reload_interval=0)
+    add_docs(store, 0, 10)
+    add_docs(store, 10, 5, category='market')
+    store.save()
+    store.doc_store.close()
+    (path / 'indexes' / 'tech.index').write_bytes(b"not a faiss index")
+
+    # 읽을 수 없는 카테고리만 저장된 벡터로 재구축 (다른 카테고리와 문서는 유지)
+    reopened = FAISSVectorStore(str(path), reload_interval=0)
+    assert reopened.ntotal == 15
+    assert top_key(reopened, "문서 3") == 'd3'
+    assert top_key(reopened, "문서 12", category='market') == 'd12'
+
+
+def test_reload_watcher_picks_up_other_process_snapshot(tmp_path):
+    path = str(tmp_path / 'store')
+    writer = FAISSVectorStore(path, reload_interval=0)
+    add_docs(writer, 0, 10)
+    writer.save()
+    reader = FAISSVectorStore(path, reload_interval=0)
+
+    add_docs(writer, 10, 5)
+    writer.delete([doc_id for doc_id, doc in writer.doc_store.get_many(
+        writer.doc_store.category_ids('tech').tolist()).items() if doc['doc_key'] == 'd0'])
+    writer.save()
+
+    assert reader.reload_changed_indexes() == ['tech']
+    assert top_key(reader, "문서 13") == 'd13'
+    assert top_key(reader, "문서 0") != 'd0'
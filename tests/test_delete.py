@@ -0,0 +1,93 @@
+"""문서 삭제/upsert 후 검색 결과 ID 정합성 (인덱스 타입별)"""
+
+import pytest
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.index_factory import IndexConfig, index_kind
+
+INDEX_TYPES = ['flat', 'sq_fp16', 'sq_int8', 'ivf_flat', 'ivf_pq', 'hnsw']
+NUM_DOCS = 400
+
+
+def index_config(index_type: str) -> IndexConfig:
+    # nprobe를 nlist 이상으로 두어 근사 검색 오차 없이 ID 매핑만 검증
+    return IndexConfig(index_type=index_type, min_train_size=100, nprobe=64, pq_m=8, pq_nbits=6)
+
+
+def open_store(tmp_path, index_type: str) -> FAISSVectorStore:
+    return FAISSVectorStore(str(tmp_path / 'store'), index_config=index_config(index_type), reload_interval=0)
+
+
+def doc_text(i: int) -> str:
+    return f"문서 {i}"
+
+
+def build_store(tmp_path, index_type: str) -> FAISSVectorStore:
+    store = open_store(tmp_path, index_type)
+    store.add_documents(
+        [doc_text(i) for i in range(NUM_DOCS)],
+        [{'category': 'tech', 'doc_key': f"d{i}"} for i in range(NUM_DOCS)]
+    )
+    store.save()  # 학습 기준을 넘어 백그라운드로 전환된 근사 인덱스 반영
+    assert index_kind(store.category_indexes['tech']) == index_type
+    return store
+
+
+def ids_by_key(store: FAISSVectorStore) -> dict:
+    docs = store.doc_store.get_many(store.doc_store.category_ids('tech').tolist())
+    return {doc['doc_key']: doc_id for doc_id, doc in docs.items()}
+
+
+def top_key(store: FAISSVectorStore, text: str) -> str:
+    results = store.search_by_category(text, 'tech', top_k=1)
+    return results[0]['doc_key'] if results else None
+
+
+@pytest.mark.parametrize('index_type', INDEX_TYPES)
+def test_delete_keeps_id_mapping(tmp_path, index_type):
+    store = build_store(tmp_path, index_type)
+    keys = ids_by_key(store)
+    assert store.delete([keys['d1'], keys['d2'], keys['d3']]) == 3
+
+    # 삭제 이후의 문서가 자기 자신으로 검색되어야 함 (IVF remove_ids는 ID가 밀렸음)
+    for i in (0, 4, 200, 399):
+        assert top_key(store, doc_text(i)) == f"d{i}"
+    for i in (1, 2, 3):
+        assert top_key(store, doc_text(i)) not in ('d1', 'd2', 'd3')
+
+
+@pytest.mark.parametrize('index_type', INDEX_TYPES)
+def test_upsert_replaces_document(tmp_path, index_type):
+    store = build_store(tmp_path, index_type)
+    old_id = ids_by_key(store)['d10']
+
+    store.add_documents(["바뀐 문서 10"], [{'category': 'tech', 'doc_key': 'd10'}])
+    new_id = ids_by_key(store)['d10']
+
+    assert new_id != old_id
+    assert store.search_by_category("바뀐 문서 10", 'tech', top_k=1)[0]['id'] == new_id
+    assert all(doc['id'] != old_id for doc in store.search_by_category(doc_text(10), 'tech', top_k=5))
+
+
+@pytest.mark.parametrize('index_type', INDEX_TYPES)
+def test_delete_survives_reopen(tmp_path, index_type):
+    store = build_store(tmp_path, index_type)
+    keys = ids_by_key(store)
+    store.delete([keys['d5']])  # 스냅샷 이후 삭제 → 로드 시 문서 저장소 기준으로 반영
+    store.doc_store.close()
+
+    reopened = open_store(tmp_path, index_type)
+    assert top_key(reopened, doc_text(6)) == 'd6'
+    assert top_key(reopened, doc_text(5)) != 'd5'
+
+
+@pytest.mark.parametrize('index_type', ['ivf_flat', 'hnsw'])
+def test_tombstones_trigger_background_rebuild(tmp_path, index_type):
+    store = build_store(tmp_path, index_type)
+    keys = ids_by_key(store)
+    store.delete([keys[f"d{i}"] for i in range(100)])  # tombstone_ratio(0.1) 초과
+    store.save()  # 백그라운드 재구축 완료 대기
+
+    assert not store._tombstones.get('tech')
+    assert store.category_indexes['tech'].ntotal == NUM_DOCS - 100
+    assert top_key(store, doc_text(150)) == 'd150'
@@ -0,0 +1,44 @@
+"""문서 배치 인코딩 (길이별 배치 후 입력 순서 복원)"""
+
+import numpy as np
+
+from src.vector_store.embedder import KoreanEmbedder
+
+# 단어 수가 제각각인 텍스트 (가짜 토크나이저 길이 = 단어 수 + 2)
+TEXTS = [" ".join(["단어"] * n) + f" {i}" for i, n in enumerate([1, 9, 3, 12, 1, 6, 2, 9])]
+
+
+def expected(model, texts) -> np.ndarray:
+    return np.stack([model.vector(text) for text in texts])
+
+
+def test_length_buckets_restore_input_order(fake_models, monkeypatch):
+    embedder = KoreanEmbedder("fake-model", token_budget=32)
+    model = fake_models[-1]
+    batches = []
+    original_encode = model.encode
+    monkeypatch.setattr(model, 'encode', lambda texts, **kwargs: batches.append(list(texts)) or
+                        original_encode(texts, **kwargs))
+
+    embeddings = embedder.embed_texts(TEXTS, batch_size=8, show_progress=False)
+    np.testing.assert_array_equal(embeddings, expected(model, TEXTS))
+
+    # 긴 텍스트부터 길이가 비슷한 것끼리, 배치마다 (크기 × 최장 길이) ≤ 토큰 예산
+    lengths = [len(text.split()) + 2 for batch in batches for text in batch]
+    assert len(batches) > 1 and lengths == sorted(lengths, reverse=True)
+    assert all(len(batch) * (len(batch[0].split()) + 2) <= 32 for batch in batches)
+    assert sorted(text for batch in batches for text in batch) == sorted(TEXTS)
+    assert 0 < embedder.cache_info()['padding_ratio'] < 1
+
+
+def test_cached_path_keeps_order_with_duplicates(fake_models, tmp_path):
+    embedder = KoreanEmbedder("fake-model", token_budget=32, disk_cache_path=str(tmp_path / 'cache.sqlite'))
+    model = fake_models[-1]
+    embedder.embed_texts(TEXTS[:3], show_progress=False)
+    encoded = model.encoded
+
+    texts = [TEXTS[5], TEXTS[0], TEXTS[5], TEXTS[3], TEXTS[1]]
+    embeddings = embedder.embed_texts(texts, show_progress=False)
+    np.testing.assert_array_equal(embeddings, expected(model, texts))
+    assert model.encoded - encoded == 2  # 캐시에 없던 텍스트만, 중복은 한 번
+    assert embedder.embed_texts([], show_progress=False).shape == (0, model.get_sentence_embedding_dimension())
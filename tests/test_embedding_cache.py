@@ -0,0 +1,76 @@
+"""쿼리 임베딩 LRU 캐시 (TTL 만료, 용량 초과 시 제거)"""
+
+import numpy as np
+
+from src.vector_store import embedding_cache
+from src.vector_store.embedder import get_embedder
+from src.vector_store.embedding_cache import LRUEmbeddingCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(4, value, dtype='float32')
+
+
+def test_ttl_expires_entries(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache.time, 'monotonic', clock)
+    cache = LRUEmbeddingCache(max_size=4, ttl=10)
+    cache.put(('m', 'a'), vector(1))
+
+    clock.now += 9
+    assert cache.get(('m', 'a')) is not None
+    clock.now += 2  # 조회해도 생성 시각 기준으로 만료
+    assert cache.get(('m', 'a')) is None
+    assert cache.info()['size'] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    forever = LRUEmbeddingCache(max_size=4, ttl=0)
+    forever.put(('m', 'a'), vector(1))
+    clock.now += 1e6
+    assert forever.get(('m', 'a')) is not None
+
+
+def test_evicts_least_recently_used():
+    cache = LRUEmbeddingCache(max_size=2, ttl=0)
+    cache.put(('m', 'a'), vector(1))
+    cache.put(('m', 'b'), vector(2))
+    assert cache.get(('m', 'a')) is not None  # a가 최근 사용 → b가 제거 대상
+    cache.put(('m', 'c'), vector(3))
+
+    assert cache.get(('m', 'b')) is None
+    assert cache.get(('m', 'a'))[0] == 1 and cache.get(('m', 'c'))[0] == 3
+    assert cache.info()['size'] == 2
+
+
+def test_cached_vectors_are_isolated():
+    cache = LRUEmbeddingCache(max_size=2, ttl=0)
+    original = vector(1)
+    cache.put(('m', 'a'), original)
+    original[:] = 5
+    cached = cache.get(('m', 'a'))
+    assert cached[0] == 1 and not cached.flags.writeable
+
+    disabled = LRUEmbeddingCache(max_size=0)
+    disabled.put(('m', 'a'), vector(1))
+    assert disabled.get(('m', 'a')) is None
+
+
+def test_embedder_reuses_cached_query(fake_models):
+    embedder = get_embedder()
+    model = fake_models[-1]
+    first = embedder.embed_text("파이썬  언어")
+    encoded = model.encoded
+    first[:] = 0  # 반환된 벡터를 바꿔도 캐시에는 영향 없음
+
+    second = embedder.embed_text("파이썬 언어")
+    assert model.encoded == encoded
+    np.testing.assert_array_equal(second, model.vector("파이썬 언어"))
+    assert embedder.cache_info()['hits'] == 1
@@ -0,0 +1,90 @@
+"""임베딩 캐시 키와 모델 명세 검증/재임베딩"""
+
+import numpy as np
+import pytest
+
+from src.vector_store.embedder import create_embedder
+from src.vector_store.embedding_cache import DiskEmbeddingCache
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.ranking import l2_normalize
+from src.vector_store.registry import read_spec
+
+from .conftest import FakeSentenceTransformer
+
+
+def test_content_key_includes_revision_and_backend():
+    base = DiskEmbeddingCache.content_key('m', "텍스트", 'r1', 'torch')
+    assert base != DiskEmbeddingCache.content_key('m', "텍스트", 'r2', 'torch')
+    assert base != DiskEmbeddingCache.content_key('m', "텍스트", 'r1', 'onnx_int8')
+    assert base == DiskEmbeddingCache.content_key('m', "텍스트", 'r1', 'torch')
+
+
+def test_disk_cache_not_shared_across_revisions(tmp_path, monkeypatch, fake_models):
+    monkeypatch.setenv('EMBEDDING_DISK_CACHE', 'true')
+    monkeypatch.setenv('EMBEDDING_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    texts = ["첫 문서", "둘째 문서"]
+
+    first = create_embedder(revision='r1').embed_texts(texts)
+    second_embedder = create_embedder(revision='r2')
+    second = second_embedder.embed_texts(texts)
+
+    assert fake_models[-1].encoded == len(texts)  # 캐시에서 r1 벡터를 가져오지 않고 새로 인코딩
+    expected = np.stack([FakeSentenceTransformer('fake-model', 'r2').vector(text) for text in texts])
+    np.testing.assert_allclose(second, expected)
+    assert not np.allclose(first, second)
+
+
+def build_store(path: str) -> FAISSVectorStore:
+    store = FAISSVectorStore(path, reload_interval=0)
+    store.add_documents(["파이썬 언어", "리액트 UI"], [{'category': 'tech', 'doc_key': 'a'},
+                                                   {'category': 'tech', 'doc_key': 'b'}])
+    store.save()
+    store.doc_store.close()
+    return store
+
+
+def test_revision_change_reembeds_into_new_generation(tmp_path, monkeypatch):
+    monkeypatch.setenv('EMBEDDING_DISK_CACHE', 'true')
+    monkeypatch.setenv('EMBEDDING_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    monkeypatch.setenv('EMBEDDING_MODEL_REVISION', 'r1')
+    path = str(tmp_path / 'store')
+    build_store(path)
+
+    monkeypatch.setattr('src.vector_store.embedder._embedder_instance', None)
+    monkeypatch.setenv('EMBEDDING_MODEL_REVISION', 'r2')
+    store = FAISSVectorStore(path, reload_interval=0)
+    assert store.needs_reembedding
+    assert store.embedder.revision == 'r1'  # 재임베딩 전까지 저장된 리비전으로 검색
+
+    store.reembed_generation(background=False)
+    assert not store.needs_reembedding
+    assert read_spec(store.doc_store)['revision'] == 'r2'
+
+    ids = store.doc_store.category_ids('tech').tolist()
+    texts = [store.doc_store.get_many(ids)[doc_id]['text'] for doc_id in ids]
+    expected = np.stack([FakeSentenceTransformer('fake-model', 'r2').vector(text) for text in texts])
+    np.testing.assert_allclose(store.doc_store.get_vectors(ids), l2_normalize(expected), rtol=1e-5)
+    assert store.search("파이썬 언어", top_k=1)[0]['doc_key'] == 'a'
+
+
+def test_model_mismatch_error_mode(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    build_store(path)
+
+    monkeypatch.setattr('src.vector_store.embedder._embedder_instance', None)
+    monkeypatch.setenv('EMBEDDING_MODEL', 'other-model')
+    monkeypatch.setenv('VECTOR_MODEL_MISMATCH', 'error')
+    with pytest.raises(ValueError):
+        FAISSVectorStore(path, reload_interval=0)
+
+
+def test_backend_change_keeps_stored_spec(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    build_store(path)
+
+    monkeypatch.setattr('src.vector_store.embedder._embedder_instance', None)
+    monkeypatch.setenv('EMBEDDING_BACKEND', 'onnx')
+    store = FAISSVectorStore(path, reload_interval=0)
+
+    assert not store.needs_reembedding
+    assert read_spec(store.doc_store)['backend'] == 'torch'  # 벡터를 다시 만들지 않았으므로 그대로
@@ -0,0 +1,87 @@
+"""메타데이터 필터 (필터 색인, 하이브리드 검색의 SQL 필터)"""
+
+import pytest
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.filters import compile_filter, indexable_fields, normalize_value
+
+
+def build_company_store(path: str) -> FAISSVectorStore:
+    store = FAISSVectorStore(path, reload_interval=0)
+    companies = [f"회사{i}" for i in range(20)]
+    store.add_documents(
+        [f"{name} 회사 정보 연봉과 복지" for name in companies for _ in range(3)],
+        [{'category': 'company_info', 'company': name, 'doc_key': f"{name}-{j}"} for name in companies for j in range(3)]
+    )
+    return store
+
+
+def test_lexical_postings_filtered_in_sql(tmp_path):
+    store = build_company_store(str(tmp_path / 'store'))
+    allowed = set(store.doc_store.ids_matching({'company': '회사3'}).tolist())
+
+    postings = store.doc_store.term_postings(['회사', '정보'], 'company_info', {'company': '회사3'})
+    assert {doc_id for _, doc_id, _, _ in postings} == allowed
+    assert store.doc_store.lexical_stats('company_info', {'company': '회사3'})[0] == 3
+
+    statements = []
+    store.doc_store._conn.set_trace_callback(statements.append)
+    try:
+        hits = store.lexical.search("회사3 회사 정보", 'company_info', top_k=10, metadata_filter={'company': '회사3'})
+    finally:
+        store.doc_store._conn.set_trace_callback(None)
+    assert {doc_id for doc_id, _ in hits} == allowed
+    # 필터 밖 문서의 postings를 파이썬으로 가져오지 않음 (필터는 postings 조회 SQL 안에서 적용)
+    assert any('WITH allowed' in sql for sql in statements)
+
+
+def test_hybrid_search_respects_filter(tmp_path):
+    store = build_company_store(str(tmp_path / 'store'))
+    results = store.hybrid_search("회사 정보", 'company_info', top_k=5, metadata_filter={'company': '회사7'})
+    assert results and {doc['company'] for doc in results} == {'회사7'}
+
+
+def test_compile_filter_conditions():
+    conditions = compile_filter({
+        'company': '회사1',
+        'source': {'$in': ['tavily_search', 'upload']},
+        'published_date': {'$gte': '2024-01-01', '$lt': '2025-01-01T00:00:00Z'},
+    })
+    assert conditions == [
+        ('company', '= ?', ['회사1']),
+        ('source', 'IN (?,?)', ['tavily_search', 'upload']),
+        ('published_date', '>= ?', ['2024-01-01T00:00:00']),
+        ('published_date', '< ?', ['2025-01-01T00:00:00']),
+    ]
+
+    with pytest.raises(ValueError):
+        compile_filter({'source': {'$in': 'upload'}})
+    with pytest.raises(ValueError):
+        compile_filter({'company': {'$regex': '회사'}})
+
+
+def test_date_values_normalized_to_utc_iso():
+    # ISO(오프셋/Z), 날짜만, RFC 2822(Tavily published_date)가 같은 형식으로 비교됨
+    assert normalize_value('published_date', '2024-05-15T18:30:00+09:00') == '2024-05-15T09:30:00'
+    assert normalize_value('published_date', '2024-05-15T09:30:00Z') == '2024-05-15T09:30:00'
+    assert normalize_value('date', '2024-05-15') == '2024-05-15T00:00:00'
+    assert normalize_value('published_date', 'Wed, 15 May 2024 09:30:00 GMT') == '2024-05-15T09:30:00'
+    # 날짜 필드가 아니거나 해석할 수 없는 값은 그대로
+    assert normalize_value('title', '2024-05-15') == '2024-05-15'
+    assert normalize_value('published_date', '지난주') == '지난주'
+    assert normalize_value('published_date', 20240515) == 20240515
+
+    assert indexable_fields({'text': "본문", 'doc_key': 'k', 'tags': ['a'], 'published_date': '2024-05-15Z',
+                             'score': 3}) == [('published_date', '2024-05-15T00:00:00'), ('score', 3)]
+
+
+def test_date_range_filter_across_formats(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), reload_interval=0)
+    dates = ['Mon, 01 Jan 2024 12:00:00 GMT', '2024-06-01T12:00:00+09:00', '2024-12-31T23:00:00-02:00', '2023-12-31']
+    store.add_documents([f"채용 소식 {i}" for i in range(len(dates))],
+                        [{'category': 'news', 'doc_key': f"n{i}", 'published_date': date} for i, date in enumerate(dates)])
+
+    in_2024 = {'published_date': {'$gte': '2024-01-01', '$lt': '2025-01-01'}}
+    results = store.search("채용 소식", top_k=10, metadata_filter=in_2024)
+    # 2024-12-31T23:00-02:00은 UTC로 2025-01-01이므로 제외
+    assert sorted(doc['doc_key'] for doc in results) == ['n0', 'n1']
@@ -0,0 +1,63 @@
+"""세대 빌드/전환/정리의 프로세스 간 조정 (스토어 잠금과 세대 사용권)"""
+
+import threading
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.snapshot import GENERATIONS_DIR, cleanup_generations, current_generation
+
+DOCS = [
+    {'text': "파이썬 언어", 'category': 'tech', 'doc_key': 'a'},
+    {'text': "리액트 UI", 'category': 'tech', 'doc_key': 'b'},
+]
+
+
+def generations(path) -> list:
+    return sorted(p.name for p in (path / GENERATIONS_DIR).iterdir() if p.is_dir())
+
+
+def test_cleanup_skips_generation_in_use(tmp_path, monkeypatch):
+    monkeypatch.setenv('VECTOR_KEEP_GENERATIONS', '0')
+    path = tmp_path / 'store'
+    writer = FAISSVectorStore(str(path), reload_interval=0)
+    writer.rebuild_generation(iter(DOCS), {})
+    first = writer.generation
+
+    # 다른 프로세스가 아직 이전 세대로 검색 중
+    reader = FAISSVectorStore(str(path), reload_interval=0)
+    assert reader.generation == first
+
+    writer.rebuild_generation(iter(DOCS), {})
+    writer.rebuild_generation(iter(DOCS), {})
+    assert generations(path) == [first, writer.generation]
+    assert reader.search("파이썬", top_k=1)[0]['doc_key'] == 'a'
+
+    reader.doc_store.close()
+    reader._lease.close()
+    assert cleanup_generations(path, keep=0) == [first]
+    assert generations(path) == [writer.generation]
+
+
+def test_concurrent_reembed_builds_one_generation(tmp_path, monkeypatch):
+    monkeypatch.setenv('EMBEDDING_MODEL_REVISION', 'r1')
+    path = tmp_path / 'store'
+    store = FAISSVectorStore(str(path), reload_interval=0)
+    store.add_documents([doc['text'] for doc in DOCS], [{k: v for k, v in doc.items() if k != 'text'} for doc in DOCS])
+    store.save()
+    store.doc_store.close()
+
+    monkeypatch.setattr('src.vector_store.embedder._embedder_instance', None)
+    monkeypatch.setenv('EMBEDDING_MODEL_REVISION', 'r2')
+    workers = [FAISSVectorStore(str(path), reload_interval=0) for _ in range(2)]
+    assert all(worker.needs_reembedding for worker in workers)
+
+    threads = [threading.Thread(target=worker.reembed_generation, kwargs={'background': False}) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 잠금을 늦게 얻은 쪽은 새로 빌드하지 않고 먼저 만들어진 세대로 전환
+    assert len(generations(path)) == 1
+    assert [worker.generation for worker in workers] == [current_generation(path)] * 2
+    assert not any(worker.needs_reembedding for worker in workers)
+    assert all(worker.search("파이썬 언어", top_k=1)[0]['doc_key'] == 'a' for worker in workers)
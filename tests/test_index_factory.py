@@ -0,0 +1,47 @@
+"""인덱스 팩토리 설정과 IVF 재학습"""
+
+import numpy as np
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.index_factory import IndexConfig, build_index, index_kind, index_nlist
+
+
+def ivf_index(config: IndexConfig, ntotal: int, dim: int = 8):
+    vectors = np.random.default_rng(0).standard_normal((ntotal, dim)).astype('float32')
+    return build_index(config, dim, vectors, np.arange(ntotal))
+
+
+def test_target_nlist_grows_with_vectors():
+    config = IndexConfig('ivf_flat', min_train_size=100)
+    assert config.target_nlist(1000) == 25
+    assert config.target_nlist(10000) == 256
+    assert config.target_nlist(40000) == 800
+    assert IndexConfig('ivf_flat', nlist=64).target_nlist(10000) == 64
+
+
+def test_needs_retrain_after_growth():
+    config = IndexConfig('ivf_flat', min_train_size=100)
+    index = ivf_index(config, 1000)
+    assert index_nlist(index) == 25
+    assert not config.needs_retrain(index)
+
+    index.add_with_ids(np.random.default_rng(1).standard_normal((1000, 8)).astype('float32'),
+                       np.arange(1000, 2000))
+    assert config.needs_retrain(index)  # 목표 51 ≥ 2 × 25
+    assert not config.needs_retrain(ivf_index(IndexConfig('flat'), 1000))
+
+
+def test_store_retrains_ivf_as_category_grows(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), index_config=IndexConfig('ivf_flat', min_train_size=100),
+                             reload_interval=0)
+    for start in range(0, 800, 100):
+        store.add_documents([f"문서 {i}" for i in range(start, start + 100)],
+                            [{'category': 'tech'} for _ in range(100)])
+    store.save()
+
+    index = store.category_indexes['tech']
+    assert index_kind(index) == 'ivf_flat'
+    assert index.ntotal == 800
+    # 100개일 때의 nlist 2에서 재학습됨 (백그라운드 재구축 시점에 따라 목표의 retrain_factor 배 이내)
+    assert index_nlist(index) > 2
+    assert not store.index_config.needs_retrain(index)
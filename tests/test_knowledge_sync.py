@@ -0,0 +1,77 @@
+"""지식 파일 파싱과 증분 동기화"""
+
+from pathlib import Path
+
+from src.vector_store import faiss_store
+from src.vector_store.knowledge_loader import (
+    discover_knowledge_files, initialize_knowledge_base, iter_knowledge_sections
+)
+
+
+def write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+def section_keys(store) -> dict:
+    docs = store.doc_store.get_many(store.doc_store.ids_since(0))
+    return {doc['doc_key']: doc_id for doc_id, doc in docs.items()}
+
+
+def test_parallel_parsing_matches_serial(tmp_path):
+    for i in range(3):
+        write(tmp_path / f"topic{i}.md", f"# 주제 {i}\n## 제목 {i}\n본문 {i}\n## 둘째\n내용\n")
+    files = discover_knowledge_files(tmp_path)
+
+    serial = list(iter_knowledge_sections(files, workers=0))
+    parallel = list(iter_knowledge_sections(files, workers=2))  # spawn 프로세스 풀
+    assert parallel == serial
+    assert len(serial) == 6
+
+
+def test_incremental_sync_only_touches_changed_sections(tmp_path, fake_models):
+    data = tmp_path / 'knowledge'
+    write(data / 'tech_info.txt', "# 기술\n## Python\n파이썬은 언어입니다\n## React\n리액트는 UI 라이브러리\n")
+    write(data / 'salary_info.txt', "# 급여\n## 백엔드\n백엔드 연봉 6000\n")
+
+    initialize_knowledge_base(str(data))
+    store = faiss_store.get_vector_store()
+    before = section_keys(store)
+    assert set(before) == {'tech_info.txt#Python', 'tech_info.txt#React', 'salary_info.txt#백엔드'}
+
+    # 섹션 하나 수정, 하나 추가, 하나 삭제 + 다른 파일 삭제
+    write(data / 'tech_info.txt', "# 기술\n## Python\n파이썬은 인기 언어입니다\n## Go\n고 언어는 동시성\n")
+    (data / 'salary_info.txt').unlink()
+    encoded = fake_models[-1].encoded
+    initialize_knowledge_base(str(data))
+
+    after = section_keys(store)
+    assert set(after) == {'tech_info.txt#Python', 'tech_info.txt#Go'}
+    assert after['tech_info.txt#Python'] != before['tech_info.txt#Python']  # 본문이 바뀐 섹션만 교체
+    assert fake_models[-1].encoded - encoded == 2  # 바뀐 섹션 2개만 임베딩
+    assert store.search_by_category("고 언어는 동시성", 'tech_info', top_k=1)[0]['doc_key'] == 'tech_info.txt#Go'
+    assert set(store.manifest['sources']) == {'tech_info.txt'}
+
+    # 변경이 없으면 건너뜀
+    encoded = fake_models[-1].encoded
+    initialize_knowledge_base(str(data))
+    assert fake_models[-1].encoded == encoded
+
+
+def test_force_rebuild_drops_deleted_files_and_keeps_uploads(tmp_path):
+    data = tmp_path / 'knowledge'
+    write(data / 'tech_info.txt', "# 기술\n## Python\n파이썬은 언어입니다\n")
+    write(data / 'salary_info.txt', "# 급여\n## 백엔드\n백엔드 연봉 6000\n")
+    initialize_knowledge_base(str(data))
+    store = faiss_store.get_vector_store()
+    # 지식 파일이 아닌 업로드 문서 (지식 카테고리와 같은 카테고리 포함)
+    store.add_documents(["우리 회사는 핀테크", "사내 기술 블로그"],
+                        [{'category': 'company_info', 'doc_key': 'upload-1'},
+                         {'category': 'tech_info', 'doc_key': 'upload-2'}])
+
+    (data / 'salary_info.txt').unlink()
+    initialize_knowledge_base(str(data), force=True)
+
+    assert set(section_keys(store)) == {'tech_info.txt#Python', 'upload-1', 'upload-2'}
+    assert 'salary_info' not in store.doc_store.category_counts()
+    assert set(store.manifest['sources']) == {'tech_info.txt'}
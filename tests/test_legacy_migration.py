@@ -0,0 +1,72 @@
+"""이전 버전(metadata.pkl + faiss.index) 스토어 변환과 모델 확인 순서"""
+
+import pickle
+import shutil
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.registry import read_spec
+
+from . import conftest
+from .conftest import FakeSentenceTransformer
+
+SHIPPED_STORE = Path(__file__).resolve().parent.parent / 'vector_store'
+TEXTS = ["파이썬 언어", "리액트 UI", "도커 컨테이너"]
+
+
+def write_legacy_store(path: Path, vectors: np.ndarray):
+    path.mkdir(parents=True)
+    documents = [{'text': text, 'category': 'tech_info', 'source': 'tech_info.txt', 'id': i}
+                 for i, text in enumerate(TEXTS)]
+    with open(path / 'metadata.pkl', 'wb') as f:
+        pickle.dump({'documents': documents, 'categories': {'tech_info': list(range(len(TEXTS)))}}, f)
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+    faiss.write_index(index, str(path / 'faiss.index'))
+
+
+def test_legacy_store_migrated_without_recording_current_model(tmp_path, monkeypatch):
+    path = tmp_path / 'store'
+    write_legacy_store(path, np.stack([FakeSentenceTransformer('fake-model').vector(text) for text in TEXTS]))
+    monkeypatch.setenv('EMBEDDING_MODEL', 'some-other-model')
+
+    store = FAISSVectorStore(str(path), reload_interval=0)
+    assert store.doc_store.count() == len(TEXTS)
+    assert read_spec(store.doc_store) is None  # 변환한 벡터의 모델은 알 수 없음
+    assert (path / 'metadata.pkl').exists()
+    store.doc_store.close()
+
+    reopened = FAISSVectorStore(str(path), reload_interval=0)
+    assert reopened.doc_store.count() == len(TEXTS)  # 다시 변환하지 않음
+    assert read_spec(reopened.doc_store) is None
+
+
+def test_legacy_store_dimension_mismatch_is_rejected_every_start(tmp_path):
+    path = tmp_path / 'store'
+    write_legacy_store(path, np.random.default_rng(0).standard_normal((len(TEXTS), 16)).astype('float32'))
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="저장된 벡터 차원\\(16\\)"):
+            FAISSVectorStore(str(path), reload_interval=0)
+    assert (path / 'metadata.pkl').exists()
+
+
+@pytest.mark.skipif(not (SHIPPED_STORE / 'metadata.pkl').exists(), reason="저장소에 이전 버전 스토어 없음")
+def test_shipped_legacy_store_migrates(tmp_path, monkeypatch):
+    path = tmp_path / 'store'
+    shutil.copytree(SHIPPED_STORE, path, ignore=shutil.ignore_patterns('*.sqlite*'))
+    with pytest.raises(ValueError, match="저장된 벡터 차원\\(768\\)"):
+        FAISSVectorStore(str(path), reload_interval=0)
+
+    monkeypatch.setattr(conftest, 'DIM', 768)
+    monkeypatch.setenv('EMBEDDING_MODEL', 'some-other-model')
+    monkeypatch.setattr('src.vector_store.embedder._embedder_instance', None)
+    store = FAISSVectorStore(str(path), reload_interval=0)
+    assert store.doc_store.count() == 31
+    assert store.doc_store.category_counts()['salary_info'] == 8
+    assert read_spec(store.doc_store) is None
+    assert not store.needs_reembedding
@@ -0,0 +1,69 @@
+"""BM25 코퍼스 통계 (store_meta에 유지, 검색마다 다시 세지 않음)와 하이브리드 검색 임계값"""
+
+from src.vector_store.doc_store import LEXICAL_DOCS
+from src.vector_store.faiss_store import FAISSVectorStore
+
+
+def scanned_stats(store: FAISSVectorStore, category=None):
+    query, params = "SELECT COUNT(*), AVG(token_count) FROM documents", ()
+    if category is not None:
+        query, params = query + " WHERE category = ?", (category,)
+    count, avg_length = store.doc_store._conn.execute(query, params).fetchone()
+    return count, float(avg_length or 0.0)
+
+
+def test_stats_follow_adds_and_deletes(tmp_path):
+    path = str(tmp_path / 'store')
+    store = FAISSVectorStore(path, reload_interval=0)
+    store.add_documents(
+        ["파이썬 언어 문법", "리액트 UI", "도커 컨테이너 이미지 빌드", "연봉 협상"],
+        [{'category': 'tech', 'doc_key': 'a'}, {'category': 'tech', 'doc_key': 'b'},
+         {'category': 'tech', 'doc_key': 'c'}, {'category': 'salary', 'doc_key': 'd'}]
+    )
+    store.delete([doc_id for doc_id, doc in store.doc_store.get_many(
+        store.doc_store.category_ids('tech').tolist()).items() if doc['doc_key'] == 'c'])
+
+    for category in (None, 'tech', 'salary', 'missing'):
+        assert store.doc_store.lexical_stats(category) == scanned_stats(store, category)
+
+    # 통계가 없는 이전 스키마는 열 때 한 번 채움
+    store.doc_store._conn.execute("DELETE FROM store_meta WHERE key LIKE 'lexical_%'")
+    store.doc_store._conn.commit()
+    store.doc_store.close()
+    reopened = FAISSVectorStore(path, reload_interval=0)
+    assert reopened.doc_store.get_meta(LEXICAL_DOCS) == '3'
+    assert reopened.doc_store.lexical_stats('tech') == scanned_stats(reopened, 'tech')
+
+
+def test_unfiltered_search_does_not_rescan(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), reload_interval=0)
+    store.add_documents([f"문서 {i} 내용" for i in range(20)],
+                        [{'category': 'tech', 'doc_key': f"d{i}"} for i in range(20)])
+
+    statements = []
+    store.doc_store._conn.set_trace_callback(statements.append)
+    try:
+        assert store.hybrid_search("문서 3", 'tech', top_k=3)
+    finally:
+        store.doc_store._conn.set_trace_callback(None)
+    assert not any('COUNT(' in sql or 'AVG(' in sql for sql in statements)
+
+
+def test_hybrid_min_score_applies_to_vector_score(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), reload_interval=0)
+    texts = ["도커 컨테이너", "도커 이미지", "도커 네트워크", "도커 볼륨"] + [f"메모 {i}" for i in range(20)]
+    store.add_documents(texts, [{'category': 'tech', 'doc_key': f"d{i}"} for i in range(len(texts))])
+
+    loose = store.hybrid_search("도커", 'tech', top_k=8, fetch_k=4, min_score=-1.0)
+    lexical_only = [doc['id'] for doc in loose if doc['dense_score'] is None]
+    assert lexical_only  # BM25로만 찾은 후보 (벡터 점수는 저장된 벡터로 계산)
+
+    query = store._embed_query("도커")[0]
+    ids = [doc['id'] for doc in loose]
+    similarities = dict(zip(ids, (store.doc_store.get_vectors(ids) @ query).tolist()))
+    ordered = sorted(similarities.values())
+    threshold = (ordered[len(ordered) // 2 - 1] + ordered[len(ordered) // 2]) / 2
+
+    # 결합 점수(RRF)가 아니라 코사인 점수로 거름
+    strict = store.hybrid_search("도커", 'tech', top_k=8, fetch_k=4, min_score=threshold)
+    assert {doc['id'] for doc in strict} == {doc_id for doc_id, score in similarities.items() if score >= threshold}
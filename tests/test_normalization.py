@@ -0,0 +1,70 @@
+"""벡터 정규화는 쓰기 시점에 한 번만 (저장 벡터 = 인덱스 벡터)"""
+
+import numpy as np
+
+from src.vector_store.faiss_store import FAISSVectorStore
+from src.vector_store.ranking import l2_normalize, maximal_marginal_relevance
+
+TEXTS = ["파이썬 언어", "리액트 UI", "도커 컨테이너", "쿠버네티스 배포"]
+
+
+def build_store(path: str) -> FAISSVectorStore:
+    store = FAISSVectorStore(path, reload_interval=0)
+    store.add_documents(TEXTS, [{'category': 'tech', 'doc_key': f"d{i}"} for i in range(len(TEXTS))])
+    store.save()
+    return store
+
+
+def stored_norms(store: FAISSVectorStore) -> np.ndarray:
+    return np.linalg.norm(store.doc_store.get_vectors(store.doc_store.category_ids('tech').tolist()), axis=1)
+
+
+def test_cosine_store_keeps_unit_vectors(tmp_path):
+    store = build_store(str(tmp_path / 'store'))
+    np.testing.assert_allclose(stored_norms(store), 1.0, rtol=1e-5)
+    assert store.search("도커 컨테이너", top_k=1, mmr_lambda=0.5)[0]['doc_key'] == 'd2'
+
+
+def test_legacy_raw_vectors_normalized_once_on_load(tmp_path):
+    path = str(tmp_path / 'store')
+    store = build_store(path)
+    # 정규화 이전 버전: 크기가 제각각인 원본 벡터가 저장되어 있음
+    ids = store.doc_store.category_ids('tech').tolist()
+    raw = store.doc_store.get_vectors(ids) * np.arange(2, 2 + len(ids), dtype='float32')[:, None]
+    store.doc_store._conn.executemany("UPDATE documents SET vector = ? WHERE id = ?",
+                                      [(vector.tobytes(), doc_id) for doc_id, vector in zip(ids, raw)])
+    store.doc_store._conn.execute("DELETE FROM store_meta WHERE key = 'vectors_normalized'")
+    store.doc_store._conn.commit()
+    store.doc_store.close()
+
+    reopened = FAISSVectorStore(path, reload_interval=0)
+    np.testing.assert_allclose(stored_norms(reopened), 1.0, rtol=1e-5)
+    assert reopened.doc_store.get_meta('vectors_normalized') == '1'
+    assert reopened.search("쿠버네티스 배포", top_k=1)[0]['doc_key'] == 'd3'
+
+
+def test_mmr_expects_normalized_inputs():
+    rng = np.random.default_rng(0)
+    candidates = l2_normalize(rng.standard_normal((6, 8)))
+    query = candidates[2] + 0.01
+    selected = maximal_marginal_relevance(l2_normalize(query), candidates, top_k=3, lambda_mult=1.0)
+    assert selected[0] == 2
+    assert len(set(selected)) == 3
+
+
+def test_score_threshold_follows_metric(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    cosine = build_store(path)
+    assert cosine.score_threshold(0.3) == 0.3
+    cosine_results = cosine.search("파이썬 언어", top_k=4, min_score=cosine.score_threshold(0.3))
+    cosine.doc_store.close()
+
+    # 정규화된 벡터의 L2 스토어: 같은 코사인 임계값이 같은 문서를 남김
+    monkeypatch.setenv('VECTOR_METRIC', 'l2')
+    l2 = FAISSVectorStore(path, reload_interval=0)
+    l2_results = l2.search("파이썬 언어", top_k=4, min_score=l2.score_threshold(0.3))
+    assert [doc['doc_key'] for doc in l2_results] == [doc['doc_key'] for doc in cosine_results]
+
+    # 정규화하지 않은 L2 스토어는 코사인 임계값을 적용하지 않음
+    raw = FAISSVectorStore(str(tmp_path / 'raw'), reload_interval=0)
+    assert raw.score_threshold(0.3) is None
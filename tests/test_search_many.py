@@ -0,0 +1,49 @@
+"""여러 쿼리 일괄 검색 (임베딩 배치 1회 + 인덱스 검색 1회)"""
+
+from src.vector_store.faiss_store import FAISSVectorStore
+
+TEXTS = ["파이썬 언어", "리액트 UI", "도커 컨테이너", "쿠버네티스 배포", "스프링 부트"]
+
+
+def build_store(path: str) -> FAISSVectorStore:
+    store = FAISSVectorStore(path, reload_interval=0)
+    store.add_documents(TEXTS, [{'category': 'tech', 'doc_key': f"d{i}"} for i in range(len(TEXTS))])
+    return store
+
+
+def test_search_many_matches_single_searches(tmp_path):
+    store = build_store(str(tmp_path / 'store'))
+    queries = ["도커 컨테이너", "파이썬 언어", "스프링 부트"]
+
+    batched = store.search_many(queries, 'tech', top_k=2)
+    single = [store.search_by_category(query, 'tech', top_k=2) for query in queries]
+    assert [[doc['doc_key'] for doc in docs] for docs in batched] == \
+        [[doc['doc_key'] for doc in docs] for docs in single]
+    assert [docs[0]['doc_key'] for docs in batched] == ['d2', 'd0', 'd4']
+
+
+def test_search_many_encodes_misses_once(tmp_path, fake_models, monkeypatch):
+    store = build_store(str(tmp_path / 'store'))
+    model = fake_models[-1]
+    calls = []
+    original_encode = model.encode
+    monkeypatch.setattr(model, 'encode', lambda texts, **kwargs: calls.append(texts) or original_encode(texts, **kwargs))
+    searched = []
+    original_search = store._search_embeddings
+    monkeypatch.setattr(store, '_search_embeddings',
+                        lambda embeddings, *args: searched.append(len(embeddings)) or original_search(embeddings, *args))
+
+    store.embedder.embed_text("파이썬 언어")  # 캐시에 있는 쿼리는 다시 인코딩하지 않음
+    calls.clear()
+    results = store.search_many(["도커 컨테이너", "파이썬 언어", "도커  컨테이너", "리액트 UI"], 'tech', top_k=1)
+
+    # 캐시 미스만, 정규화 후 중복을 제거해 한 번의 배치로 인코딩하고 인덱스는 한 번만 검색
+    assert calls == [["도커 컨테이너", "리액트 UI"]]
+    assert searched == [4]
+    assert [docs[0]['doc_key'] for docs in results] == ['d2', 'd0', 'd2', 'd1']
+
+
+def test_search_many_empty(tmp_path):
+    store = FAISSVectorStore(str(tmp_path / 'store'), reload_interval=0)
+    assert store.search_many(["파이썬"], 'tech') == [[]]
+    assert build_store(str(tmp_path / 'other')).search_many([], 'tech') == []